@@ -0,0 +1,3 @@
+"""
+Benchmarks dos caminhos críticos do cliente PocketOption.
+"""
@@ -0,0 +1,54 @@
+"""
+Compara os codecs JSON disponíveis sobre frames de entrada e saída.
+
+Uso::
+
+    python -m benchmarks.bench_codec [--frames DIR] [--json]
+"""
+import argparse
+import json
+import timeit
+
+from benchmarks import frames
+from pocketoptionapi.ws.codec import available_codecs, get_codec
+
+
+def best_of(func, number, repeat=5):
+    """Menor tempo médio por chamada, em microssegundos."""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+
+
+def run(inbound, outbound, number=None):
+    results = []
+    for name in available_codecs():
+        codec = get_codec(name)
+        for frame_name, raw in inbound.items():
+            n = number or max(1, 2_000_000 // max(len(raw), 1))
+            results.append({"codec": name, "op": "loads", "frame": frame_name, "bytes": len(raw),
+                            "us": best_of(lambda: codec.loads(raw), n)})
+        for frame_name, obj in outbound.items():
+            results.append({"codec": name, "op": "dumps", "frame": frame_name,
+                            "us": best_of(lambda: codec.dumps(obj), number or 20000)})
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--frames", help="diretório com frames gravados (um por arquivo)")
+    parser.add_argument("--json", action="store_true", help="saída em JSON")
+    args = parser.parse_args(argv)
+
+    inbound = frames.load_recorded(args.frames) if args.frames else frames.sample_frames()
+    outbound = {"openOrder": frames.open_order(), "changeSymbol": ["changeSymbol", {"asset": "AUDNZD_otc", "period": 60}]}
+    results = run(inbound, outbound)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return results
+    for row in results:
+        print(f"{row['codec']:>8} {row['op']:>5} {row['frame']:<20} {row['us']:>12.2f} us")
+    return results
+
+
+if __name__ == "__main__":
+    main()
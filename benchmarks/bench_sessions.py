@@ -0,0 +1,101 @@
+"""
+Várias sessões em um processo e um event loop, contra um servidor local.
+
+Cada sessão autentica com um uid próprio e recebe um saldo próprio; o
+cenário falha se algum saldo aparecer na sessão errada.
+
+Uso::
+
+    python -m benchmarks.bench_sessions [--sessions 50] [--json]
+"""
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+
+from benchmarks.mock_server import MockPocketOptionServer, auth_message
+from pocketoptionapi.api import PocketOptionAPI
+from pocketoptionapi.session import EventLoopThread
+
+
+def balance_for(uid):
+    return 1000.0 + uid
+
+
+class SessionServer(MockPocketOptionServer):
+    """Servidor local que dá a cada uid um saldo próprio."""
+
+    def _on_auth(self, conn, payload):
+        self.balances.setdefault(payload.get("uid"), balance_for(payload.get("uid")))
+        super(SessionServer, self)._on_auth(conn, payload)
+
+
+def run(sessions):
+    runner = EventLoopThread().start()
+    server = runner.run(SessionServer(tick_rate=0).start())
+    url = server.url
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    start = time.perf_counter()
+    apis = [PocketOptionAPI(ssid=auth_message(uid), demo=True, loop=runner.loop, url=url)
+            for uid in range(sessions)]
+    created = time.perf_counter() - start
+
+    async def connect_all():
+        return await asyncio.gather(*(api.connect_async(10) for api in apis))
+
+    start = time.perf_counter()
+    results = runner.run(connect_all())
+    connected = time.perf_counter() - start
+
+    # O saldo chega logo após o successauth
+    deadline = time.time() + 5
+    while time.time() < deadline and any(api.state.balance is None for api in apis):
+        time.sleep(0.01)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    wrong = [uid for uid, api in enumerate(apis)
+             if api.state.balance != balance_for(uid) or api.state.balance_id != uid]
+    memory = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+
+    async def shutdown():
+        for api in apis:
+            await api.close()
+        await server.stop()
+
+    runner.run(shutdown())
+    runner.stop()
+    return {
+        "sessions": sessions,
+        "authenticated": sum(1 for ok, _ in results if ok),
+        "isolated": not wrong,
+        "wrong_sessions": wrong,
+        "create_s": created,
+        "connect_s": connected,
+        "memory_per_session_kb": memory / sessions / 1024,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--json", action="store_true", help="saída em JSON")
+    args = parser.parse_args(argv)
+    result = run(args.sessions)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"{result['authenticated']}/{result['sessions']} sessões autenticadas, "
+              f"isoladas: {result['isolated']}, conexão {result['connect_s']:.3f} s, "
+              f"{result['memory_per_session_kb']:.0f} KiB por sessão")
+    if result["authenticated"] != result["sessions"] or not result["isolated"]:
+        raise SystemExit(1)
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Compara o dict_queue_add antigo (ordena a cada descarte) com o TimeOrderedBuffer.
+
+Uso::
+
+    python -m benchmarks.bench_time_buffer [--sizes 1000,10000,100000] [--json]
+"""
+import argparse
+import json
+import time
+
+from pocketoptionapi.ws.objects.time_buffer import TimeOrderedBuffer
+
+
+def legacy_queue_add(queue, maxdict, key, value):
+    """Implementação original do ``dict_queue_add`` para um único nível."""
+    if key in queue:
+        queue[key] = value
+    else:
+        while True:
+            if len(queue) < maxdict:
+                queue[key] = value
+                break
+            else:
+                del queue[sorted(queue.keys(), reverse=False)[0]]
+
+
+def per_insert_us(insert, size, inserts):
+    """Enche até a capacidade e mede inserções com descarte (µs por inserção)."""
+    for key in range(size):
+        insert(key)
+    start = time.perf_counter()
+    for key in range(size, size + inserts):
+        insert(key)
+    return (time.perf_counter() - start) / inserts * 1e6
+
+
+def run(sizes):
+    results = []
+    for size in sizes:
+        # O antigo é O(n log n) por inserção; limita as medições em tamanhos grandes
+        legacy_inserts = max(20, min(5000, 2_000_000 // size))
+        queue = {}
+        legacy = per_insert_us(lambda k: legacy_queue_add(queue, size, k, k), size, legacy_inserts)
+
+        buffer = TimeOrderedBuffer(size)
+        current = per_insert_us(lambda k: buffer.__setitem__(k, k), size, 100000)
+
+        start = time.perf_counter()
+        buffer.range(size * 1.5, size * 1.5 + 100)
+        range_us = (time.perf_counter() - start) * 1e6
+
+        results.append({"size": size, "legacy_us": legacy, "buffer_us": current,
+                        "speedup": legacy / current if current else None, "range_us": range_us})
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,100000", help="capacidades separadas por vírgula")
+    parser.add_argument("--json", action="store_true", help="saída em JSON")
+    args = parser.parse_args(argv)
+    results = run([int(size) for size in args.sizes.split(",")])
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return results
+    for row in results:
+        print(f"{row['size']:>8} antigo {row['legacy_us']:>12.2f} us  buffer {row['buffer_us']:>8.3f} us"
+              f"  x{row['speedup']:>10.1f}  range {row['range_us']:>8.2f} us")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Frames de exemplo com o mesmo formato dos capturados da PocketOption.
+
+Os builders geram payloads determinísticos (semente fixa) no formato do
+fio; ``load_recorded`` lê frames reais capturados, um por arquivo, para
+rodar os mesmos benchmarks sobre tráfego gravado.
+"""
+import json
+import os
+import random
+
+from pocketoptionapi.constants import ACTIVES
+
+BASE_TIME = 1712002800
+
+
+def payout_rows(seed=7):
+    """Linhas do frame ``updateAssets`` (o ``[[5,"#AAPL",...`` do cliente)."""
+    rnd = random.Random(seed)
+    rows = []
+    for symbol, asset_id in ACTIVES.items():
+        if symbol.startswith("#"):
+            kind = "stock"
+        elif symbol.endswith("USD") and symbol[:3] in ("BTC", "ETH", "DOT", "DAS"):
+            kind = "cryptocurrency"
+        elif symbol.startswith("X"):
+            kind = "commodity"
+        else:
+            kind = "currency"
+        rows.append([
+            asset_id, symbol, symbol.replace("_otc", " OTC"), kind, 2,
+            rnd.choice([60, 70, 80, 85, 92]), 60, 30, 3, 0, 170, 0, [], BASE_TIME,
+            rnd.random() > 0.2, [{"time": 60}, {"time": 120}, {"time": 180}, {"time": 300}],
+            -BASE_TIME, 0, BASE_TIME,
+        ])
+    return rows
+
+
+def history_period(count=9000, asset="AUDNZD_otc", period=60, seed=11):
+    """Resposta binária de ``loadHistoryPeriod`` com ``count`` pontos."""
+    rnd = random.Random(seed)
+    price = 1.08
+    data = []
+    for i in range(count):
+        price += rnd.uniform(-0.0002, 0.0002)
+        data.append({"time": BASE_TIME - count + i, "price": round(price, 5)})
+    return {"asset": asset, "index": BASE_TIME, "data": data, "period": period}
+
+
+def update_stream(asset="AUDNZD_otc"):
+    """Anexo binário de um ``updateStream``."""
+    return [[asset, BASE_TIME + 0.123, 1.08123]]
+
+
+def open_order(request_id=1):
+    """Mensagem de saída ``openOrder``."""
+    return ["openOrder", {"asset": "EURUSD_otc", "amount": 1, "action": "call", "isDemo": 1,
+                          "requestId": request_id, "optionType": 100, "time": 60}]
+
+
+def encoded(obj):
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def sample_frames():
+    """Dicionário nome -> bytes com os frames de entrada mais relevantes."""
+    return {
+        "updateAssets": encoded(payout_rows()),
+        "loadHistoryPeriod": encoded(history_period()),
+        "updateStream": encoded(update_stream()),
+    }
+
+
+def load_recorded(directory):
+    """Lê frames gravados (um frame bruto por arquivo) de um diretório.
+
+    :returns: Dicionário nome do arquivo -> bytes.
+    """
+    frames = {}
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if os.path.isfile(path):
+            with open(path, "rb") as fh:
+                frames[name] = fh.read()
+    return frames
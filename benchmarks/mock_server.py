@@ -0,0 +1,417 @@
+"""
+Servidor local que imita a PocketOption, para testes e benchmarks sem rede.
+
+Fala o mesmo Engine.IO v4 / Socket.IO que o cliente espera: ``0{"sid"}``,
+``40``, eventos ``451-`` com anexo binário, ``successauth``,
+``successupdateBalance``, ``updateAssets``, ``loadHistoryPeriod``,
+``updateStream``, ``successopenOrder`` e ``successcloseOrder``.
+
+Os preços são uma função determinística do ativo e do tempo, então o
+histórico, os ticks e o resultado das ordens são reproduzíveis. Latência,
+taxa de ticks e falhas podem ser alteradas a qualquer momento, inclusive
+por um roteiro (ver :meth:`MockPocketOptionServer.schedule`).
+
+Uso::
+
+    async with MockPocketOptionServer(latency=0.02, tick_rate=20) as server:
+        client = AsyncPocketOption(auth_message(1), True, url=server.url)
+        ...
+
+    python -m benchmarks.mock_server [--port 8765] [--latency 0.02]
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import math
+import random
+import time
+import uuid
+
+import websockets
+
+from benchmarks.frames import payout_rows
+
+logger = logging.getLogger(__name__)
+
+
+def auth_message(uid, demo=True):
+    """Frame de autenticação (o "SSID") aceito pelo servidor local."""
+    return '42["auth",{"session":"s%d","isDemo":%d,"uid":%d,"platform":2}]' % (uid, int(demo), uid)
+
+
+def price_at(asset, timestamp):
+    """Preço determinístico de um ativo em um instante."""
+    base = 1.0 + (sum(map(ord, asset)) % 97) / 100.0
+    return round(base + 0.002 * math.sin(timestamp / 37.0) + 0.0007 * math.sin(timestamp / 5.3), 5)
+
+
+class Faults(object):
+    """Falhas injetadas pelo servidor; podem ser alteradas em execução.
+
+    :ivar float drop_rate: Probabilidade de ignorar um pedido (sem resposta).
+    :ivar float reject_rate: Probabilidade de responder ``failopenOrder``.
+    :ivar int disconnect_after: Fecha a conexão após esse número de mensagens recebidas.
+    :ivar bool reject_auth: Responde ``NotAuthorized`` à autenticação.
+    :ivar bool stall: Segura todas as respostas até voltar a False.
+    :ivar bool skip_close: Não envia o ``successcloseOrder`` das ordens.
+    :ivar bool omit_index: Não ecoa o ``index`` do ``loadHistoryPeriod``.
+    """
+
+    def __init__(self, drop_rate=0.0, reject_rate=0.0, disconnect_after=None, reject_auth=False,
+                 stall=False, skip_close=False, omit_index=False):
+        self.drop_rate = drop_rate
+        self.reject_rate = reject_rate
+        self.disconnect_after = disconnect_after
+        self.reject_auth = reject_auth
+        self.stall = stall
+        self.skip_close = skip_close
+        self.omit_index = omit_index
+
+
+class _Connection(object):
+    """Estado de uma conexão: conta, ativos transmitidos e fila de saída."""
+
+    def __init__(self, ws, sid):
+        self.ws = ws
+        self.sid = sid
+        self.uid = None
+        self.demo = 1
+        self.streams = []
+        self.received = 0
+        self.outgoing = asyncio.Queue()
+        self.last_due = 0.0
+        self.tasks = []
+
+
+class MockPocketOptionServer(object):
+    """Servidor websocket local com o protocolo da PocketOption.
+
+    Cada resposta passa por uma fila por conexão e só sai após ``latency``
+    (mais até ``jitter``) segundos, sem trocar a ordem. As ordens fecham
+    após ``time * time_scale`` segundos; o resultado compara o preço de
+    abertura com o de fechamento.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, tick_rate=10.0,
+                 time_scale=1.0, history_step=1.0, balance=1000.0, clock_offset=0.0,
+                 ping_interval=25.0, faults=None, seed=0):
+        """
+        :param str host: Endereço de escuta.
+        :param int port: Porta (0: escolhida pelo sistema, ver :attr:`url`).
+        :param float latency: Atraso (s) de cada frame enviado.
+        :param float jitter: Atraso extra máximo (s), sorteado por frame.
+        :param float tick_rate: Ticks por segundo de cada ativo assinado (0: nenhum).
+        :param float time_scale: Fator sobre a duração das ordens (ex.: 0.01 fecha
+            uma ordem de 60 s em 0,6 s).
+        :param float history_step: Segundos entre pontos do ``loadHistoryPeriod``.
+        :param float balance: Saldo inicial de cada conta.
+        :param float clock_offset: Diferença (s) do relógio do servidor para o local.
+        :param float ping_interval: Intervalo (s) dos pings Engine.IO (None: sem ping).
+        :param faults: (opcional) Uma instância de :class:`Faults`.
+        :param int seed: Semente dos sorteios (jitter, falhas e ids).
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.tick_rate = tick_rate
+        self.time_scale = time_scale
+        self.history_step = history_step
+        self.initial_balance = balance
+        self.clock_offset = clock_offset
+        self.ping_interval = ping_interval
+        self.faults = faults if faults is not None else Faults()
+        self.payouts = payout_rows(seed)
+        self.balances = {}
+        self.connections = set()
+        self.counters = {}
+        self._rnd = random.Random(seed)
+        self._sids = itertools.count(1)
+        self._server = None
+        self._timers = []
+
+    async def start(self):
+        self._server = await websockets.serve(self._handler, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        for timer in self._timers:
+            timer.cancel()
+        await self.disconnect_all()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    @property
+    def url(self):
+        return f"ws://{self.host}:{self.port}/socket.io/?EIO=4&transport=websocket"
+
+    def now(self):
+        """Relógio do servidor."""
+        return time.time() + self.clock_offset
+
+    def schedule(self, delay, action):
+        """Roda ``action(server)`` daqui a ``delay`` segundos (pode ser corrotina).
+
+        Exemplo: ``server.schedule(2, lambda s: setattr(s.faults, "stall", True))``.
+        """
+        def fire():
+            result = action(self)
+            if asyncio.iscoroutine(result):
+                asyncio.ensure_future(result)
+
+        self._timers.append(asyncio.get_running_loop().call_later(delay, fire))
+
+    async def disconnect_all(self):
+        """Derruba todas as conexões abertas (o cliente deve reconectar)."""
+        for conn in list(self.connections):
+            await conn.ws.close()
+
+    def _count(self, name):
+        self.counters[name] = self.counters.get(name, 0) + 1
+
+    @property
+    def stats(self):
+        """Conexões abertas e contadores de eventos recebidos e enviados."""
+        return {"connections": len(self.connections), "counters": dict(self.counters)}
+
+    def _send(self, conn, *frames):
+        # Mantém a ordem mesmo com jitter: nenhum frame sai antes do anterior
+        delay = self.latency + (self._rnd.uniform(0, self.jitter) if self.jitter else 0.0)
+        due = max(conn.last_due, time.monotonic() + delay)
+        conn.last_due = due
+        conn.outgoing.put_nowait((due, frames))
+
+    def emit(self, conn, event, payload):
+        """Envia um evento com o payload como anexo binário (``451-``)."""
+        self._count("sent:" + event)
+        self._send(conn, '451-["%s",{"_placeholder":true,"num":0}]' % event,
+                   json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+
+    def emit_text(self, conn, event, payload):
+        """Envia um evento com o payload no próprio frame de texto (``42``)."""
+        self._count("sent:" + event)
+        self._send(conn, "42" + json.dumps([event, payload], separators=(",", ":")))
+
+    async def _writer(self, conn):
+        while True:
+            due, frames = await conn.outgoing.get()
+            wait = due - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            while self.faults.stall:
+                await asyncio.sleep(0.01)
+            for frame in frames:
+                await conn.ws.send(frame)
+
+    async def _pinger(self, conn):
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            self._send(conn, "2")
+
+    async def _ticker(self, conn):
+        while True:
+            rate = self.tick_rate
+            if not rate:
+                await asyncio.sleep(0.05)
+                continue
+            await asyncio.sleep(1.0 / rate)
+            if conn.streams:
+                now = self.now()
+                self.emit(conn, "updateStream",
+                          [[asset, round(now, 3), price_at(asset, now)] for asset in conn.streams])
+
+    async def _handler(self, ws, *args):
+        conn = _Connection(ws, f"mock{next(self._sids)}")
+        self.connections.add(conn)
+        conn.tasks.append(asyncio.ensure_future(self._writer(conn)))
+        conn.tasks.append(asyncio.ensure_future(self._ticker(conn)))
+        if self.ping_interval:
+            conn.tasks.append(asyncio.ensure_future(self._pinger(conn)))
+        self._send(conn, "0" + json.dumps({"sid": conn.sid, "upgrades": [],
+                                           "pingInterval": int((self.ping_interval or 25) * 1000),
+                                           "pingTimeout": 20000}))
+        try:
+            async for message in ws:
+                conn.received += 1
+                limit = self.faults.disconnect_after
+                if limit is not None and conn.received > limit:
+                    self._count("fault:disconnect")
+                    break
+                self._on_message(conn, message)
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        finally:
+            self.connections.discard(conn)
+            for task in conn.tasks:
+                task.cancel()
+            await ws.close()
+
+    def _on_message(self, conn, message):
+        if not isinstance(message, str):
+            return
+        if message == "40":
+            self._send(conn, '40{"sid":"%s"}' % conn.sid)
+            return
+        if message == "3" or not message.startswith("42"):
+            return
+        try:
+            event, payload = (json.loads(message[2:]) + [None])[:2]
+        except (ValueError, TypeError):
+            return
+        self._count("recv:" + str(event))
+        if event == "auth":
+            self._on_auth(conn, payload)
+            return
+        if self.faults.drop_rate and self._rnd.random() < self.faults.drop_rate:
+            self._count("fault:drop")
+            return
+        handler = self._handlers.get(event)
+        if handler is not None:
+            handler(self, conn, payload)
+
+    def _on_auth(self, conn, payload):
+        if self.faults.reject_auth or not isinstance(payload, dict):
+            self.emit_text(conn, "NotAuthorized", {})
+            return
+        conn.uid = payload.get("uid")
+        conn.demo = payload.get("isDemo", 1)
+        self.balances.setdefault(conn.uid, self.initial_balance)
+        self.emit(conn, "successauth", {"id": conn.sid})
+        self._send_balance(conn)
+        self.emit(conn, "updateAssets", self.payouts)
+
+    def _send_balance(self, conn):
+        self.emit(conn, "successupdateBalance",
+                  {"uid": conn.uid, "balance": self.balances.get(conn.uid), "isDemo": conn.demo})
+
+    def _on_change_symbol(self, conn, payload):
+        asset = payload.get("asset") if isinstance(payload, dict) else None
+        if asset is not None:
+            # O changeSymbol troca o ativo transmitido pela conexão
+            conn.streams = [asset]
+
+    def _on_subfor(self, conn, payload):
+        if isinstance(payload, str) and payload not in conn.streams:
+            conn.streams.append(payload)
+
+    def _on_unsubfor(self, conn, payload):
+        if payload in conn.streams:
+            conn.streams.remove(payload)
+
+    def _on_load_history(self, conn, payload):
+        if not isinstance(payload, dict):
+            return
+        asset = payload.get("asset")
+        end = payload.get("time") or int(self.now())
+        step = self.history_step
+        count = max(1, int(payload.get("offset", 1) / step))
+        first = end - (count - 1) * step
+        data = [{"time": first + i * step, "price": price_at(asset, first + i * step)}
+                for i in range(count)]
+        reply = {"asset": asset, "data": data, "period": payload.get("period")}
+        if not self.faults.omit_index:
+            reply["index"] = payload.get("index")
+        self.emit(conn, "loadHistoryPeriod", reply)
+
+    def _on_open_order(self, conn, payload):
+        if not isinstance(payload, dict):
+            return
+        request_id = payload.get("requestId")
+        amount = payload.get("amount", 0)
+        balance = self.balances.get(conn.uid, 0)
+        if self.faults.reject_rate and self._rnd.random() < self.faults.reject_rate:
+            self._count("fault:reject")
+            self.emit(conn, "failopenOrder", {"requestId": request_id, "message": "rejected"})
+            return
+        if amount > balance:
+            self.emit(conn, "failopenOrder", {"requestId": request_id, "message": "not_money"})
+            return
+        asset = payload.get("asset")
+        duration = payload.get("time", 60)
+        opened = self.now()
+        row = next((row for row in self.payouts if row[1] == asset), None)
+        deal = {
+            "id": str(uuid.UUID(int=self._rnd.getrandbits(128))),
+            "requestId": request_id,
+            "uid": conn.uid,
+            "asset": asset,
+            "amount": amount,
+            "command": 0 if payload.get("action") == "call" else 1,
+            "isDemo": conn.demo,
+            "percentProfit": row[5] if row is not None else 80,
+            "percentLoss": 100,
+            "openPrice": price_at(asset, opened),
+            "openTimestamp": int(opened),
+            "closeTimestamp": int(opened + duration),
+            "profit": 0,
+        }
+        self.balances[conn.uid] = balance - amount
+        self.emit(conn, "successopenOrder", deal)
+        self._send_balance(conn)
+        if not self.faults.skip_close:
+            asyncio.get_running_loop().call_later(duration * self.time_scale, self._close_order,
+                                                  conn, deal)
+
+    def _close_order(self, conn, deal):
+        if conn not in self.connections:
+            return
+        close_price = price_at(deal["asset"], self.now())
+        moved = close_price - deal["openPrice"]
+        if moved == 0:
+            profit = 0.0
+        elif (moved > 0) == (deal["command"] == 0):
+            profit = round(deal["amount"] * deal["percentProfit"] / 100.0, 2)
+        else:
+            profit = -deal["amount"]
+        closed = dict(deal, closePrice=close_price, profit=profit)
+        self.balances[conn.uid] = self.balances.get(conn.uid, 0) + deal["amount"] + profit
+        self.emit(conn, "successcloseOrder", {"profit": profit, "deals": [closed]})
+        self._send_balance(conn)
+
+    _handlers = {
+        "changeSymbol": _on_change_symbol,
+        "subfor": _on_subfor,
+        "unsubfor": _on_unsubfor,
+        "loadHistoryPeriod": _on_load_history,
+        "openOrder": _on_open_order,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--tick-rate", type=float, default=10.0)
+    parser.add_argument("--time-scale", type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    async def serve():
+        server = MockPocketOptionServer(args.host, args.port, latency=args.latency, jitter=args.jitter,
+                                        tick_rate=args.tick_rate, time_scale=args.time_scale)
+        async with server:
+            print(f"Servidor local em {server.url}")
+            print(f"SSID de exemplo: {auth_message(1)}")
+            await asyncio.Future()
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
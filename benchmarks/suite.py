@@ -0,0 +1,272 @@
+"""
+Suíte de benchmarks dos caminhos críticos, com comparação contra uma base.
+
+Mede o processamento de frames no ``on_message``, a consulta de payouts,
+a latência do envio de uma ordem até a confirmação e o tempo do
+``get_candles`` com N páginas (contra o servidor local de
+:mod:`benchmarks.mock_server`), além da reamostragem em velas.
+
+Uso::
+
+    python -m benchmarks [--quick] [--only on_message,orders] [--frames DIR]
+                         [--save atual.json] [--baseline base.json] [--threshold 0.1]
+
+Com ``--baseline``, cada métrica é comparada com a da base e o processo sai
+com código 1 se alguma piorar mais que ``--threshold`` (fração).
+"""
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import time
+import timeit
+
+import numpy as np
+
+from benchmarks import frames
+from benchmarks.mock_server import MockPocketOptionServer, auth_message
+from pocketoptionapi.api import PocketOptionAPI
+from pocketoptionapi.async_api import AsyncPocketOption, resample_ohlc
+from pocketoptionapi.stable_api import PocketOption
+from pocketoptionapi.ws.codec import get_codec
+
+# Unidades em que um valor maior é melhor; nas demais, menor é melhor
+HIGHER_IS_BETTER = ("msg/s",)
+
+# Sem limites de envio: mede o caminho do cliente, não o balde de fichas
+UNLIMITED = {"order": None, "history": None, "subscription": None}
+
+
+def best_of(func, number, repeat=5):
+    """Menor tempo médio por chamada, em microssegundos."""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+
+
+def metric(value, unit):
+    return {"value": value, "unit": unit}
+
+
+def percentiles(samples, unit_scale=1e3):
+    """Mediana, p90, p99 e máximo de amostras em segundos (em ms por padrão)."""
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+    return {
+        "p50": statistics.median(ordered) * unit_scale,
+        "p90": ordered[int(last * 0.9)] * unit_scale,
+        "p99": ordered[int(last * 0.99)] * unit_scale,
+        "max": ordered[-1] * unit_scale,
+    }
+
+
+def bench_on_message(inbound, quick):
+    """Frames por segundo do ``on_message`` (cabeçalho ``451-`` + anexo binário)."""
+
+    async def measure():
+        api = PocketOptionAPI(ssid=auth_message(1), demo=True, loop=asyncio.get_running_loop(),
+                              url="ws://127.0.0.1:1/")
+        client = api.websocket
+        results = {}
+        for name, raw in inbound.items():
+            header = '451-["%s",{"_placeholder":true,"num":0}]' % name
+            # Frames maiores pedem menos repetições
+            n = max(20, min(20000, 20_000_000 // max(len(raw), 1)))
+            if quick:
+                n = max(10, n // 10)
+            on_message = client.on_message
+            best = None
+            for _ in range(3):
+                start = time.perf_counter()
+                for _ in range(n):
+                    await on_message(header)
+                    await on_message(raw)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            results[f"on_message.{name}"] = metric(n / best, "msg/s")
+        return results
+
+    return asyncio.run(measure())
+
+
+def bench_payouts(quick):
+    """Custo de montar a tabela de payouts e de consultá-la."""
+    api = PocketOptionAPI()
+    rows = frames.payout_rows()
+    api.payouts.update(rows)
+    symbols = [row[1] for row in rows[:20]]
+    number = 20000 if quick else 200000
+    return {
+        "payouts.update": metric(best_of(lambda: api.payouts.update(rows), 50 if quick else 500), "us"),
+        "payouts.lookup": metric(best_of(lambda: api.payouts.payout("EURUSD_otc"), number), "us"),
+        "payouts.lookup_miss": metric(best_of(lambda: api.payouts.payout("XXX"), number), "us"),
+        "payouts.lookup_20": metric(best_of(lambda: api.payouts.get_payouts(symbols), number // 10), "us"),
+    }
+
+
+def bench_orders(quick, latency=0.0):
+    """Latência do ``buy`` (escrita do openOrder até o successopenOrder) contra o servidor local."""
+    count = 50 if quick else 500
+
+    async def measure():
+        async with MockPocketOptionServer(latency=latency, tick_rate=0, time_scale=0.001,
+                                          balance=1e9) as server:
+            client = AsyncPocketOption(auth_message(1), True, url=server.url, rate_limits=UNLIMITED)
+            if not await client.connect(10):
+                raise RuntimeError("Sem conexão com o servidor local")
+            samples = []
+            for _ in range(count):
+                start = time.perf_counter()
+                ok, _ = await client.buy(1, "EURUSD_otc", "call", 60)
+                if ok:
+                    samples.append(time.perf_counter() - start)
+
+            # Rajada: todas as ordens de uma vez
+            start = time.perf_counter()
+            burst = await client.buy_multi([(1, "EURUSD_otc", "call", 60)] * count)
+            burst_s = time.perf_counter() - start
+            await client.disconnect()
+
+        stats = percentiles(samples)
+        results = {f"orders.ack_{name}": metric(value, "ms") for name, value in stats.items()}
+        results["orders.failed"] = metric(count - len(samples), "count")
+        results["orders.burst"] = metric(sum(1 for ok, _ in burst if ok) / burst_s, "msg/s")
+        return results
+
+    return asyncio.run(measure())
+
+
+def bench_candles(quick, pages=10, count=9000):
+    """Tempo total do ``get_candles`` com ``pages`` páginas contra o servidor local."""
+    if quick:
+        pages = min(pages, 3)
+
+    async def measure():
+        async with MockPocketOptionServer(tick_rate=0) as server:
+            client = AsyncPocketOption(auth_message(1), True, url=server.url, rate_limits=UNLIMITED)
+            if not await client.connect(10):
+                raise RuntimeError("Sem conexão com o servidor local")
+            end = int(server.now()) // 60 * 60
+            samples = []
+            candles = None
+            for _ in range(3):
+                start = time.perf_counter()
+                candles = await client.get_candles("EURUSD_otc", 60, end, count, pages)
+                samples.append(time.perf_counter() - start)
+            await client.disconnect()
+        return {
+            f"get_candles.pages_{pages}": metric(min(samples) * 1e3, "ms"),
+            f"get_candles.rows_{pages}": metric(len(candles) if candles is not None else 0, "count"),
+        }
+
+    return asyncio.run(measure())
+
+
+def bench_resample(quick, points=90000):
+    """Custo da reamostragem em velas no ``get_candles`` e no ``process_data_history``."""
+    if quick:
+        points //= 10
+    times = np.arange(points, dtype=np.float64) + frames.BASE_TIME
+    prices = 1.08 + np.sin(times / 37.0) * 0.002
+    history = {"history": [[t, p] for t, p in zip(times.tolist(), prices.tolist())]}
+    number = 2 if quick else 5
+    return {
+        f"resample.get_candles_{points}": metric(best_of(lambda: resample_ohlc(times, prices, 60), number, 3) / 1e3, "ms"),
+        f"resample.process_data_history_{points}": metric(
+            best_of(lambda: PocketOption.process_data_history(history, 60), number, 3) / 1e3, "ms"),
+    }
+
+
+CASES = ("on_message", "payouts", "orders", "candles", "resample")
+
+
+def run(only=None, quick=False, inbound=None, latency=0.0, pages=10):
+    """Roda os casos pedidos.
+
+    :returns: Dicionário métrica -> {"value", "unit"}.
+    """
+    selected = only or CASES
+    results = {}
+    if "on_message" in selected:
+        results.update(bench_on_message(inbound or frames.sample_frames(), quick))
+    if "payouts" in selected:
+        results.update(bench_payouts(quick))
+    if "orders" in selected:
+        results.update(bench_orders(quick, latency))
+    if "candles" in selected:
+        results.update(bench_candles(quick, pages))
+    if "resample" in selected:
+        results.update(bench_resample(quick))
+    return results
+
+
+def compare(results, baseline, threshold=0.1):
+    """Compara as métricas com as da base.
+
+    :returns: Lista de dicionários com métrica, atual, base, variação relativa,
+        piora (a variação no sentido ruim da unidade) e se é regressão.
+    """
+    rows = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None or current["unit"] == "count" or not base["value"]:
+            continue
+        change = (current["value"] - base["value"]) / base["value"]
+        worse = -change if current["unit"] in HIGHER_IS_BETTER else change
+        rows.append({"metric": name, "current": current["value"], "baseline": base["value"],
+                     "unit": current["unit"], "change": change, "worse": worse,
+                     "regression": worse > threshold})
+    return rows
+
+
+def environment():
+    return {"python": sys.version.split()[0], "platform": platform.platform(),
+            "codec": get_codec(None).name, "time": int(time.time())}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--only", help=f"casos separados por vírgula ({','.join(CASES)})")
+    parser.add_argument("--quick", action="store_true", help="menos repetições")
+    parser.add_argument("--frames", help="diretório com frames gravados (um por arquivo, nome = evento)")
+    parser.add_argument("--latency", type=float, default=0.0, help="latência (s) do servidor local")
+    parser.add_argument("--pages", type=int, default=10, help="páginas do get_candles")
+    parser.add_argument("--save", help="grava o resultado em JSON neste arquivo")
+    parser.add_argument("--baseline", help="resultado JSON anterior para comparar")
+    parser.add_argument("--threshold", type=float, default=0.1, help="piora tolerada (fração)")
+    parser.add_argument("--json", action="store_true", help="saída em JSON")
+    args = parser.parse_args(argv)
+
+    only = args.only.split(",") if args.only else None
+    unknown = set(only or ()) - set(CASES)
+    if unknown:
+        parser.error(f"casos desconhecidos: {', '.join(sorted(unknown))}")
+    inbound = frames.load_recorded(args.frames) if args.frames else None
+    report = {"environment": environment(),
+              "results": run(only, args.quick, inbound, args.latency, args.pages)}
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as fh:
+            baseline = json.load(fh)["results"]
+        report["comparison"] = compare(report["results"], baseline, args.threshold)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for name, row in report["results"].items():
+            print(f"{name:<40} {row['value']:>14.3f} {row['unit']}")
+        for row in report.get("comparison", ()):
+            flag = "REGRESSÃO" if row["regression"] else ""
+            print(f"{row['metric']:<40} {row['baseline']:>12.3f} -> {row['current']:>12.3f} "
+                  f"{row['unit']:<6} {row['change']:>+8.1%} {flag}")
+
+    if any(row["regression"] for row in report.get("comparison", ())):
+        raise SystemExit(1)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -11,17 +11,34 @@ import requests
 import ssl
 import atexit
 from collections import deque
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from pocketoptionapi.ws.client import WebsocketClient
+from pocketoptionapi.ws.pending import PendingRequests
+from pocketoptionapi.ws.codec import get_codec
+from pocketoptionapi.ws.orders import OrderPipeline
+from pocketoptionapi.ws.history import HistoryPager
+from pocketoptionapi.ws.resume import SessionResume
+from pocketoptionapi.ws.events import EventBus, CANDLE
+from pocketoptionapi.ws.outbound import classify
+from pocketoptionapi.ws.subscriptions import SubscriptionManager
+from pocketoptionapi.ws.metrics import Metrics
 from pocketoptionapi.ws.channels.get_balances import *
 from pocketoptionapi.ws.channels.ssid import Ssid
 from pocketoptionapi.ws.channels.candles import GetCandles
 from pocketoptionapi.ws.channels.buyv3 import *
 from pocketoptionapi.ws.objects.timesync import TimeSync
 from pocketoptionapi.ws.objects.candles import Candles
-import pocketoptionapi.global_value as global_value
+from pocketoptionapi.ws.objects.ticks import TickStore
+from pocketoptionapi.ws.objects.live_candles import LiveCandles
+from pocketoptionapi.ws.objects.time_buffer import nested_time_buffers
+from pocketoptionapi.ws.objects.payouts import PayoutTable
+from pocketoptionapi.ws.objects.deals import DealBook
+from pocketoptionapi.assets import AssetRegistry
+from pocketoptionapi.session import SessionState
 from pocketoptionapi.ws.channels.change_symbol import ChangeSymbol
 from collections import defaultdict
 from pocketoptionapi.ws.objects.time_sync import TimeSynchronizer
+from pocketoptionapi.expiration import ExpirationScheduler
 
 def nested_dict(n, type):
     if n == 1:
@@ -32,79 +49,155 @@ def nested_dict(n, type):
 class PocketOptionAPI(object):
     """Classe para comunicação com a API da Pocket Option."""
 
-    socket_option_opened = {}
-    time_sync = TimeSync()
-    sync = TimeSynchronizer()
-    timesync = None
-    candles = Candles()
-    api_option_init_all_result = []
-    api_option_init_all_result_v2 = []
-    underlying_list_data = None
-    position_changed = None
-    instrument_quites_generated_data = nested_dict(2, dict)
-    instrument_quotes_generated_raw_data = nested_dict(2, dict)
-    instrument_quites_generated_timestamp = nested_dict(2, dict)
-    strike_list = None
-    leaderboard_deals_client = None
-    order_async = None
-    instruments = None
-    financial_information = None
-    buy_id = None
-    buy_order_id = None
-    traders_mood = {}  # obtém porcentagem alta (put)
-    order_data = None
-    positions = None
-    position = None
-    deferred_orders = None
-    position_history = None
-    position_history_v2 = None
-    available_leverages = None
-    order_canceled = None
-    close_position_data = None
-    overnight_fee = None
-    digital_option_placed_id = None
-    live_deal_data = nested_dict(3, deque)
-    subscribe_commission_changed_data = nested_dict(2, dict)
-    real_time_candles = nested_dict(3, dict)
-    real_time_candles_maxdict_table = nested_dict(2, dict)
-    candle_generated_check = nested_dict(2, dict)
-    candle_generated_all_size_check = nested_dict(1, dict)
-    api_game_getoptions_result = None
-    sold_options_respond = None
-    tpsl_changed_respond = None
-    auto_margin_call_changed_respond = None
-    top_assets_updated_data = {}
-    get_options_v2_data = None
-    buy_multi_result = None
-    buy_multi_option = {}
-    result = None
-    training_balance_reset_request = None
-    balances_raw = None
-    user_profile_client = None
-    leaderboard_userinfo_deals_client = None
-    users_availability = None
-    history_data = None
-    historyNew = None
-    server_timestamp = None
-    sync_datetime = None
-
-    def __init__(self, proxies=None):
+    def __init__(self, proxies=None, codec=None, tick_capacity=10000, candle_periods=(60,),
+                 realtime_maxlen=1000, ssid=None, demo=None, loop=None, url=None,
+                 regions=None, deal_ttl=3600, rate_limits=None, assets_per_connection=None,
+                 max_connections=4, metrics=False):
         """
         :param dict proxies: (opcional) Os proxies para requisições http.
+        :param str codec: (opcional) Codec JSON dos frames ("orjson", "msgspec"
+            ou "json"). Por padrão usa o mais rápido instalado.
+        :param int tick_capacity: (opcional) Ticks mantidos em memória por ativo.
+        :param candle_periods: (opcional) Períodos, em segundos, das velas ao vivo.
+        :param int realtime_maxlen: (opcional) Entradas mantidas por ativo/período em
+            ``real_time_candles`` e ``live_deal_data``.
+        :param str ssid: (opcional) Mensagem de autenticação desta sessão.
+        :param bool demo: (opcional) Se a sessão usa a conta demo.
+        :param loop: (opcional) Event loop já em execução em outra thread (ver
+            :class:`EventLoopThread <pocketoptionapi.session.EventLoopThread>`),
+            para várias sessões compartilharem o mesmo loop.
+        :param str url: (opcional) Endereço do websocket, no lugar das regiões padrão.
+        :param dict regions: (opcional) Tabela nome -> url de regiões candidatas
+            (padrão: ``constants.REGION.REGIONS``); a mais rápida é escolhida.
+        :param float deal_ttl: (opcional) Segundos que um deal fechado fica em ``deals``.
+        :param dict rate_limits: (opcional) Limites de envio por classe de mensagem,
+            classe -> (mensagens por segundo, rajada) ou None para sem limite
+            (ver :data:`pocketoptionapi.ws.outbound.DEFAULT_LIMITS`).
+        :param int assets_per_connection: (opcional) Liga o pool de assinaturas:
+            ativos por conexão antes de abrir outra da mesma conta. Sem ele
+            (padrão), todos os ativos são multiplexados nesta conexão.
+        :param int max_connections: (opcional) Máximo de conexões do pool,
+            contando esta (só vale com ``assets_per_connection``).
+        :param metrics: (opcional) True para ligar as métricas de latência e vazão,
+            ou uma instância de :class:`Metrics <pocketoptionapi.ws.metrics.Metrics>`.
         """
+        self.state = SessionState(ssid, demo)
+        self.url = url
+        self.regions = regions
+        self.rate_limits = rate_limits
         self.websocket_client = None
         self.websocket_thread = None
+        self.websocket_task = None
         self.session = requests.Session()
         self.session.verify = False
         self.session.trust_env = False
         self.proxies = proxies
+        self.codec = get_codec(codec)
+        self.ticks = TickStore(tick_capacity)
+        self.live_candles = LiveCandles(candle_periods)
+        self.real_time_candles = nested_time_buffers(realtime_maxlen)
+        self.live_deal_data = nested_time_buffers(realtime_maxlen)
+        self.live_candles.on_close(self._store_real_time_candle)
+        self.payouts = PayoutTable()
+        self.assets = AssetRegistry()
+        self.deals = DealBook(ttl=deal_ttl)
+        self.payouts.on_update(self.assets.update_from_payouts)
         # usado para determinar se uma ordem de compra foi definida ou falhou
         # Se for None, não houve ordem de compra ainda ou acabou de ser enviada
         # Se for False, a última falhou
         # Se for True, a última ordem de compra foi bem-sucedida
         self.buy_successful = None
-        self.loop = asyncio.get_event_loop()
+
+        self.socket_option_opened = {}
+        self.sync = TimeSynchronizer()
+        self.time_sync = TimeSync(self.sync)
+        self.expirations = ExpirationScheduler(self.sync)
+        self.timesync = None
+        self.candles = Candles()
+        self.api_option_init_all_result = []
+        self.api_option_init_all_result_v2 = []
+        self.underlying_list_data = None
+        self.position_changed = None
+        self.instrument_quites_generated_data = nested_dict(2, dict)
+        self.instrument_quotes_generated_raw_data = nested_dict(2, dict)
+        self.instrument_quites_generated_timestamp = nested_dict(2, dict)
+        self.strike_list = None
+        self.leaderboard_deals_client = None
+        self.order_async = None
+        self.instruments = None
+        self.financial_information = None
+        self.buy_id = None
+        self.buy_order_id = None
+        self.traders_mood = {}  # obtém porcentagem alta (put)
+        self.order_data = None
+        self.positions = None
+        self.position = None
+        self.deferred_orders = None
+        self.position_history = None
+        self.position_history_v2 = None
+        self.available_leverages = None
+        self.order_canceled = None
+        self.close_position_data = None
+        self.overnight_fee = None
+        self.digital_option_placed_id = None
+        self.subscribe_commission_changed_data = nested_dict(2, dict)
+        self.real_time_candles_maxdict_table = nested_dict(2, dict)
+        self.candle_generated_check = nested_dict(2, dict)
+        self.candle_generated_all_size_check = nested_dict(1, dict)
+        self.api_game_getoptions_result = None
+        self.sold_options_respond = None
+        self.tpsl_changed_respond = None
+        self.auto_margin_call_changed_respond = None
+        self.top_assets_updated_data = {}
+        self.get_options_v2_data = None
+        self.buy_multi_result = None
+        self.buy_multi_option = {}
+        self.result = None
+        self.training_balance_reset_request = None
+        self.balances_raw = None
+        self.user_profile_client = None
+        self.leaderboard_userinfo_deals_client = None
+        self.users_availability = None
+        self.history_data = None
+        self.historyNew = None
+        self.server_timestamp = None
+        self.sync_datetime = None
+
+        # Loop de longa duração que possui o websocket e a fila de saída.
+        # Com um loop externo, a sessão não cria thread própria.
+        self._owns_loop = loop is None
+        self.loop = asyncio.new_event_loop() if loop is None else loop
+        # Futures aguardando respostas, resolvidos pelo on_message
+        self.pending = PendingRequests()
+        self.orders = OrderPipeline(self)
+        self.history = HistoryPager(self)
+        self.resume = SessionResume(self)
+        # Assinaturas de ticks, velas, saldo e deals (ver AsyncPocketOption.on_tick etc.)
+        self.events = EventBus(self.loop)
+        self.live_candles.on_close(self._publish_candle)
+        # Fluxos de ticks assinados e o pool de conexões que os recebe
+        self.subscriptions = SubscriptionManager(self, assets_per_connection, max_connections)
+        # Conexões extras do pool só repassam ticks; saldo e deals vêm da principal
+        self.market_only = False
         self.websocket_client = WebsocketClient(self)
+        # Latências e contadores; as estatísticas já existentes entram como coletores
+        self.metrics = metrics if isinstance(metrics, Metrics) else Metrics(bool(metrics))
+        self.metrics.attach(self.loop)
+        self.metrics.collect("send", lambda: self.websocket.send_latency_stats)
+        self.metrics.collect("outbound", lambda: self.websocket.outbound_stats)
+        self.metrics.collect("resume", lambda: self.resume.stats)
+        self.metrics.collect("clock", lambda: self.sync.stats)
+        self.metrics.collect("expirations", lambda: {"rebuilds": self.expirations.rebuilds})
+        self.metrics.collect("subscriptions", lambda: self.subscriptions.stats)
+        self.metrics.collect("deals", lambda: self.deals.stats)
+
+    def _store_real_time_candle(self, asset, period, candle):
+        self.real_time_candles[asset][period][candle["time"]] = candle
+
+    def _publish_candle(self, asset, period, candle):
+        events = self.events
+        if events.wants(CANDLE):
+            events.publish(CANDLE, (asset, period), (asset, period, candle))
 
     @property
     def websocket(self):
@@ -115,80 +208,122 @@ class PocketOptionAPI(object):
         return self.websocket_client
     
     def GetPayoutData(self):
-        return global_value.PayoutData
+        return self.state.PayoutData
 
-    def send_websocket_request(self, name, msg, request_id="", no_force_send=True):
+    def send_websocket_request(self, name, msg, request_id="", no_force_send=True, on_written=None):
         """Envia requisição websocket para o servidor da Pocket Option.
 
-        :param no_force_send: Se não deve forçar o envio
+        A mensagem é apenas enfileirada; o loop do websocket faz a escrita.
+        Seguro para chamar de qualquer thread.
+
+        :param no_force_send: Mantido por compatibilidade (a fila já serializa as escritas)
         :param request_id: ID da requisição
         :param str name: Nome da requisição websocket
         :param dict msg: Mensagem da requisição websocket
+        :param on_written: (opcional) Chamado no loop do websocket após a escrita do frame
+        :returns: :class:`OutboundMessage <pocketoptionapi.ws.outbound.OutboundMessage>`
+            da fila de saída.
         """
         logger = logging.getLogger(__name__)
 
-        data = f'42{json.dumps(msg)}'
-
-        while (global_value.ssl_Mutual_exclusion or global_value.ssl_Mutual_exclusion_write) and no_force_send:
-            pass
-        global_value.ssl_Mutual_exclusion_write = True
+        data = f'42{self.codec.dumps(msg)}'
+        kind, key = classify(msg)
 
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-
-        loop.run_until_complete(self.websocket.send_message(data))
+        message = self.websocket.enqueue_message(data, on_written, kind, key)
 
         logger.debug(data)
-        global_value.ssl_Mutual_exclusion_write = False
+        return message
 
     def start_websocket(self):
-        global_value.websocket_is_connected = False
-        global_value.check_websocket_if_error = False
-        global_value.websocket_error_reason = None
-
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-
-        loop.run_until_complete(self.websocket.connect())
-        loop.run_forever()
-
-        while True:
-            try:
-                if global_value.check_websocket_if_error:
-                    return False, global_value.websocket_error_reason
-                if global_value.websocket_is_connected is False:
-                    return False, "Conexão websocket fechada."
-                elif global_value.websocket_is_connected is True:
-                    return True, None
-            except:
-                pass
-
-    def connect(self):
-        """Método para conexão com a API da Pocket Option."""
-
-        global_value.ssl_Mutual_exclusion = False
-        global_value.ssl_Mutual_exclusion_write = False
-
-        check_websocket, websocket_reason = self.start_websocket()
-
-        if not check_websocket:
-            return check_websocket, websocket_reason
-
-        self.time_sync.server_timestamps = None
-        while True:
-            try:
-                if self.time_sync.server_timestamps is not None:
-                    break
-            except:
-                pass
+        """Executa o loop do websocket na thread atual até a conexão terminar."""
+        self.state.reset_connection()
+
+        asyncio.set_event_loop(self.loop)
+
+        self.loop.run_until_complete(self.websocket.connect())
+
+    def connect(self, timeout=30):
+        """Método para conexão com a API da Pocket Option.
+
+        Inicia o websocket (em uma thread própria, ou no loop compartilhado
+        informado no construtor) e aguarda a autenticação (``successauth``)
+        até o prazo informado. Não chame a partir do próprio loop; lá use
+        :meth:`connect_async`.
+
+        :param float timeout: Prazo em segundos para a autenticação.
+        :returns: Tupla (sucesso, motivo da falha).
+        """
+        auth = self.pending.register("successauth")
+
+        if self._owns_loop:
+            self.websocket_thread = threading.Thread(target=self.start_websocket, daemon=True)
+            self.websocket_thread.start()
+        else:
+            self.state.reset_connection()
+            self.websocket_task = asyncio.run_coroutine_threadsafe(self.websocket.connect(), self.loop)
+
+        try:
+            self.pending.wait("successauth", auth, timeout)
+        except FutureTimeoutError:
+            if self.state.check_websocket_if_error:
+                return False, self.state.websocket_error_reason
+            return False, "Tempo esgotado aguardando a autenticação."
+        except ConnectionError as e:
+            return False, str(e)
         return True, None
 
+    async def connect_async(self, timeout=30):
+        """Como :meth:`connect`, mas aguardando dentro do loop da sessão.
+
+        :returns: Tupla (sucesso, motivo da falha).
+        """
+        auth = self.pending.register("successauth")
+        self.state.reset_connection()
+        self.websocket_task = asyncio.ensure_future(self.websocket.connect(), loop=self.loop)
+        try:
+            await asyncio.wait_for(asyncio.wrap_future(auth), timeout)
+        except asyncio.TimeoutError:
+            self.pending.discard("successauth", auth)
+            if self.state.check_websocket_if_error:
+                return False, self.state.websocket_error_reason
+            return False, "Tempo esgotado aguardando a autenticação."
+        except ConnectionError as e:
+            return False, str(e)
+        return True, None
+
+    def spawn_connection(self):
+        """Nova conexão da mesma conta no mesmo loop, para o pool de assinaturas.
+
+        Ela compartilha com esta sessão os buffers de ticks, as velas ao
+        vivo, as assinaturas, o barramento de eventos e as métricas.
+
+        :returns: Uma instância de :class:`PocketOptionAPI`, ainda não conectada.
+        """
+        connection = PocketOptionAPI(codec=self.codec.name, candle_periods=self.live_candles.periods,
+                                     ssid=self.state.ssid, demo=self.state.demo, loop=self.loop,
+                                     url=self.url, regions=self.regions, rate_limits=self.rate_limits)
+        connection.ticks = self.ticks
+        connection.live_candles = self.live_candles
+        connection.events = self.events
+        connection.subscriptions = self.subscriptions
+        connection.market_only = True
+        connection.metrics = self.metrics
+        return connection
+
     async def close(self, error=None):
+        if self.subscriptions.api is self:
+            await self.subscriptions.close_pool()
+            self.metrics.detach()
         await self.websocket.on_close(error)
-        self.websocket_thread.join()
+        if self.websocket_task is not None:
+            self.websocket_task.cancel()
+        if self.websocket_thread is not None:
+            self.websocket_thread.join()
 
     def websocket_alive(self):
-        return self.websocket_thread.is_alive()
+        if self.websocket_task is not None:
+            return not self.websocket_task.done()
+        return self.websocket_thread is not None and self.websocket_thread.is_alive()
 
     @property
     def get_balances(self):
@@ -223,14 +358,10 @@ class PocketOptionAPI(object):
 
     @property
     def synced_datetime(self):
+        """Datetime atual do servidor pelo modelo de relógio (não ressincroniza)."""
         try:
-            if self.time_sync is not None:
-                self.sync.synchronize(self.time_sync.server_timestamp)
-                self.sync_datetime = self.sync.get_synced_datetime()
-            else:
-                logging.error("timesync não está definido")
-                self.sync_datetime = None
-        except Exception as e:
+            self.sync_datetime = self.sync.get_synced_datetime()
+        except ValueError as e:
             logging.error(e)
             self.sync_datetime = None
 
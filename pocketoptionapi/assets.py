@@ -0,0 +1,187 @@
+"""
+Registro de ativos: une ``constants.ACTIVES`` aos metadados do updateAssets.
+"""
+from pocketoptionapi.constants import ACTIVES
+
+OTC_SUFFIX = "_otc"
+
+# Categorias usam os mesmos nomes do campo "type" do frame de payouts
+CURRENCY = "currency"
+CRYPTOCURRENCY = "cryptocurrency"
+COMMODITY = "commodity"
+STOCK = "stock"
+INDEX = "index"
+
+_INDICES = frozenset(("100GBP", "AEX25", "AUS200", "CAC40", "D30EUR", "DJI30", "E35EUR", "E50EUR",
+                      "F40EUR", "H33HKD", "JPN225", "NASUSD", "SMI20", "SP500"))
+_COMMODITY_PREFIXES = ("XAU", "XAG", "XNG", "XPD", "XPT", "UKBrent", "USCrude")
+_CRYPTO_PREFIXES = ("BTC", "ETH", "BCH", "DASH", "DOT", "LNK", "LTC", "XRP")
+
+
+def base_symbol(symbol):
+    """Símbolo sem o sufixo ``_otc``."""
+    return symbol[:-len(OTC_SUFFIX)] if symbol.endswith(OTC_SUFFIX) else symbol
+
+
+def guess_category(symbol):
+    """Categoria deduzida do símbolo, usada até o servidor informar o tipo."""
+    base = base_symbol(symbol)
+    if base.startswith("#"):
+        return STOCK
+    if base in _INDICES:
+        return INDEX
+    if base.startswith(_COMMODITY_PREFIXES):
+        return COMMODITY
+    if base.startswith(_CRYPTO_PREFIXES):
+        return CRYPTOCURRENCY
+    if len(base) == 6 and base.isalpha() and base.isupper():
+        return CURRENCY
+    return STOCK
+
+
+class Asset(str):
+    """Símbolo canônico de um ativo com seus metadados.
+
+    É uma ``str``: pode ser passado onde a API espera o símbolo (ordens,
+    changeSymbol, chaves de dicionário) e compara igual ao texto. O
+    registro mantém uma única instância por símbolo.
+    """
+
+    def __new__(cls, symbol, asset_id=None, category=None):
+        asset = str.__new__(cls, symbol)
+        asset.id = asset_id
+        asset.category = category or guess_category(symbol)
+        asset.is_otc = symbol.endswith(OTC_SUFFIX)
+        asset.base = base_symbol(symbol)
+        asset.name = None
+        asset.payout = None
+        asset.is_open = None
+        asset.pair = None
+        return asset
+
+    @property
+    def symbol(self):
+        return str.__str__(self)
+
+    def __repr__(self):
+        return f"Asset({self.symbol!r}, id={self.id}, category={self.category!r}, payout={self.payout})"
+
+    def __reduce__(self):
+        return (Asset, (self.symbol, self.id, self.category))
+
+
+class AssetRegistry(object):
+    """Índices por id e por símbolo, pares OTC/regular e visões filtradas.
+
+    As visões (categoria, OTC, aberto) são conjuntos mantidos para todas as
+    combinações, incluindo "qualquer" (None) em cada dimensão. Quando um
+    ativo muda, apenas as visões dele são atualizadas.
+    """
+
+    def __init__(self, actives=None):
+        """
+        :param dict actives: Mapa símbolo -> id (padrão: ``constants.ACTIVES``).
+        """
+        self.by_id = {}
+        self.by_symbol = {}
+        self.views = {}
+        self._frozen = {}
+        for symbol, asset_id in (ACTIVES if actives is None else actives).items():
+            self._add(Asset(symbol, asset_id))
+
+    @staticmethod
+    def _view_keys(asset):
+        for category in (asset.category, None):
+            for otc in (asset.is_otc, None):
+                for is_open in (asset.is_open, None):
+                    yield category, otc, is_open
+
+    def _index(self, asset):
+        for key in self._view_keys(asset):
+            view = self.views.get(key)
+            if view is None:
+                view = self.views[key] = set()
+            view.add(asset)
+            self._frozen.pop(key, None)
+
+    def _unindex(self, asset):
+        for key in self._view_keys(asset):
+            view = self.views.get(key)
+            if view is not None:
+                view.discard(asset)
+                self._frozen.pop(key, None)
+
+    def _add(self, asset):
+        self.by_symbol[asset.symbol] = asset
+        if asset.id is not None:
+            self.by_id[asset.id] = asset
+        other = self.by_symbol.get(asset.base if asset.is_otc else asset.symbol + OTC_SUFFIX)
+        if other is not None:
+            asset.pair = other
+            other.pair = asset
+        self._index(asset)
+        return asset
+
+    def get(self, key):
+        """Ativo pelo símbolo ou pelo id, ou None."""
+        if isinstance(key, int):
+            return self.by_id.get(key)
+        return self.by_symbol.get(key)
+
+    def intern(self, symbol):
+        """Instância canônica do símbolo, criando-a se for desconhecida."""
+        asset = self.by_symbol.get(symbol)
+        if asset is None:
+            asset = self._add(Asset(symbol))
+        return asset
+
+    def view(self, category=None, otc=None, is_open=None):
+        """Ativos que atendem aos filtros (None em um filtro aceita qualquer valor).
+
+        :returns: frozenset com os ativos (reaproveitado até a visão mudar).
+        """
+        key = (category, otc, is_open)
+        frozen = self._frozen.get(key)
+        if frozen is None:
+            frozen = self._frozen[key] = frozenset(self.views.get(key, ()))
+        return frozen
+
+    def update_from_payouts(self, old_table, new_table):
+        """Aplica os metadados de uma nova tabela de payouts.
+
+        Pode ser registrado em :meth:`PayoutTable.on_update`. Só os ativos
+        cujo tipo ou estado de abertura mudou trocam de visão.
+        """
+        for symbol, info in new_table.items():
+            asset = self.by_symbol.get(symbol)
+            if asset is None:
+                asset = self._add(Asset(symbol, info.id, info.type))
+            if asset.id is None and info.id is not None:
+                asset.id = info.id
+                self.by_id[info.id] = asset
+            asset.name = info.name
+            asset.payout = info.payout
+            category = info.type or asset.category
+            if category != asset.category or info.is_open != asset.is_open:
+                self._unindex(asset)
+                asset.category = category
+                asset.is_open = info.is_open
+                self._index(asset)
+
+        for symbol in old_table:
+            if symbol not in new_table:
+                asset = self.by_symbol.get(symbol)
+                if asset is not None and asset.is_open is not False:
+                    self._unindex(asset)
+                    asset.is_open = False
+                    asset.payout = None
+                    self._index(asset)
+
+    def __len__(self):
+        return len(self.by_symbol)
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __iter__(self):
+        return iter(self.by_symbol.values())
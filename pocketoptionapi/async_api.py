@@ -0,0 +1,458 @@
+"""
+Interface assíncrona da PocketOption.
+
+Todas as operações rodam no mesmo event loop do websocket: aguardar uma
+ordem, um resultado ou uma página de histórico não ocupa uma thread, então
+milhares de esperas podem correr juntas em uma única thread.
+"""
+
+import asyncio
+import functools
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+
+from pocketoptionapi.api import PocketOptionAPI
+from pocketoptionapi.ws.events import TICK, CANDLE, BALANCE, DEAL_OPENED, DEAL_CLOSED
+from pocketoptionapi.history_store import HistoryStore
+from pocketoptionapi.ws.history import HISTORY_PERIOD
+
+logger = logging.getLogger(__name__)
+
+# Timeframes disponíveis em segundos
+CANDLE_SIZES = (1, 5, 10, 15, 30, 60, 120, 300, 600, 900, 1800,
+                3600, 7200, 14400, 28800, 43200, 86400, 604800, 2592000)
+
+
+def last_time(timestamp, period):
+    """Timestamp do início do período que contém ``timestamp``."""
+    return int((timestamp // period) * period)
+
+
+def resample_ohlc(times, prices, period):
+    """Agrupa pontos (timestamp, preço) em velas OHLC de ``period`` segundos.
+
+    :returns: ``pandas.DataFrame`` com time, open, high, low e close.
+    """
+    df_candles = pd.DataFrame({"time": times, "price": prices})
+
+    df_candles = df_candles.sort_values(by='time').reset_index(drop=True)
+    df_candles['time'] = pd.to_datetime(df_candles['time'], unit='s')
+    df_candles.set_index('time', inplace=True)
+    df_candles.index = df_candles.index.floor('1s')
+
+    df_resampled = df_candles['price'].resample(f'{period}s').ohlc()
+
+    df_resampled.reset_index(inplace=True)
+
+    return df_resampled
+
+
+class AsyncPocketOption(object):
+    """
+    Cliente assíncrono da PocketOption.
+
+    Deve ser criado e usado dentro do event loop que vai rodar o websocket
+    (ou receber esse loop em ``loop``). Exemplo::
+
+        async def main():
+            client = AsyncPocketOption(ssid, demo=True)
+            if await client.connect():
+                ok, order_id = await client.buy(1, "EURUSD_otc", "call", 60)
+                profit, status = await client.check_win(order_id)
+            await client.disconnect()
+
+    A :class:`PocketOption <pocketoptionapi.stable_api.PocketOption>`
+    síncrona é uma camada fina sobre esta classe.
+    """
+
+    def __init__(self, ssid, demo, history_dir=None, loop=None, url=None, rate_limits=None,
+                 metrics=False):
+        """
+        :param str ssid: ID de sessão para autenticação.
+        :param bool demo: Se True, usa conta demo. Se False, usa conta real.
+        :param str history_dir: (opcional) Diretório do armazenamento local de
+            histórico; se informado, get_candles baixa apenas as lacunas.
+        :param loop: (opcional) Loop do websocket; padrão é o loop em execução.
+        :param str url: (opcional) Endereço do websocket no lugar das regiões padrão.
+        :param dict rate_limits: (opcional) Limites de envio por classe de mensagem
+            (ver :data:`pocketoptionapi.ws.outbound.DEFAULT_LIMITS`).
+        :param bool metrics: (opcional) Liga as métricas de latência e vazão
+            (ver :meth:`get_metrics`).
+        :raises RuntimeError: Se ``loop`` não foi informado e não há loop em execução.
+        """
+        if loop is None:
+            loop = asyncio.get_running_loop()
+        self.loop = loop
+        self.size = list(CANDLE_SIZES)
+        self.api = PocketOptionAPI(candle_periods=self.size, ssid=ssid, demo=demo, loop=loop, url=url,
+                                   rate_limits=rate_limits, metrics=metrics)
+        self.history_store = HistoryStore(history_dir) if history_dir else None
+
+    # Conexão
+
+    async def connect(self, timeout=30):
+        """
+        Estabelece a conexão e aguarda a autenticação.
+
+        :param float timeout: Prazo em segundos para a autenticação.
+        :returns: True se a conexão foi autenticada, False caso contrário.
+        """
+        try:
+            check, reason = await self.api.connect_async(timeout)
+        except Exception as e:
+            logger.error(f"Erro ao conectar: {e}")
+            return False
+        if not check:
+            logger.error(f"Erro ao conectar: {reason}")
+        return check
+
+    async def disconnect(self):
+        """Fecha a conexão WebSocket e encerra a task do websocket."""
+        if self.api.state.websocket_is_connected or self.api.websocket_alive():
+            await self.api.close()
+
+    def check_connect(self):
+        """True se o WebSocket está conectado."""
+        return bool(self.api.state.websocket_is_connected)
+
+    # Ordens
+
+    async def buy(self, amount, active, action, expirations, timeout=5):
+        """
+        Realiza uma operação de compra.
+
+        :param float amount: Valor monetário da operação.
+        :param str active: Ativo a ser negociado.
+        :param str action: Tipo de operação ("call" ou "put").
+        :param int expirations: Tempo de expiração em segundos.
+        :param float timeout: Prazo em segundos para a confirmação.
+        :returns: Tupla (sucesso da operação, ID da ordem ou None).
+        """
+        request_id, future = self.api.orders.submit(amount, active, action, expirations)
+        return await self._order_reply(request_id, future, timeout)
+
+    async def buy_multi(self, orders, timeout=5):
+        """
+        Envia várias ordens de uma vez e aguarda todas as respostas.
+
+        :param orders: Lista de tuplas (amount, active, action, expirations).
+        :param float timeout: Prazo em segundos para as respostas.
+        :returns: Lista de tuplas (sucesso, ID da ordem ou None) na mesma ordem.
+        """
+        submitted = self.api.orders.submit_many(orders)
+        return list(await asyncio.gather(*(self._order_reply(request_id, future, timeout)
+                                           for request_id, future in submitted)))
+
+    async def _order_reply(self, request_id, future, timeout):
+        try:
+            order_data = await self.api.orders.wait_async(request_id, future, timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Tempo esgotado aguardando a ordem {request_id}")
+            return False, None
+        except ConnectionError as e:
+            logger.error(f"Ordem {request_id} sem confirmação: {e}")
+            return False, None
+        return self._order_result(order_data)
+
+    @staticmethod
+    def _order_result(order_data):
+        if "error" in order_data:
+            logger.error(order_data["error"])
+            return False, None
+        return True, order_data.get("id", None)
+
+    def get_async_order(self, buy_order_id):
+        """Informações da ordem se ela já fechou, ou None."""
+        return self.api.deals.closed_deal(buy_order_id)
+
+    def get_deal(self, deal_id):
+        """O deal com esse id, aberto ou fechado, ou None."""
+        return self.api.deals.get(deal_id)
+
+    async def check_order_closed(self, ido, timeout=None):
+        """
+        Aguarda até que uma ordem específica seja fechada.
+
+        :param int ido: ID da ordem.
+        :param float timeout: (opcional) Prazo máximo em segundos.
+        :returns: ID da ordem fechada ou None se o prazo expirar.
+        """
+        try:
+            deal = await self.api.deals.wait_async(ido, timeout)
+        except asyncio.TimeoutError:
+            return None
+
+        logger.info(f"Ordem {ido} fechada, lucro {deal.get('profit')}")
+
+        return ido
+
+    async def check_win(self, id_number, timeout=120):
+        """
+        Aguarda o resultado de uma operação.
+
+        :param int id_number: ID da ordem.
+        :param float timeout: Prazo máximo em segundos.
+        :returns: Tupla (lucro/prejuízo, status), status "ganhou", "perdeu" ou "desconhecido".
+        """
+        try:
+            order_info = await self.api.deals.wait_async(id_number, timeout)
+        except asyncio.TimeoutError:
+            logger.error("Tempo esgotado: Não foi possível recuperar informações da ordem a tempo.")
+            return None, "desconhecido"
+
+        if order_info and "profit" in order_info:
+            status = "ganhou" if order_info["profit"] > 0 else "perdeu"
+            return order_info["profit"], status
+        logger.error("Informações da ordem inválidas recuperadas.")
+        return None, "desconhecido"
+
+    # Assinaturas e dados ao vivo
+
+    async def subscribe(self, active, period=60):
+        """
+        Assina o fluxo de ticks de um ativo (``changeSymbol``).
+
+        As assinaturas contam referências: cada chamada deve ter um
+        :meth:`unsubscribe` correspondente. Retorna quando o pedido foi
+        escrito no websocket (ou na hora, se o fluxo já estava assinado).
+        """
+        written = self.loop.create_future()
+        message = self.api.subscriptions.acquire(
+            active, period, on_written=lambda: written.done() or written.set_result(None))
+        if message is not None:
+            await written
+
+    def unsubscribe(self, active, period=60):
+        """Desfaz um :meth:`subscribe`; o fluxo é cancelado na última referência."""
+        return self.api.subscriptions.release(active, period)
+
+    def get_subscription_stats(self):
+        """Conexões no pool e, por fluxo, referências, conexão e último tick."""
+        return self.api.subscriptions.stats
+
+    async def start_live_candles(self, active, period=60, count=6000):
+        """
+        Semeia as velas ao vivo com uma busca de histórico e assina o ativo.
+
+        :param str active: Código do ativo (ex: "EURUSD_otc").
+        :param int period: Período enviado no changeSymbol.
+        :param int count: Número de pontos de histórico usados na semeadura.
+        """
+        history = await self.get_history(active, period, count=count)
+        self.api.live_candles.seed(active, history)
+        await self.subscribe(active, period)
+
+    def get_live_candles(self, active, period, count=None, include_current=False):
+        """Velas ao vivo mais recentes, da mais antiga à mais nova (ver :meth:`start_live_candles`)."""
+        return self.api.live_candles.candles(active, period, count, include_current)
+
+    def on_candle_close(self, callback):
+        """Registra ``callback(ativo, período, vela)``, chamado no loop quando uma vela fecha."""
+        return self.api.live_candles.on_close(callback)
+
+    def get_ticks(self, active, count=None):
+        """Ticks recentes (timestamps, preços) como views NumPy, ou None se não houver."""
+        buffer = self.api.ticks.get(active)
+        if buffer is None:
+            return None
+        return buffer.window(count)
+
+    def get_last_tick(self, active):
+        """Último tick (timestamp, preço) de um ativo, ou None."""
+        buffer = self.api.ticks.get(active)
+        return buffer.last() if buffer is not None else None
+
+    # Eventos
+    #
+    # Cada método retorna uma Subscription: com ``callback`` ele é chamado a
+    # cada evento; sem, a assinatura é um iterador assíncrono
+    # (``async with client.on_tick(active="EURUSD_otc") as ticks: async for t in ticks``).
+    # ``close()`` encerra a assinatura. Todos recebem ``callback`` primeiro e
+    # depois o filtro, como em :class:`PocketOption <pocketoptionapi.stable_api.PocketOption>`.
+
+    def on_tick(self, callback=None, active=None, maxsize=1000, threaded=False):
+        """Ticks ``(ativo, timestamp, preço)`` de um ativo (ou de todos, sem ``active``)."""
+        return self.api.events.subscribe(TICK, active, callback, maxsize, threaded)
+
+    def on_candle(self, callback=None, active=None, period=None, maxsize=1000, threaded=False):
+        """Velas fechadas ``(ativo, período, vela)``; sem ``active`` e ``period``, de todos."""
+        key = (active, period) if active is not None else None
+        return self.api.events.subscribe(CANDLE, key, callback, maxsize, threaded)
+
+    def on_balance(self, callback=None, maxsize=1000, threaded=False):
+        """Atualizações de saldo (dicionário com ``balance``, ``uid`` e ``isDemo``)."""
+        return self.api.events.subscribe(BALANCE, None, callback, maxsize, threaded)
+
+    def on_deal_opened(self, callback=None, active=None, maxsize=1000, threaded=False):
+        """Deals abertos (resposta ``successopenOrder``)."""
+        return self.api.events.subscribe(DEAL_OPENED, active, callback, maxsize, threaded)
+
+    def on_deal_closed(self, callback=None, active=None, maxsize=1000, threaded=False):
+        """Deals fechados, um evento por deal, com ``profit``."""
+        return self.api.events.subscribe(DEAL_CLOSED, active, callback, maxsize, threaded)
+
+    # Conta, ativos e relógio
+
+    def get_balance(self):
+        """Saldo atual ou None se ainda não recebido."""
+        if self.api.state.balance_updated:
+            return self.api.state.balance
+        return None
+
+    def check_open(self):
+        """True se há deals abertos."""
+        return bool(self.api.deals.opened)
+
+    def get_payout(self, pair):
+        """Percentual de payout de um ativo ou None."""
+        return self.api.payouts.payout(pair)
+
+    def get_payouts(self, pairs):
+        """Ativo -> percentual de payout (None se não disponível)."""
+        return self.api.payouts.get_payouts(pairs)
+
+    def get_asset(self, key):
+        """Ativo do registro pelo símbolo ou pelo id, ou None."""
+        return self.api.assets.get(key)
+
+    def get_assets(self, category=None, otc=None, is_open=None):
+        """Ativos que atendem aos filtros (ver :meth:`AssetRegistry.view`)."""
+        return self.api.assets.view(category, otc, is_open)
+
+    def get_server_timestamp(self):
+        """Timestamp atual do servidor em segundos (None antes da sincronização)."""
+        return self.api.time_sync.server_timestamp
+
+    def get_server_datetime(self):
+        return self.api.time_sync.server_datetime
+
+    def get_server_time(self):
+        """
+        Tupla (timestamp, incerteza em segundos) do relógio do servidor.
+
+        :raises ValueError: Se o relógio ainda não foi sincronizado.
+        """
+        return self.api.sync.server_now_bounds()
+
+    def get_expirations(self, count=None):
+        """Próximas expirações (duração em minutos, timestamp), da mais próxima."""
+        return self.api.expirations.next(count)
+
+    def get_remaining_time(self):
+        """Tuplas (duração em minutos, segundos restantes) de cada expiração válida."""
+        return self.api.expirations.remaining()
+
+    def get_recovery_stats(self):
+        """Métricas de retomada da sessão após quedas da conexão."""
+        return self.api.resume.stats
+
+    def get_outbound_stats(self):
+        """Por classe de mensagem: fila, enviadas, juntadas, canceladas, espera e fichas."""
+        return self.api.websocket.outbound_stats
+
+    # Métricas
+
+    def enable_metrics(self, enabled=True):
+        """Liga ou desliga a coleta de latências e contadores."""
+        self.api.metrics.set_enabled(enabled)
+
+    def get_metrics(self):
+        """Snapshot das métricas: frames por evento, latências, contadores e estatísticas."""
+        return self.api.metrics.snapshot()
+
+    def get_metrics_text(self):
+        """As métricas no formato de texto do Prometheus."""
+        return self.api.metrics.prometheus()
+
+    def on_metrics(self, callback, interval=10.0):
+        """Chama ``callback(snapshot)`` no loop a cada ``interval`` segundos.
+
+        :returns: A task; cancele-a para parar.
+        """
+        return asyncio.ensure_future(self.api.metrics.report(callback, interval), loop=self.loop)
+
+    # Histórico
+
+    def _history_end(self, period, start_time):
+        if start_time is None:
+            now = self.get_server_timestamp()
+            if now is None:
+                # Ainda sem nenhuma referência do servidor
+                now = time.time()
+            return last_time(now, period)
+        return start_time
+
+    async def _in_thread(self, func, *args):
+        # Leitura e escrita em disco fora do loop
+        return await self.loop.run_in_executor(None, functools.partial(func, *args))
+
+    async def get_history(self, active, period, start_time=None, count=6000, count_request=1):
+        """
+        Pontos brutos de histórico (time, price) de um ativo, ordenados por tempo.
+
+        :param str active: Código do ativo (ex: "EURUSD").
+        :param int period: Período usado para alinhar o tempo final.
+        :param int start_time: (opcional) Timestamp final do histórico.
+        :param int count: Número de pontos por requisição (max: 9000).
+        :param int count_request: Número de requisições para dados históricos.
+        """
+        if self.history_store is None:
+            time_red = self._history_end(period, start_time)
+            return await self.api.history.fetch(active, time_red, count, count_request)
+
+        times, prices = await self.get_history_arrays(active, period, start_time, count, count_request)
+        return [{"time": t, "price": p} for t, p in zip(times.tolist(), prices.tolist())]
+
+    async def get_history_arrays(self, active, period, start_time=None, count=6000, count_request=1):
+        """Igual a :meth:`get_history`, mas retorna arrays NumPy (timestamps, preços)."""
+        time_red = self._history_end(period, start_time)
+        store = self.history_store
+        history = self.api.history
+
+        if store is None:
+            points = await history.fetch(active, time_red, count, count_request)
+            return (np.fromiter((p["time"] for p in points), np.float64, len(points)),
+                    np.fromiter((p["price"] for p in points), np.float64, len(points)))
+
+        span = store.page_span(active, HISTORY_PERIOD)
+        if span is None:
+            # Primeira consulta: aprende quanto tempo cada página cobre
+            points, covered = await history.fetch_covered(active, time_red, count, count_request)
+            if not points:
+                return np.empty(0), np.empty(0)
+            start = points[0]["time"]
+            await self._in_thread(store.append, active, HISTORY_PERIOD, [p["time"] for p in points],
+                                  [p["price"] for p in points], start, time_red, covered)
+            # A primeira página sempre chegou (senão fetch_covered levanta)
+            first_start, first_end = covered[0]
+            if first_end > first_start:
+                store.set_page_span(active, HISTORY_PERIOD, first_end - first_start)
+        else:
+            start = time_red - span * count_request
+            for gap_start, gap_end in store.missing(active, HISTORY_PERIOD, start, time_red):
+                points, covered = await history.fetch_range_covered(active, gap_start, gap_end, count)
+                await self._in_thread(store.append, active, HISTORY_PERIOD, [p["time"] for p in points],
+                                      [p["price"] for p in points], gap_start, gap_end, covered)
+
+        return await self._in_thread(store.read, active, HISTORY_PERIOD, start, time_red)
+
+    async def get_candles(self, active, period, start_time=None, count=6000, count_request=1):
+        """
+        Velas OHLC históricas de um ativo.
+
+        :param str active: Código do ativo (ex: "EURUSD").
+        :param int period: Período de cada vela em segundos.
+        :param int start_time: (opcional) Timestamp final para a última vela.
+        :param int count: Número de pontos por requisição (max: 9000).
+        :param int count_request: Número de requisições para dados históricos.
+        :returns: ``pandas.DataFrame`` com time, open, high, low e close, ou None em caso de erro.
+        """
+        try:
+            times, prices = await self.get_history_arrays(active, period, start_time, count, count_request)
+            return resample_ohlc(times, prices, period)
+        except Exception as e:
+            logger.error(f"Erro ao obter velas de {active}: {e}")
+            return None
@@ -139,17 +139,55 @@ ACTIVES = {
 
 
 class REGION:
+    # Endpoints conhecidos do po.market; os de demo só aceitam sessões demo
     REGIONS = {
-         "DEMO": "wss://demo-api-eu.po.market/socket.io/?EIO=4&transport=websocket",
+        "DEMO": "wss://demo-api-eu.po.market/socket.io/?EIO=4&transport=websocket",
+        "DEMO_2": "wss://try-demo-eu.po.market/socket.io/?EIO=4&transport=websocket",
+        "EUROPA": "wss://api-eu.po.market/socket.io/?EIO=4&transport=websocket",
+        "SEYCHELLES": "wss://api-sc.po.market/socket.io/?EIO=4&transport=websocket",
+        "HONGKONG": "wss://api-hk.po.market/socket.io/?EIO=4&transport=websocket",
+        "SERVER1": "wss://api-spb.po.market/socket.io/?EIO=4&transport=websocket",
+        "FRANCE2": "wss://api-fr2.po.market/socket.io/?EIO=4&transport=websocket",
+        "UNITED_STATES4": "wss://api-us4.po.market/socket.io/?EIO=4&transport=websocket",
+        "UNITED_STATES3": "wss://api-us3.po.market/socket.io/?EIO=4&transport=websocket",
+        "UNITED_STATES2": "wss://api-us2.po.market/socket.io/?EIO=4&transport=websocket",
+        "UNITED_STATES": "wss://api-us-north.po.market/socket.io/?EIO=4&transport=websocket",
+        "RUSSIA": "wss://api-msk.po.market/socket.io/?EIO=4&transport=websocket",
+        "SERVER2": "wss://api-l.po.market/socket.io/?EIO=4&transport=websocket",
+        "INDIA": "wss://api-in.po.market/socket.io/?EIO=4&transport=websocket",
+        "FRANCE": "wss://api-fr.po.market/socket.io/?EIO=4&transport=websocket",
+        "FINLAND": "wss://api-fin.po.market/socket.io/?EIO=4&transport=websocket",
+        "SERVER3": "wss://api-c.po.market/socket.io/?EIO=4&transport=websocket",
+        "ASIA": "wss://api-asia.po.market/socket.io/?EIO=4&transport=websocket",
+        "SERVER4": "wss://api-us-south.po.market/socket.io/?EIO=4&transport=websocket",
     }
 
+    def __init__(self, regions=None):
+        """
+        :param dict regions: (opcional) Tabela nome -> url no lugar da padrão.
+        """
+        if regions is not None:
+            self.REGIONS = dict(regions)
+
     def __getattr__(self, key):
         try:
             return self.REGIONS[key]
         except KeyError:
             raise AttributeError(f"O objeto '{self.REGIONS}' não possui o atributo '{key}'")
 
-    def get_regions(self, randomize: bool = True):
+    @staticmethod
+    def is_demo(name):
+        return name.startswith("DEMO")
+
+    def get_regions(self, randomize: bool = True, demo=None):
+        """
+        :param bool demo: (opcional) True só regiões demo, False só reais, None todas.
+        """
+        urls = [url for name, url in self.REGIONS.items()
+                if demo is None or self.is_demo(name) == bool(demo)]
+        if not urls:
+            # Tabela personalizada sem a separação demo/real
+            urls = list(self.REGIONS.values())
         if randomize:
-            return sorted(list(self.REGIONS.values()), key=lambda k: random.random())
-        return list(self.REGIONS.values())
+            return sorted(urls, key=lambda k: random.random())
+        return urls
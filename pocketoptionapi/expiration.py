@@ -1,80 +1,164 @@
 """
 Utilitários para manipulação de datas e timestamps.
+
+As expirações seguem uma grade fixa: os próximos cinco minutos cheios e as
+próximas onze marcas de 15 minutos. Toda a conta é feita com inteiros sobre
+o timestamp; como fusos horários têm deslocamentos múltiplos de 15 minutos,
+a grade é a mesma em UTC e no horário do servidor.
 """
 import time
-from datetime import datetime, timedelta
+
+# Deslocamento usado pelo formato antigo de get_expiration_time quando o
+# chamador não informa o do servidor
+LEGACY_UTC_OFFSET = 2 * 3600
+
+MINUTE_EXPIRATIONS = 5
+QUARTER_EXPIRATIONS = 11
+# Antecedência mínima (s) para a primeira expiração de minuto e a de 15 minutos
+MINUTE_LEAD = 30
+QUARTER_LEAD = 5 * 60
+# A grade só muda quando o tempo cruza um múltiplo de 30 s
+GRID_STEP = 30
+
 
 def date_to_timestamp(date):
     """Converte um objeto datetime para timestamp."""
     return int(date.timestamp())
 
-def get_expiration_time(timestamp, duration):
+
+def detect_utc_offset(server_timestamp, utc_timestamp=None):
+    """
+    Deslocamento do relógio do servidor em relação ao UTC, arredondado a 15 minutos.
+
+    :param server_timestamp: Tempo atual informado pelo servidor.
+    :param utc_timestamp: (opcional) Tempo UTC local; padrão ``time.time()``.
+    :return: Deslocamento em segundos.
+    """
+    if utc_timestamp is None:
+        utc_timestamp = time.time()
+    return int(round((server_timestamp - utc_timestamp) / 900.0)) * 900
+
+
+def get_expiration_time(timestamp, duration, utc_offset=LEGACY_UTC_OFFSET):
     """
     Calcula o tempo de expiração mais próximo baseado em um timestamp dado e uma duração.
     O tempo de expiração sempre terminará no segundo :30 do minuto.
 
     :param timestamp: O timestamp inicial para o cálculo.
     :param duration: A duração desejada em minutos.
+    :param utc_offset: Deslocamento (s) do horário do servidor somado ao resultado.
     """
-    # Converter o timestamp dado para um objeto datetime
-    now_date = datetime.fromtimestamp(timestamp)
+    t = int(timestamp)
+    minute = t - t % 60
+    # Próximo :30 (o do minuto atual se ainda não passou)
+    expiration = minute + 30 if t % 60 < 30 else minute + 90
+    if duration > 1:
+        expiration += (duration - 1) * 60
+    return expiration + utc_offset
 
-    # Ajustar os segundos para :30 se não estiverem já, caso contrário, passar para o próximo :30
-    if now_date.second < 30:
-        exp_date = now_date.replace(second=30, microsecond=0)
-    else:
-        exp_date = (now_date + timedelta(minutes=1)).replace(second=30, microsecond=0)
 
-    # Calcular o tempo de expiração considerando a duração
-    if duration > 1:
-        # Se a duração for mais de um minuto, calcular o tempo final adicionando a duração
-        # menos um minuto, já que já ajustamos para terminar em :30 segundos.
-        exp_date += timedelta(minutes=duration - 1)
+def expiration_grid(timestamp):
+    """
+    Grade de expirações válidas para o instante informado.
+
+    :param timestamp: Tempo do servidor em segundos.
+    :return: Lista de tuplas (duração em minutos, timestamp da expiração).
+    """
+    t = int(timestamp)
+    minute = t - t % 60
+    first = minute + 60 if minute + 60 - t > MINUTE_LEAD else minute + 120
+    grid = [(i + 1, first + 60 * i) for i in range(MINUTE_EXPIRATIONS)]
 
-    # Adicionar duas horas ao tempo de expiração
-    exp_date += timedelta(hours=2)
-    # Converter o tempo de expiração para timestamp
-    expiration_timestamp = date_to_timestamp(exp_date)
+    quarter = -(-minute // 900) * 900
+    if quarter - t <= QUARTER_LEAD:
+        quarter += 900
+    grid.extend((15 * (i + 1), quarter + 900 * i) for i in range(QUARTER_EXPIRATIONS))
+    return grid
 
-    return expiration_timestamp
 
-def get_remaning_time(timestamp):
+def get_remaning_time(timestamp, now=None):
     """
     Calcula os tempos de expiração restantes.
-    
+
     :param timestamp: O timestamp inicial para o cálculo.
+    :param now: (opcional) Tempo atual do servidor; padrão é o próprio ``timestamp``.
     :return: Lista de tuplas com (duração, tempo restante).
     """
-    now_date = datetime.fromtimestamp(timestamp)
-    exp_date = now_date.replace(second=0, microsecond=0)
-    if (int(date_to_timestamp(exp_date+timedelta(minutes=1)))-timestamp) > 30:
-        exp_date = exp_date+timedelta(minutes=1)
-    else:
-        exp_date = exp_date+timedelta(minutes=2)
-    
-    exp = []
-    for _ in range(5):
-        exp.append(date_to_timestamp(exp_date))
-        exp_date = exp_date+timedelta(minutes=1)
-    
-    idx = 11
-    index = 0
-    now_date = datetime.fromtimestamp(timestamp)
-    exp_date = now_date.replace(second=0, microsecond=0)
-    
-    while index < idx:
-        if int(exp_date.strftime("%M")) % 15 == 0 and (int(date_to_timestamp(exp_date))-int(timestamp)) > 60*5:
-            exp.append(date_to_timestamp(exp_date))
-            index = index+1
-        exp_date = exp_date+timedelta(minutes=1)
-
-    remaning = []
-
-    for idx, t in enumerate(exp):
-        if idx >= 5:
-            dr = 15*(idx-4)
-        else:
-            dr = idx+1
-        remaning.append((dr, int(t)-int(time.time())))
-
-    return remaning
\ No newline at end of file
+    now = int(timestamp if now is None else now)
+    return [(duration, expiration - now) for duration, expiration in expiration_grid(timestamp)]
+
+
+class ExpirationScheduler(object):
+    """Grade de expirações a partir do relógio do servidor, em cache.
+
+    A grade é recalculada só quando o tempo cruza o próximo múltiplo de
+    30 s; entre uma fronteira e outra, as consultas apenas leem a lista.
+    """
+
+    def __init__(self, sync=None, utc_offset=None):
+        """
+        :param sync: (opcional) O :class:`TimeSynchronizer
+            <pocketoptionapi.ws.objects.time_sync.TimeSynchronizer>` da sessão;
+            sem ele (ou antes da sincronização) usa o relógio local.
+        :param int utc_offset: (opcional) Deslocamento do horário do servidor
+            em segundos; por padrão é detectado pelo relógio do servidor.
+        """
+        self.sync = sync
+        self._utc_offset = utc_offset
+        # (válida até, grade, duração -> expiração), trocada de uma vez
+        self._cache = None
+        self.rebuilds = 0
+
+    def now(self):
+        """Tempo atual do servidor (ou local, antes da sincronização)."""
+        sync = self.sync
+        if sync is not None and sync.synced:
+            return sync.server_now()
+        return time.time()
+
+    @property
+    def utc_offset(self):
+        if self._utc_offset is not None:
+            return self._utc_offset
+        return detect_utc_offset(self.now())
+
+    @utc_offset.setter
+    def utc_offset(self, seconds):
+        self._utc_offset = seconds
+
+    def _current(self, now):
+        if now is None:
+            now = self.now()
+        t = int(now)
+        cache = self._cache
+        if cache is None or not cache[0] - GRID_STEP <= t < cache[0]:
+            grid = expiration_grid(t)
+            cache = self._cache = (t - t % GRID_STEP + GRID_STEP, grid, dict(grid))
+            self.rebuilds += 1
+        return cache
+
+    def grid(self, now=None):
+        """Grade atual: lista de tuplas (duração em minutos, expiração)."""
+        return self._current(now)[1]
+
+    def next(self, n=None, now=None):
+        """As próximas ``n`` expirações (todas por padrão), da mais próxima à mais distante."""
+        grid = self._current(now)[1]
+        return grid if n is None else grid[:n]
+
+    def expiration_for(self, duration, now=None):
+        """Timestamp da expiração de ``duration`` minutos na grade, ou None se não existir."""
+        return self._current(now)[2].get(duration)
+
+    def remaining(self, now=None):
+        """Lista de tuplas (duração, segundos restantes) para o instante atual."""
+        if now is None:
+            now = self.now()
+        t = int(now)
+        return [(duration, expiration - t) for duration, expiration in self._current(now)[1]]
+
+    def expiration_time(self, duration, now=None):
+        """Equivalente a :func:`get_expiration_time` com o relógio e o fuso do servidor."""
+        if now is None:
+            now = self.now()
+        return get_expiration_time(now, duration, self.utc_offset)
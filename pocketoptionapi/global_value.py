@@ -1,13 +1,10 @@
 """
 Autor: AdminhuDev
 """
-# Variáveis globais
+# Variáveis globais (legado): o estado de cada conexão fica em
+# PocketOptionAPI.state (ver pocketoptionapi/session.py). SSID e DEMO
+# ainda servem de padrão para quem cria a API sem informá-los.
 websocket_is_connected = False
-# Tentativa de corrigir ssl.SSLEOFError: EOF ocorreu em violação do protocolo (_ssl.c:2361)
-ssl_Mutual_exclusion = False  # mutex leitura/escrita
-# Se falso, websocket pode enviar self.websocket.send(data)
-# Caso contrário, não pode enviar self.websocket.send(data)
-ssl_Mutual_exclusion_write = False  # se thread escrever
 
 SSID = None
 
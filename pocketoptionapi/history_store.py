@@ -0,0 +1,185 @@
+"""
+Armazenamento local de histórico (time, price) com controle de cobertura.
+
+Cada ativo/período tem um diretório com segmentos colunares ``.npy``
+(um arquivo de tempos e um de preços por segmento), lidos com memory-map,
+e um ``coverage.json`` com os intervalos já baixados. Novos dados viram
+um novo segmento, sem reescrever os existentes.
+"""
+import json
+import os
+
+import numpy as np
+
+
+def merge_intervals(intervals):
+    """Une intervalos [início, fim] sobrepostos ou adjacentes."""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def subtract_intervals(start, end, covered):
+    """Partes de [start, end] que não estão em ``covered`` (já unidos)."""
+    gaps = []
+    cursor = start
+    for c_start, c_end in covered:
+        if c_end <= cursor:
+            continue
+        if c_start >= end:
+            break
+        if c_start > cursor:
+            gaps.append([cursor, c_start])
+        cursor = max(cursor, c_end)
+        if cursor >= end:
+            break
+    if cursor < end:
+        gaps.append([cursor, end])
+    return gaps
+
+
+class HistoryStore(object):
+    """Histórico em disco por (ativo, período), com detecção de lacunas.
+
+    O período é o ``period`` enviado no ``loadHistoryPeriod``, isto é, a
+    resolução dos pontos brutos do servidor, não o período das velas.
+    """
+
+    COVERAGE_FILE = "coverage.json"
+
+    def __init__(self, root):
+        """
+        :param str root: Diretório raiz do armazenamento (criado se não existir).
+        """
+        self.root = root
+        self._meta = {}
+        os.makedirs(root, exist_ok=True)
+
+    def _dir(self, asset, period):
+        safe = str(asset).replace(os.sep, "_")
+        return os.path.join(self.root, safe, str(int(period)))
+
+    def _load_meta(self, asset, period):
+        key = (asset, int(period))
+        meta = self._meta.get(key)
+        if meta is None:
+            path = os.path.join(self._dir(asset, period), self.COVERAGE_FILE)
+            try:
+                with open(path, "r", encoding="utf-8") as fh:
+                    meta = json.load(fh)
+            except FileNotFoundError:
+                meta = {"coverage": [], "segments": [], "page_span": None}
+            self._meta[key] = meta
+        return meta
+
+    def _save_meta(self, asset, period, meta):
+        directory = self._dir(asset, period)
+        path = os.path.join(directory, self.COVERAGE_FILE)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(meta, fh)
+        os.replace(tmp, path)
+
+    def coverage(self, asset, period):
+        """Intervalos [início, fim] já armazenados, ordenados."""
+        return [list(interval) for interval in self._load_meta(asset, period)["coverage"]]
+
+    def missing(self, asset, period, start, end):
+        """Lacunas de [start, end] que ainda precisam ser baixadas."""
+        return subtract_intervals(start, end, self._load_meta(asset, period)["coverage"])
+
+    def page_span(self, asset, period):
+        """Intervalo de tempo coberto por uma página do servidor, se já conhecido."""
+        return self._load_meta(asset, period).get("page_span")
+
+    def set_page_span(self, asset, period, span):
+        meta = self._load_meta(asset, period)
+        meta["page_span"] = span
+        os.makedirs(self._dir(asset, period), exist_ok=True)
+        self._save_meta(asset, period, meta)
+
+    def append(self, asset, period, times, prices, start, end, covered=None):
+        """Grava um novo segmento e marca como coberto o que foi recebido.
+
+        :param times: Sequência de timestamps.
+        :param prices: Sequência de preços, alinhada a ``times``.
+        :param start: Início do intervalo consultado no servidor.
+        :param end: Fim do intervalo consultado no servidor.
+        :param covered: (opcional) Intervalos [início, fim] de fato recebidos;
+            sem ele, [start, end] inteiro. Páginas que falharam ficam de fora
+            e continuam aparecendo em :meth:`missing`.
+        """
+        directory = self._dir(asset, period)
+        os.makedirs(directory, exist_ok=True)
+        meta = self._load_meta(asset, period)
+
+        times = np.asarray(times, dtype=np.float64)
+        prices = np.asarray(prices, dtype=np.float64)
+        if len(times):
+            order = np.argsort(times, kind="stable")
+            times, prices = times[order], prices[order]
+            name = f"{int(start)}_{int(end)}_{len(meta['segments'])}"
+            np.save(os.path.join(directory, name + ".time.npy"), times)
+            np.save(os.path.join(directory, name + ".price.npy"), prices)
+            meta["segments"].append([name, float(times[0]), float(times[-1])])
+
+        if covered is None:
+            covered = [[start, end]]
+        meta["coverage"] = merge_intervals(meta["coverage"] + [list(c) for c in covered])
+        self._save_meta(asset, period, meta)
+
+    def read(self, asset, period, start, end):
+        """Pontos armazenados em [start, end], ordenados e sem duplicatas.
+
+        :returns: Tupla (timestamps, preços) de arrays NumPy.
+        """
+        directory = self._dir(asset, period)
+        times_parts = []
+        prices_parts = []
+        for name, first, last in self._load_meta(asset, period)["segments"]:
+            if last < start or first > end:
+                continue
+            times = np.load(os.path.join(directory, name + ".time.npy"), mmap_mode="r")
+            prices = np.load(os.path.join(directory, name + ".price.npy"), mmap_mode="r")
+            lo = np.searchsorted(times, start, side="left")
+            hi = np.searchsorted(times, end, side="right")
+            times_parts.append(times[lo:hi])
+            prices_parts.append(prices[lo:hi])
+
+        if not times_parts:
+            return np.empty(0), np.empty(0)
+        if len(times_parts) == 1:
+            return np.array(times_parts[0]), np.array(prices_parts[0])
+
+        times = np.concatenate(times_parts)
+        prices = np.concatenate(prices_parts)
+        times, first_index = np.unique(times, return_index=True)
+        return times, prices[first_index]
+
+    def compact(self, asset, period):
+        """Reescreve todos os segmentos de um ativo/período em um só."""
+        meta = self._load_meta(asset, period)
+        if len(meta["segments"]) <= 1:
+            return
+        directory = self._dir(asset, period)
+        times, prices = self.read(asset, period, float("-inf"), float("inf"))
+        old = meta["segments"]
+        meta["segments"] = []
+        if len(times):
+            name = f"{int(times[0])}_{int(times[-1])}_c"
+            np.save(os.path.join(directory, name + ".time.npy"), times)
+            np.save(os.path.join(directory, name + ".price.npy"), prices)
+            meta["segments"].append([name, float(times[0]), float(times[-1])])
+        self._save_meta(asset, period, meta)
+        for name, _, _ in old:
+            if name != (meta["segments"][0][0] if meta["segments"] else None):
+                for suffix in (".time.npy", ".price.npy"):
+                    try:
+                        os.remove(os.path.join(directory, name + suffix))
+                    except FileNotFoundError:
+                        pass
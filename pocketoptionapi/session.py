@@ -0,0 +1,85 @@
+"""
+Estado de uma sessão (conexão, saldo e ordens), um por instância da API.
+
+Substitui o módulo ``global_value``: cada :class:`PocketOptionAPI
+<pocketoptionapi.api.PocketOptionAPI>` tem o seu, então várias contas
+podem rodar no mesmo processo e no mesmo event loop.
+"""
+import asyncio
+import threading
+
+import pocketoptionapi.global_value as global_value
+
+
+class SessionState(object):
+    """Mesmos campos do antigo ``global_value``, por sessão."""
+
+    def __init__(self, ssid=None, demo=None):
+        """
+        :param str ssid: Mensagem de autenticação (padrão: ``global_value.SSID``).
+        :param bool demo: Conta demo (padrão: ``global_value.DEMO``).
+        """
+        # Código antigo que ainda preenche global_value antes de criar a API continua funcionando
+        self.ssid = global_value.SSID if ssid is None else ssid
+        self.demo = global_value.DEMO if demo is None else demo
+
+        self.websocket_is_connected = False
+        self.check_websocket_if_error = False
+        self.websocket_error_reason = None
+
+        self.balance_id = None
+        self.balance = None
+        self.balance_type = None
+        self.balance_updated = None
+        self.result = None
+        self.order_data = {}
+
+        # Para obter os dados de pagamento para os diferentes pares
+        self.PayoutData = None
+
+    def reset_connection(self):
+        self.websocket_is_connected = False
+        self.check_websocket_if_error = False
+        self.websocket_error_reason = None
+
+
+class EventLoopThread(object):
+    """Event loop em uma thread própria, compartilhável entre várias sessões.
+
+    Exemplo::
+
+        runner = EventLoopThread().start()
+        contas = [PocketOption(ssid, True, loop=runner.loop) for ssid in ssids]
+    """
+
+    def __init__(self, name="pocketoption-loop"):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def run(self, coro, timeout=None):
+        """Executa uma corrotina no loop e aguarda o resultado nesta thread."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    def stop(self):
+        """Cancela as tasks pendentes e encerra o loop."""
+        if not self.loop.is_running():
+            return
+
+        async def cancel_all():
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        self.run(cancel_all())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
@@ -4,22 +4,23 @@ PocketOptionAPI - Interface Python não oficial para a plataforma PocketOption
 Esta é a implementação principal da API da PocketOption, fornecendo métodos
 para autenticação, trading e obtenção de dados do mercado.
 
+A interface síncrona abaixo é uma camada fina sobre
+:class:`AsyncPocketOption <pocketoptionapi.async_api.AsyncPocketOption>`:
+cada chamada executa a corrotina correspondente no loop do websocket e
+aguarda o resultado.
+
 Versão: 1.0.0
 """
 
 import asyncio
-import threading
 import sys
+import warnings
+import weakref
 from tzlocal import get_localzone
-import json
-from pocketoptionapi.api import PocketOptionAPI
+from pocketoptionapi.async_api import AsyncPocketOption, last_time
+from pocketoptionapi.session import EventLoopThread
 import pocketoptionapi.constants as OP_code
-import time
-import logging
-import operator
-import pocketoptionapi.global_value as global_value
 from collections import defaultdict
-from collections import deque
 import pandas as pd
 
 # Obtém o fuso horário local do sistema como uma string no formato IANA
@@ -41,9 +42,19 @@ def nested_dict(n, type):
     else:
         return defaultdict(lambda: nested_dict(n - 1, type))
 
+# Última sessão criada, para o get_balance() do módulo (legado)
+_last_session = None
+
 def get_balance():
-    """Retorna o saldo atual da conta."""
-    return global_value.balance
+    """
+    Retorna o saldo da última sessão :class:`PocketOption` criada.
+
+    Obsoleto: o saldo agora é por sessão; use ``PocketOption.get_balance()``.
+    """
+    warnings.warn("stable_api.get_balance() está obsoleto; use PocketOption.get_balance()",
+                  DeprecationWarning, stacklevel=2)
+    session = _last_session() if _last_session is not None else None
+    return session.get_balance() if session is not None else None
 
 class PocketOption:
     """
@@ -55,27 +66,36 @@ class PocketOption:
     - Obtenção de dados do mercado
     - Gerenciamento de conta
     
+    Os métodos bloqueiam a thread chamadora até o resultado; não os chame
+    de dentro do loop do websocket (lá use ``self.client`` diretamente).
+    
     Attributes:
         __version__ (str): Versão atual da API
-        ssid (str): ID de sessão para autenticação
-        demo (bool): Se True, usa conta demo. Se False, usa conta real
+        client (AsyncPocketOption): Cliente assíncrono usado por baixo
+        api (PocketOptionAPI): Atalho para ``client.api``
     """
     
     __version__ = "1.0.0"
 
-    def __init__(self, ssid, demo):
+    def __init__(self, ssid, demo, history_dir=None, loop=None, url=None, rate_limits=None,
+                 metrics=False):
         """
         Inicializa uma nova instância da API PocketOption.
         
         Args:
             ssid (str): ID de sessão para autenticação
             demo (bool): Se True, usa conta demo. Se False, usa conta real
+            history_dir (str, optional): Diretório do armazenamento local de
+                histórico; se informado, get_candles baixa apenas as lacunas
+            loop (asyncio.AbstractEventLoop, optional): Loop em execução em outra
+                thread, compartilhado entre várias sessões (ver EventLoopThread);
+                sem ele a sessão cria o seu
+            url (str, optional): Endereço do websocket no lugar das regiões padrão
+            rate_limits (dict, optional): Limites de envio por classe de mensagem,
+                classe -> (mensagens por segundo, rajada) ou None para sem limite
+            metrics (bool, optional): Liga as métricas de latência e vazão
+                (ver get_metrics)
         """
-        # Timeframes disponíveis em segundos
-        self.size = [1, 5, 10, 15, 30, 60, 120, 300, 600, 900, 1800,
-                     3600, 7200, 14400, 28800, 43200, 86400, 604800, 2592000]
-        global_value.SSID = ssid
-        global_value.DEMO = demo
         print(f"Modo Demo: {demo}")
         self.suspend = 0.5
         self.thread = None
@@ -90,12 +110,38 @@ class PocketOption:
             "User-Agent": r"Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) "
                           r"Chrome/66.0.3359.139 Safari/537.36"}
         self.SESSION_COOKIE = {}
-        self.api = PocketOptionAPI()
-        self.loop = asyncio.get_event_loop()
+        self._runner = None
+        if loop is None:
+            self._runner = EventLoopThread().start()
+            loop = self._runner.loop
+        self.loop = loop
+        self.client = AsyncPocketOption(ssid, demo, history_dir=history_dir, loop=loop, url=url,
+                                        rate_limits=rate_limits, metrics=metrics)
+        self.api = self.client.api
+        self.history_store = self.client.history_store
+        self.size = self.client.size
+        global _last_session
+        _last_session = weakref.ref(self)
+
+    def _run(self, coro):
+        """Executa uma coroutine no loop do websocket e aguarda o resultado."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
 
     def get_server_timestamp(self):
-        """Retorna o timestamp atual do servidor em segundos."""
-        return self.api.time_sync.server_timestamp
+        """Retorna o timestamp atual do servidor em segundos (None antes da sincronização)."""
+        return self.client.get_server_timestamp()
+
+    def get_server_time(self):
+        """
+        Retorna o tempo atual do servidor com a incerteza da estimativa.
+        
+        Returns:
+            tuple: (timestamp, incerteza em segundos)
+            
+        Raises:
+            ValueError: Se o relógio ainda não foi sincronizado
+        """
+        return self.client.get_server_time()
         
     def Stop(self):
         """Para a execução do programa."""
@@ -103,7 +149,7 @@ class PocketOption:
 
     def get_server_datetime(self):
         """Retorna o datetime atual do servidor."""
-        return self.api.time_sync.server_datetime
+        return self.client.get_server_datetime()
 
     def set_session(self, header, cookie):
         """
@@ -126,68 +172,53 @@ class PocketOption:
         Returns:
             dict: Informações da ordem ou None se não encontrada
         """
-        if self.api.order_async["deals"][0]["id"] == buy_order_id:
-            return self.api.order_async["deals"][0]
-        else:
-            return None
+        return self.client.get_async_order(buy_order_id)
+
+    def get_deal(self, deal_id):
+        """
+        Obtém um deal pelo id, aberto ou fechado.
+        
+        Returns:
+            dict: Dados do deal ou None se não for conhecido
+        """
+        return self.client.get_deal(deal_id)
 
     def get_async_order_id(self, buy_order_id):
         return self.api.order_async["deals"][0][buy_order_id]
 
     def start_async(self):
-        """Inicia a conexão assíncrona com o WebSocket."""
-        asyncio.run(self.api.connect())
+        """Mantido por compatibilidade; equivale a :meth:`connect`."""
+        return self.connect()
         
     def disconnect(self):
         """
-        Fecha graciosamente a conexão WebSocket e limpa recursos.
-        
-        Este método:
-        1. Fecha a conexão WebSocket
-        2. Cancela todas as tasks pendentes
-        3. Fecha o loop de eventos
-        4. Encerra a thread do WebSocket
+        Fecha a conexão WebSocket e, se a sessão criou o próprio loop,
+        encerra o loop e a thread dele.
         """
         try:
-            if global_value.websocket_is_connected:
-                asyncio.run(self.api.close())
-                print("Conexão WebSocket fechada com sucesso.")
-            else:
-                print("WebSocket não estava conectado.")
-
-            if self.loop is not None:
-                for task in asyncio.all_tasks(self.loop):
-                    task.cancel()
-
-                if not self.loop.is_closed():
-                    self.loop.stop()
-                    self.loop.close()
-                    print("Loop de eventos parado e fechado com sucesso.")
-
-            if self.api.websocket_thread is not None and self.api.websocket_thread.is_alive():
-                self.api.websocket_thread.join()
-                print("Thread WebSocket encerrada com sucesso.")
-
+            self._run(self.client.disconnect())
+            print("Conexão WebSocket fechada com sucesso.")
+            if self._runner is not None:
+                self._runner.stop()
+                self._runner = None
+                print("Loop de eventos parado e fechado com sucesso.")
         except Exception as e:
             print(f"Erro durante a desconexão: {e}")
 
-    def connect(self):
+    def connect(self, timeout=30):
         """
         Estabelece conexão com a API da PocketOption.
         
-        Este método inicia uma thread separada para manter a conexão WebSocket.
+        O WebSocket roda no loop da sessão, em outra thread; este método
+        aguarda a autenticação antes de retornar.
+        
+        Args:
+            timeout (float): Prazo em segundos para a autenticação
         
         Returns:
-            bool: True se a conexão foi iniciada com sucesso, False caso contrário
+            bool: True se a conexão foi autenticada, False caso contrário
         """
-        try:
-            websocket_thread = threading.Thread(target=self.api.connect, daemon=True)
-            websocket_thread.start()
-
-        except Exception as e:
-            print(f"Erro ao conectar: {e}")
-            return False
-        return True
+        return self._run(self.client.connect(timeout))
     
     def GetPayout(self, pair):
         """
@@ -199,74 +230,86 @@ class PocketOption:
         Returns:
             float: Percentual de payout ou None se não disponível
         """
-        try:
-            data = self.api.GetPayoutData()
-            data = json.loads(data)
-            data2 = None
-            for i in data:
-                if i[1] == pair:
-                    data2 = i
-            return data2[5]
-        except:
-            return None
+        return self.client.get_payout(pair)
 
-    @staticmethod
-    def check_connect():
+    def get_payouts(self, pairs):
+        """
+        Obtém o payout de vários ativos de uma vez.
+        
+        Args:
+            pairs (list): Lista de ativos (ex: ["EURUSD_otc", "#AAPL"])
+            
+        Returns:
+            dict: Ativo -> percentual de payout (None se não disponível)
+        """
+        return self.client.get_payouts(pairs)
+
+    def get_asset(self, key):
+        """
+        Obtém um ativo do registro pelo símbolo ou pelo id.
+        
+        Args:
+            key (str | int): Símbolo (ex: "EURUSD_otc") ou id numérico
+            
+        Returns:
+            Asset: Símbolo canônico (uma str) com id, categoria, payout,
+                estado de abertura e o par OTC/regular, ou None
+        """
+        return self.client.get_asset(key)
+
+    def get_assets(self, category=None, otc=None, is_open=None):
+        """
+        Obtém os ativos que atendem aos filtros, a partir de visões pré-calculadas.
+        
+        Args:
+            category (str, optional): "currency", "cryptocurrency", "commodity", "stock" ou "index"
+            otc (bool, optional): True apenas OTC, False apenas regulares
+            is_open (bool, optional): True apenas abertos para negociação
+            
+        Returns:
+            frozenset: Ativos encontrados
+        """
+        return self.client.get_assets(category, otc, is_open)
+
+    def check_connect(self):
         """
         Verifica se a conexão WebSocket está ativa.
         
         Returns:
             bool: True se conectado, False caso contrário
         """
-        if global_value.websocket_is_connected == 0:
-            return False
-        elif global_value.websocket_is_connected is None:
-            return False
-        else:
-            return True
+        return self.client.check_connect()
 
-    @staticmethod
-    def get_balance():
+    def get_balance(self):
         """
         Obtém o saldo atual da conta.
         
         Returns:
             float: Saldo atual ou None se não disponível
         """
-        if global_value.balance_updated:
-            return global_value.balance
-        else:
-            return None
+        return self.client.get_balance()
             
-    @staticmethod
-    def check_open():
+    def check_open(self):
         """
         Verifica se há ordens abertas.
         
         Returns:
             bool: True se há ordens abertas, False caso contrário
         """
-        return global_value.order_open
+        return self.client.check_open()
         
-    @staticmethod
-    def check_order_closed(ido):
+    def check_order_closed(self, ido, timeout=None):
         """
         Aguarda até que uma ordem específica seja fechada.
         
         Args:
             ido (int): ID da ordem
+            timeout (float, optional): Prazo máximo em segundos (None aguarda indefinidamente)
             
         Returns:
-            int: ID da ordem fechada
+            int: ID da ordem fechada ou None se o prazo expirar
         """
-        while ido not in global_value.order_closed:
-            time.sleep(0.1)
-
-        for pack in global_value.stat:
-            if pack[0] == ido:
-               print('Ordem Fechada',pack[1])
-
-        return pack[0]
+        return self._run(self.client.check_order_closed(ido, timeout))
     
     def buy(self, amount, active, action, expirations):
         """
@@ -281,37 +324,23 @@ class PocketOption:
         Returns:
             tuple: (bool, int) - (Sucesso da operação, ID da ordem ou None)
         """
-        self.api.buy_multi_option = {}
-        self.api.buy_successful = None
-        req_id = "buy"
-
-        try:
-            if req_id not in self.api.buy_multi_option:
-                self.api.buy_multi_option[req_id] = {"id": None}
-            else:
-                self.api.buy_multi_option[req_id]["id"] = None
-        except Exception as e:
-            logging.error(f"Erro ao inicializar buy_multi_option: {e}")
-            return False, None
+        return self._run(self.client.buy(amount, active, action, expirations))
 
-        global_value.order_data = None
-        global_value.result = None
-
-        self.api.buyv3(amount, active, action, expirations, req_id)
-
-        start_t = time.time()
-        while True:
-            if global_value.result is not None and global_value.order_data is not None:
-                break
-            if time.time() - start_t >= 5:
-                if isinstance(global_value.order_data, dict) and "error" in global_value.order_data:
-                    logging.error(global_value.order_data["error"])
-                else:
-                    logging.error("Erro desconhecido ocorreu durante a operação de compra")
-                return False, None
-            time.sleep(0.1)
-
-        return global_value.result, global_value.order_data.get("id", None)
+    def buy_multi(self, orders, timeout=5):
+        """
+        Envia várias ordens de uma vez e aguarda todas as respostas.
+        
+        Todas as ordens são enfileiradas antes de qualquer espera, então
+        chegam ao servidor em uma única rajada.
+        
+        Args:
+            orders (list): Lista de tuplas (amount, active, action, expirations)
+            timeout (float): Prazo total em segundos para todas as respostas
+            
+        Returns:
+            list: Lista de tuplas (bool, int) na mesma ordem das ordens enviadas
+        """
+        return self._run(self.client.buy_multi(orders, timeout))
 
     def check_win(self, id_number):
         """
@@ -324,29 +353,7 @@ class PocketOption:
             tuple: (float, str) - (Lucro/Prejuízo, Status da operação)
                 Status pode ser: "ganhou", "perdeu" ou "desconhecido"
         """
-        start_t = time.time()
-        order_info = None
-
-        while True:
-            try:
-                order_info = self.get_async_order(id_number)
-                if order_info and "id" in order_info and order_info["id"] is not None:
-                    break
-            except:
-                pass
-
-            if time.time() - start_t >= 120:
-                logging.error("Tempo esgotado: Não foi possível recuperar informações da ordem a tempo.")
-                return None, "desconhecido"
-
-            time.sleep(0.1)
-
-        if order_info and "profit" in order_info:
-            status = "ganhou" if order_info["profit"] > 0 else "perdeu"
-            return order_info["profit"], status
-        else:
-            logging.error("Informações da ordem inválidas recuperadas.")
-            return None, "desconhecido"
+        return self._run(self.client.check_win(id_number))
 
     @staticmethod
     def last_time(timestamp, period):
@@ -360,8 +367,32 @@ class PocketOption:
         Returns:
             int: Timestamp do início do período
         """
-        timestamp_arredondado = (timestamp // period) * period
-        return int(timestamp_arredondado)
+        return last_time(timestamp, period)
+
+    def get_history(self, active, period, start_time=None, count=6000, count_request=1):
+        """
+        Obtém os pontos brutos de histórico (time, price) de um ativo.
+        
+        Com ``history_dir`` configurado, lê do armazenamento local e baixa
+        do servidor apenas as lacunas.
+        
+        Args:
+            active (str): Código do ativo (ex: "EURUSD")
+            period (int): Período usado para alinhar o tempo final
+            start_time (int, optional): Timestamp final do histórico
+            count (int): Número de pontos por requisição (max: 9000)
+            count_request (int): Número de requisições para dados históricos
+            
+        Returns:
+            list: Pontos {"time", "price"} ordenados por tempo
+        """
+        return self._run(self.client.get_history(active, period, start_time, count, count_request))
+
+    def get_history_arrays(self, active, period, start_time=None, count=6000, count_request=1):
+        """
+        Igual a :meth:`get_history`, mas retorna arrays NumPy (timestamps, preços).
+        """
+        return self._run(self.client.get_history_arrays(active, period, start_time, count, count_request))
 
     def get_candles(self, active, period, start_time=None, count=6000, count_request=1):
         """
@@ -381,61 +412,8 @@ class PocketOption:
                 - high: Preço máximo
                 - low: Preço mínimo
                 - close: Preço de fechamento
-                - volume: Volume negociado
         """
-        try:
-            if start_time is None:
-                time_sync = self.get_server_timestamp()
-                time_red = self.last_time(time_sync, period)
-            else:
-                time_red = start_time
-                time_sync = self.get_server_timestamp()
-
-            all_candles = []
-
-            for _ in range(count_request):
-                self.api.history_data = None
-
-                while True:
-                    logging.info("Entrou no loop While em GetCandles")
-                    try:
-                        self.api.getcandles(active, 30, count, time_red)
-
-                        for i in range(1, 100):
-                            if self.api.history_data is None:
-                                time.sleep(0.1)
-                            if i == 99:
-                                break
-
-                        if self.api.history_data is not None:
-                            all_candles.extend(self.api.history_data)
-                            break
-
-                    except Exception as e:
-                        logging.error(e)
-
-                all_candles = sorted(all_candles, key=lambda x: x["time"])
-
-                if all_candles:
-                    time_red = all_candles[0]["time"]
-
-            df_candles = pd.DataFrame(all_candles)
-
-            df_candles = df_candles.sort_values(by='time').reset_index(drop=True)
-            df_candles['time'] = pd.to_datetime(df_candles['time'], unit='s')
-            df_candles.set_index('time', inplace=True)
-            df_candles.index = df_candles.index.floor('1s')
-
-            df_resampled = df_candles['price'].resample(f'{period}s').ohlc()
-
-            df_resampled.reset_index(inplace=True)
-
-            print("FINALIZADO!!!")
-
-            return df_resampled
-        except:
-            print("No except")
-            return None
+        return self._run(self.client.get_candles(active, period, start_time, count, count_request))
 
     @staticmethod
     def process_data_history(data, period):
@@ -490,8 +468,193 @@ class PocketOption:
         diff = (diferencas[1:] == period).all()
         return data_df, diff
 
+    def start_live_candles(self, active, period=60, count=6000):
+        """
+        Inicia as velas ao vivo de um ativo para todos os períodos de ``self.size``.
+        
+        Faz uma única busca de histórico para semear as velas e assina o
+        fluxo de ticks; a partir daí as velas são atualizadas a cada tick.
+        
+        Args:
+            active (str): Código do ativo (ex: "EURUSD_otc")
+            period (int): Período enviado no changeSymbol
+            count (int): Número de pontos de histórico usados na semeadura
+        """
+        self._run(self.client.start_live_candles(active, period, count))
+
+    def get_live_candles(self, active, period, count=None, include_current=False):
+        """
+        Retorna as velas ao vivo mais recentes, sem nova requisição ao servidor.
+        
+        Args:
+            active (str): Código do ativo
+            period (int): Período das velas em segundos (um dos valores de ``self.size``)
+            count (int, optional): Quantidade de velas mais recentes
+            include_current (bool): Inclui a vela ainda em formação
+            
+        Returns:
+            list: Velas {"time", "open", "high", "low", "close", ...} da mais antiga à mais nova
+        """
+        return self.client.get_live_candles(active, period, count, include_current)
+
+    def on_candle_close(self, callback):
+        """
+        Registra um callback ``callback(ativo, período, vela)`` chamado quando
+        uma vela ao vivo fecha, no tempo sincronizado com o servidor.
+        """
+        return self.client.on_candle_close(callback)
+
+    def on_tick(self, callback, active=None, maxsize=1000):
+        """
+        Registra ``callback((ativo, timestamp, preço))`` para cada tick recebido.
+        
+        O callback roda em uma thread própria da assinatura, então pode
+        bloquear sem atrasar o websocket.
+        
+        Args:
+            callback (callable): Função chamada a cada tick
+            active (str, optional): Ativo filtrado (todos por padrão)
+            maxsize (int): Ticks guardados enquanto o callback está ocupado
+            
+        Returns:
+            Subscription: Use ``close()`` para cancelar
+        """
+        return self.client.on_tick(callback, active, maxsize, threaded=True)
+
+    def on_candle(self, callback, active=None, period=None, maxsize=1000):
+        """
+        Registra ``callback((ativo, período, vela))`` para cada vela ao vivo fechada.
+        
+        Returns:
+            Subscription: Use ``close()`` para cancelar
+        """
+        return self.client.on_candle(callback, active, period, maxsize, threaded=True)
+
+    def on_balance(self, callback):
+        """Registra ``callback(dados)`` para cada atualização de saldo."""
+        return self.client.on_balance(callback, threaded=True)
+
+    def on_deal_opened(self, callback, active=None):
+        """Registra ``callback(deal)`` para cada deal aberto."""
+        return self.client.on_deal_opened(callback, active, threaded=True)
+
+    def on_deal_closed(self, callback, active=None):
+        """Registra ``callback(deal)`` para cada deal fechado."""
+        return self.client.on_deal_closed(callback, active, threaded=True)
+
+    def get_ticks(self, active, count=None):
+        """
+        Retorna os ticks recentes de um ativo recebidos pelo updateStream.
+        
+        Args:
+            active (str): Código do ativo (ex: "EURUSD_otc")
+            count (int, optional): Quantidade de ticks mais recentes (todos por padrão)
+            
+        Returns:
+            tuple: (timestamps, preços) como views NumPy somente leitura,
+                ou None se o ativo ainda não recebeu ticks
+        """
+        return self.client.get_ticks(active, count)
+
+    def get_last_tick(self, active):
+        """
+        Retorna o último tick recebido de um ativo.
+        
+        Returns:
+            tuple: (timestamp, preço) ou None se não houver ticks
+        """
+        return self.client.get_last_tick(active)
+
+    def get_expirations(self, count=None):
+        """
+        Retorna as próximas expirações válidas pelo relógio do servidor.
+        
+        Args:
+            count (int, optional): Quantidade de expirações (todas por padrão)
+            
+        Returns:
+            list: Tuplas (duração em minutos, timestamp da expiração), da mais próxima
+        """
+        return self.client.get_expirations(count)
+
+    def get_remaining_time(self):
+        """
+        Retorna quanto falta para cada expiração válida.
+        
+        Returns:
+            list: Tuplas (duração em minutos, segundos restantes)
+        """
+        return self.client.get_remaining_time()
+
+    def get_recovery_stats(self):
+        """
+        Retorna as métricas de retomada da sessão após quedas da conexão.
+        
+        Returns:
+            dict: Quantidade de retomadas e tempo até a recuperação (último,
+                médio e máximo, em segundos)
+        """
+        return self.client.get_recovery_stats()
+
+    def get_outbound_stats(self):
+        """
+        Retorna as métricas da fila de saída por classe de mensagem.
+        
+        Returns:
+            dict: Para "order", "default", "history" e "subscription": mensagens
+                na fila, enviadas, juntadas e canceladas, espera na fila
+                (média, máxima e última, em segundos) e fichas disponíveis
+        """
+        return self.client.get_outbound_stats()
+
+    def enable_metrics(self, enabled=True):
+        """Liga ou desliga a coleta de latências e contadores."""
+        self.client.enable_metrics(enabled)
+
+    def get_metrics(self):
+        """
+        Retorna um snapshot das métricas da sessão.
+        
+        Returns:
+            dict: Frames por evento (total e taxa desde o snapshot anterior),
+                latências (decodificação, fila de saída, ordem até a confirmação
+                e até o fechamento, página de histórico, atraso do loop) e tempo
+                nos handlers por evento, com percentis; contadores de conexão;
+                e as estatísticas de fila, retomada, relógio, expirações,
+                assinaturas e deals
+        """
+        return self.client.get_metrics()
+
+    def get_metrics_text(self):
+        """Retorna as métricas no formato de texto do Prometheus."""
+        return self.client.get_metrics_text()
+
+    def on_metrics(self, callback, interval=10.0):
+        """
+        Chama callback(snapshot) a cada intervalo, na thread do loop do websocket.
+        
+        Returns:
+            concurrent.futures.Future: Cancele-o para parar
+        """
+        return asyncio.run_coroutine_threadsafe(self.api.metrics.report(callback, interval), self.loop)
+
     def change_symbol(self, active, period):
-        return self.api.change_symbol(active, period)
+        """Assina o fluxo de ticks de um ativo e aguarda o envio do pedido."""
+        return self._run(self.client.subscribe(active, period))
+
+    def unsubscribe(self, active, period):
+        """Desfaz um :meth:`change_symbol`; o fluxo é cancelado na última referência."""
+        return self.client.unsubscribe(active, period)
+
+    def get_subscription_stats(self):
+        """
+        Retorna o estado das assinaturas de ticks.
+        
+        Returns:
+            dict: Conexões no pool e, para cada "ativo@período", referências,
+                conexão que o recebe e timestamp do último tick
+        """
+        return self.client.get_subscription_stats()
 
     def sync_datetime(self):
         return self.api.synced_datetime
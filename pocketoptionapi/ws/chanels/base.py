@@ -13,14 +13,15 @@ class Base(object):
         """
         self.api = api
 
-    def send_websocket_request(self, name, msg, request_id=""):
+    def send_websocket_request(self, name, msg, request_id="", on_written=None):
         """Send request to Pocket Option server websocket.
 
         :param request_id:
         :param str name: The websocket chanel name.
         :param list msg: The websocket chanel msg.
+        :param on_written: Optional callback run once the frame is written.
 
         :returns: The instance of :class:`requests.Response`.
         """
 
-        return self.api.send_websocket_request(name, msg, request_id)
+        return self.api.send_websocket_request(name, msg, request_id, on_written=on_written)
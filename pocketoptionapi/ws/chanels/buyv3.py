@@ -3,7 +3,6 @@ import json
 import time
 from pocketoptionapi.ws.chanels.base import Base
 import logging
-import pocketoptionapi.global_value as global_value
 from pocketoptionapi.expiration import get_expiration_time
 
 
@@ -53,7 +52,7 @@ class Buyv3_by_raw_expired(Base):
                      "expired": int(expired),
                      "direction": direction.lower(),
                      "option_type_id": option_id,
-                     "user_balance_id": int(global_value.balance_id)
+                     "user_balance_id": int(self.api.state.balance_id)
                      },
             "name": "binary-options.open-option",
             "version": "1.0"
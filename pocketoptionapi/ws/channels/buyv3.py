@@ -3,14 +3,13 @@ import json
 import time
 from pocketoptionapi.ws.channels.base import Base
 import logging
-import pocketoptionapi.global_value as global_value
 from pocketoptionapi.expiration import get_expiration_time
 
 
 class Buyv3(Base):
     name = "sendMessage"
 
-    def __call__(self, amount, active, direction, duration, request_id):
+    def __call__(self, amount, active, direction, duration, request_id, on_written=None):
 
         # thank Darth-Carrotpie's code
         # https://github.com/Lu-Yi-Hsun/iqoptionapi/issues/6
@@ -32,7 +31,7 @@ class Buyv3(Base):
 
         message = ["openOrder", data_dict]
 
-        self.send_websocket_request(self.name, message, str(request_id))
+        return self.send_websocket_request(self.name, message, str(request_id), on_written)
 
 
 class Buyv3_by_raw_expired(Base):
@@ -53,7 +52,7 @@ class Buyv3_by_raw_expired(Base):
                      "expired": int(expired),
                      "direction": direction.lower(),
                      "option_type_id": option_id,
-                     "user_balance_id": int(global_value.balance_id)
+                     "user_balance_id": int(self.api.state.balance_id)
                      },
             "name": "binary-options.open-option",
             "version": "1.0"
@@ -20,18 +20,19 @@ class GetCandles(Base):
 
     name = "sendMessage"
 
-    def __call__(self, active_id, interval, count, end_time):
+    def __call__(self, active_id, interval, count, end_time, index=None):
         """Method to send message to candles websocket chanel.
 
         :param active_id: The active/asset identifier.
         :param interval: The candle duration (timeframe for the candles).
         :param count: The number of candles you want to have
+        :param index: The request index echoed back in the reply (defaults to end_time).
         """
 
         #      {"asset": "AUDNZD_otc", "index": 171201484810, "time": 1712002800, "offset": 9000, "period": 60}]
         data = {
             "asset": str(active_id),
-            "index": end_time,
+            "index": end_time if index is None else index,
             "offset": count,  # number of candles
             "period": interval,
             "time": end_time,  # time size sample:if interval set 1 mean get time 0~1 candle
@@ -39,4 +40,4 @@ class GetCandles(Base):
 
         data = ["loadHistoryPeriod", data]
 
-        self.send_websocket_request(self.name, data)
+        return self.send_websocket_request(self.name, data)
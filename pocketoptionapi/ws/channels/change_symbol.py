@@ -11,15 +11,18 @@ class ChangeSymbol(Base):
 
     name = "sendMessage"
 
-    def __call__(self, active_id, interval):
+    def __call__(self, active_id, interval, on_written=None):
         """Method to send message to candles websocket chanel.
 
         :param active_id: The active/asset identifier.
         :param interval: The candle duration (timeframe for the candles).
+        :param on_written: Optional callback run once the frame is written.
         """
 
+        self.api.subscriptions.remember(active_id, interval, self.api)
+
         data_stream = ["changeSymbol", {
             "asset": active_id,
             "period": interval}]
 
-        self.send_websocket_request(self.name, data_stream)
+        return self.send_websocket_request(self.name, data_stream, on_written=on_written)
@@ -2,58 +2,75 @@
 Cliente WebSocket para comunicação com a PocketOption.
 """
 import asyncio
+import time
 from datetime import datetime, timedelta, timezone
 import websockets
 import json
 import logging
-import ssl
 import pocketoptionapi.constants as OP_code
-import pocketoptionapi.global_value as global_value
 from pocketoptionapi.constants import REGION
-from pocketoptionapi.ws.objects.timesync import TimeSync
-from pocketoptionapi.ws.objects.time_sync import TimeSynchronizer
+from pocketoptionapi.ws.objects.time_buffer import TimeOrderedBuffer
+from pocketoptionapi.ws.regions import RegionProber, connect_options, ping_rtt
+from pocketoptionapi.ws.events import TICK, BALANCE, DEAL_OPENED, DEAL_CLOSED
+from pocketoptionapi.ws.outbound import OutboundMessage, OutboundScheduler, DEFAULT
+from pocketoptionapi.ws.packets import (
+    BinaryAssembler, EventDispatcher, parse_packet,
+    EIO_MESSAGE, EIO_OPEN, EIO_PING, SIO_BINARY_EVENT, SIO_CONNECT, SIO_EVENT,
+)
 
 logger = logging.getLogger(__name__)
 
-timesync = TimeSync()
-sync = TimeSynchronizer()
-
-async def on_open():
+def on_open(state):
     """Método para processar a abertura do websocket."""
     print("CONEXÃO BEM SUCEDIDA")
     logger.debug("Cliente websocket conectado.")
-    global_value.websocket_is_connected = True
+    state.websocket_is_connected = True
 
-async def send_ping(ws):
-    while global_value.websocket_is_connected is False:
+async def send_ping(client):
+    while client.state.websocket_is_connected is False:
         await asyncio.sleep(0.1)
     while True:
         try:
-            await ws.send('42["ps"]')
+            client.enqueue_message('42["ps"]')
             await asyncio.sleep(20)
-        except websockets.exceptions.ConnectionClosed:
-            logger.warning("Connection closed during ping, attempting reconnect...")
-            break
         except Exception as e:
             logger.error(f"Error during ping: {e}")
             await asyncio.sleep(5)
 
 class WebsocketClient(object):
     def __init__(self, api) -> None:
-        self.updateHistoryNew = None
-        self.updateStream = None
-        self.history_data_ready = None
-        self.successCloseOrder = False
         self.api = api
-        self.message = None
+        self.codec = api.codec
+        self.state = api.state
         self.url = None
-        self.ssid = global_value.SSID
+        self.ssid = api.state.ssid
         self.websocket = None
-        self.region = REGION()
-        self.loop = asyncio.get_event_loop()
-        self.wait_second_message = False
-        self._updateClosedDeals = False
-        self.reconnect_delay = 5  # Initial delay in seconds
+        self.region = REGION(api.regions)
+        # Escolha da região pela latência medida e migração quando degradar
+        self.prober = RegionProber()
+        self.probe_regions = True
+        self.reprobe_interval = 300  # segundos; 0 desativa a nova medição
+        self.migrate_to = None
+        self.current_rtt = None
+        self.rtt_interval = 15  # segundos entre medições de RTT do relógio
+        self.closed = False
+        # Loop único dono do websocket; todas as escritas passam pela fila abaixo,
+        # que aplica os limites por classe de mensagem
+        self.loop = api.loop
+        self.send_queue = OutboundScheduler(api.rate_limits)
+        self.send_inflight = None
+        # Liberado no successauth de cada conexão; a fila só é escrita depois dele
+        self.authenticated = None
+        self.send_count = 0
+        self.send_latency_last = None
+        self.send_latency_max = 0.0
+        self.send_latency_total = 0.0
+        # Despacho de eventos por nome e pareamento de anexos binários
+        self.dispatcher = EventDispatcher()
+        self.assembler = BinaryAssembler()
+        self.register_default_handlers()
+        self.min_reconnect_delay = 1  # Initial delay in seconds
+        self.reconnect_delay = self.min_reconnect_delay
         self.max_reconnect_delay = 60  # Maximum delay in seconds
 
     async def websocket_listener(self, ws):
@@ -62,186 +79,451 @@ class WebsocketClient(object):
                 await self.on_message(message)
         except websockets.exceptions.ConnectionClosed:
             logger.warning("Connection closed, attempting reconnect...")
-            global_value.websocket_is_connected = False
+            self.state.websocket_is_connected = False
         except Exception as e:
             logger.error(f"Error in websocket listener: {e}")
-            global_value.websocket_is_connected = False
+            self.state.websocket_is_connected = False
+
+    async def candidate_urls(self):
+        """Endereços a tentar, do mais rápido para o mais lento."""
+        if self.api.url:
+            return [self.api.url]
+        urls = self.region.get_regions(True, demo=self.state.demo)
+        if self.migrate_to is not None:
+            target, self.migrate_to = self.migrate_to, None
+            return [target] + [url for url in urls if url != target]
+        if self.probe_regions:
+            return await self.prober.rank(urls)
+        return urls
 
     async def connect(self):
-        ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
-
-        while not global_value.websocket_is_connected:
-            for url in self.region.get_regions(True):
+        """Mantém a sessão conectada até :meth:`on_close`.
+
+        Quando uma conexão estabelecida cai, as regiões são medidas de novo e
+        a sessão é retomada (ver :class:`SessionResume
+        <pocketoptionapi.ws.resume.SessionResume>`).
+        """
+        self.closed = False
+        while not self.closed:
+            for url in await self.candidate_urls():
+                if self.closed:
+                    break
                 try:
-                    headers = {
-                        "Origin": "https://pocketoption.com",
-                        "Cache-Control": "no-cache",
-                        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
-                    }
-                    
-                    async with websockets.connect(
-                            url,
-                            ssl=ssl_context,
-                            extra_headers=headers
-                    ) as ws:
+                    async with websockets.connect(url, **connect_options(url)) as ws:
                         self.websocket = ws
                         self.url = url
-                        global_value.websocket_is_connected = True
-                        self.reconnect_delay = 5  # Reset delay on successful connection
-
-                        tasks = [
-                            self.websocket_listener(ws),
-                            self.send_message(self.message),
-                            send_ping(ws)
-                        ]
-                        
-                        await asyncio.gather(*tasks)
+                        self.state.websocket_is_connected = True
+                        self.authenticated = asyncio.Event()
+                        self.api.metrics.inc("connections")
+
+                        writer = asyncio.ensure_future(self.send_writer(ws))
+                        pinger = asyncio.ensure_future(send_ping(self))
+                        clock = asyncio.ensure_future(self.candle_clock())
+                        monitor = asyncio.ensure_future(self.region_monitor(ws))
+                        rtt_probe = asyncio.ensure_future(self.rtt_probe(ws))
+                        try:
+                            await self.websocket_listener(ws)
+                        finally:
+                            writer.cancel()
+                            pinger.cancel()
+                            clock.cancel()
+                            monitor.cancel()
+                            rtt_probe.cancel()
+                            self.state.websocket_is_connected = False
+                            if self.authenticated.is_set():
+                                self.api.metrics.inc("disconnects")
+                                self.api.resume.on_disconnect()
 
                 except Exception as e:
                     logger.error(f"Connection error: {e}")
-                    global_value.websocket_is_connected = False
-                    await asyncio.sleep(self.reconnect_delay)
-                    self.reconnect_delay = min(self.reconnect_delay * 2, self.max_reconnect_delay)
-
-            await asyncio.sleep(1)
+                    self.api.metrics.inc("connect_errors")
+                    self.state.websocket_is_connected = False
+                    await self.backoff()
+                    continue
+
+                # A conexão existiu e caiu: volta à lista de candidatos, que
+                # começa pela região escolhida na migração ou pela mais rápida.
+                # Fora da migração, espera como em uma falha: um servidor que
+                # fecha toda conexão não pode virar um laço de reconexões.
+                if self.migrate_to is None and not self.closed:
+                    await self.backoff()
+                break
+            else:
+                await asyncio.sleep(1)
 
         return True
 
-    async def send_message(self, message):
-        while global_value.websocket_is_connected is False:
-            await asyncio.sleep(0.1)
+    async def backoff(self):
+        """Espera antes da próxima tentativa, dobrando o intervalo a cada falha seguida.
+
+        O intervalo volta ao mínimo a cada autenticação bem-sucedida.
+        """
+        await asyncio.sleep(self.reconnect_delay)
+        self.reconnect_delay = min(self.reconnect_delay * 2, self.max_reconnect_delay)
+
+    async def region_monitor(self, ws):
+        """Mede de tempos em tempos a região atual e as alternativas.
+
+        Se a atual ficar lenta demais em relação à melhor alternativa (ver
+        :meth:`RegionProber.should_migrate`), fecha a conexão e reconecta nela.
+        """
+        if self.api.url or not self.probe_regions or not self.reprobe_interval:
+            return
+        while True:
+            await asyncio.sleep(self.reprobe_interval)
+            others = [url for url in self.region.get_regions(False, demo=self.state.demo) if url != self.url]
+            if not others:
+                return
+            try:
+                self.current_rtt = await ping_rtt(ws, self.prober.timeout)
+                self.api.sync.add_rtt(self.current_rtt)
+            except Exception as e:
+                logger.warning(f"Ping da região atual falhou: {e}")
+                self.current_rtt = None
+                continue
+            best = next((result for result in await self.prober.probe(others) if result.ok), None)
+            if best is not None and self.prober.should_migrate(self.current_rtt, best.rtt):
+                logger.info(f"Migrando de {self.url} ({self.current_rtt * 1000:.0f} ms) "
+                            f"para {best.url} ({best.rtt * 1000:.0f} ms)")
+                self.migrate_to = best.url
+                self.state.websocket_is_connected = False
+                await ws.close()
+                return
 
-        self.message = message
+    async def rtt_probe(self, ws):
+        """Mede o RTT por ping periodicamente para o modelo de relógio."""
+        while True:
+            try:
+                self.api.sync.add_rtt(await ping_rtt(ws, self.prober.timeout))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.debug(f"Ping de RTT falhou: {e}")
+            await asyncio.sleep(self.rtt_interval)
 
-        if global_value.websocket_is_connected and message is not None:
+    async def candle_clock(self):
+        """Fecha as velas ao vivo a cada virada de segundo do servidor, mesmo sem ticks."""
+        while True:
             try:
-                await self.websocket.send(message)
+                now = self.api.sync.get_synced_timestamp()
+            except ValueError:
+                await asyncio.sleep(1)
+                continue
+            self.api.live_candles.advance(now)
+            await asyncio.sleep(1 - now % 1)
+
+    def enqueue_message(self, data, on_written=None, kind=DEFAULT, key=None):
+        """
+        Enfileira um frame para envio. Pode ser chamado de qualquer thread.
+
+        :param str data: O frame já serializado.
+        :param on_written: (opcional) Chamado no loop depois que o frame é escrito.
+        :param str kind: (opcional) Classe da mensagem para os limites de envio
+            (ver :mod:`pocketoptionapi.ws.outbound`).
+        :param key: (opcional) Chave de junção de mensagens redundantes.
+        :returns: :class:`OutboundMessage`, que pode ser cancelada antes do envio.
+        """
+        message = OutboundMessage(data, kind, key, on_written)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.loop:
+            self.send_queue.put(message)
+        else:
+            self.loop.call_soon_threadsafe(self.send_queue.put, message)
+        return message
+
+    async def send_writer(self, ws):
+        """Esvazia a fila de saída no websocket atual até a conexão cair."""
+        while True:
+            if self.authenticated is not None and not self.authenticated.is_set():
+                await self.authenticated.wait()
+            if self.send_inflight is None:
+                self.send_inflight = await self.send_queue.get()
+            message = self.send_inflight
+            try:
+                await ws.send(message.data)
             except websockets.exceptions.ConnectionClosed:
+                # O frame continua em send_inflight e será reenviado após a reconexão
                 logger.warning("Connection closed while sending message")
-                global_value.websocket_is_connected = False
-            except Exception as e:
-                logger.error(f"Error sending message: {e}")
-                global_value.websocket_is_connected = False
-        elif message is not None:
-            logger.warning("WebSocket not connected")
+                self.state.websocket_is_connected = False
+                return
+            self.send_inflight = None
+            message.written()
+            self.record_send_latency(time.perf_counter() - message.enqueued_at)
+
+    def record_send_latency(self, latency):
+        self.send_count += 1
+        self.send_latency_last = latency
+        self.send_latency_total += latency
+        if latency > self.send_latency_max:
+            self.send_latency_max = latency
+        metrics = self.api.metrics
+        if metrics.enabled:
+            metrics.send_queue.record(latency)
+
+    @property
+    def send_latency_stats(self):
+        """
+        Latência entre enfileirar um frame e escrevê-lo no websocket.
+
+        :returns: Dicionário com contagem, última, média e máxima (em segundos).
+        """
+        return {
+            "count": self.send_count,
+            "last": self.send_latency_last,
+            "avg": self.send_latency_total / self.send_count if self.send_count else None,
+            "max": self.send_latency_max,
+            "queued": self.send_queue.qsize(),
+        }
+
+    @property
+    def outbound_stats(self):
+        """Fila, envios, junções e espera por classe de mensagem (ver :class:`OutboundScheduler`)."""
+        return self.send_queue.stats
+
+    async def send_message(self, message):
+        """Mantido por compatibilidade: apenas enfileira a mensagem."""
+        if message is not None:
+            self.enqueue_message(message)
 
     @staticmethod
     def dict_queue_add(self, dict, maxdict, key1, key2, key3, value):
-        if key3 in dict[key1][key2]:
-            dict[key1][key2][key3] = value
+        queue = dict[key1][key2]
+        if isinstance(queue, TimeOrderedBuffer):
+            if queue.maxlen != maxdict:
+                queue.resize(maxdict)
+            queue[key3] = value
+        elif key3 in queue:
+            queue[key3] = value
         else:
-            while True:
-                try:
-                    dic_size = len(dict[key1][key2])
-                except:
-                    dic_size = 0
-                if dic_size < maxdict:
-                    dict[key1][key2][key3] = value
-                    break
-                else:
-                    del dict[key1][key2][sorted(dict[key1][key2].keys(), reverse=False)[0]]
+            # Tabelas antigas (dict simples): descarta o menor sem ordenar tudo
+            while len(queue) >= maxdict:
+                del queue[min(queue)]
+            queue[key3] = value
 
     async def on_message(self, message):
         """Método para processar mensagens do websocket."""
         logger.debug(message)
 
-        if isinstance(message, bytes):
-            message2 = message.decode('utf-8')
-            message = message.decode('utf-8')
-            try:
-                message = json.loads(message)
-            except json.JSONDecodeError:
-                logger.warning("Failed to decode message as JSON")
-                return
-
-            if "balance" in message:
-                if "uid" in message:
-                    global_value.balance_id = message["uid"]
-                global_value.balance = message["balance"]
-                global_value.balance_type = message["isDemo"]
-
-            elif "requestId" in message and message["requestId"] == 'buy':
-                global_value.order_data = message
-
-            elif self.wait_second_message and isinstance(message, list):
-                self.wait_second_message = False
-                self._updateClosedDeals = False
-
-            elif isinstance(message, dict) and self.successCloseOrder:
-                self.api.order_async = message
-                self.successCloseOrder = False
-
-            elif self.history_data_ready and isinstance(message, dict):
-                self.history_data_ready = False
-                self.api.history_data = message["data"]
-
-            elif self.updateStream and isinstance(message, list):
-                self.updateStream = False
-                self.api.time_sync.server_timestamp = message[0][1]
-
-            elif self.updateHistoryNew and isinstance(message, dict):
-                self.updateHistoryNew = False
-                self.api.historyNew = message
-            elif '[[5,"#AAPL","Apple","stock' in message2:
-                global_value.PayoutData = message2
+        metrics = self.api.metrics
+        # Lido uma vez: ligar as métricas no meio de um frame não deixa ``decoded`` sem valor
+        enabled = metrics.enabled
+        if enabled:
+            start = time.perf_counter()
+            packet = self.decode(message)
+            decoded = time.perf_counter()
+            metrics.decode.record(decoded - start)
+        else:
+            packet = self.decode(message)
+        if packet is None:
+            # Pacotes de controle do Engine.IO
+            kind = message[:1]
+            if kind == EIO_PING:
+                await self.websocket.send("3")
+            elif kind == EIO_OPEN:
+                await self.websocket.send("40")
             return
-
-        if message.startswith('0') and "sid" in message:
-            await self.websocket.send("40")
-
-        elif message == "2":
-            await self.websocket.send("3")
-
-        elif "40" and "sid" in message:
+        if packet.type == SIO_CONNECT:
             await self.websocket.send(self.ssid)
+            return
 
-        elif message.startswith('451-['):
-            try:
-                json_part = message.split("-", 1)[1]
-                message = json.loads(json_part)
-
-                if message[0] == "successauth":
-                    await on_open()
-
-                elif message[0] == "successupdateBalance":
-                    global_value.balance_updated = True
-                elif message[0] == "successopenOrder":
-                    global_value.result = True
-
-                elif message[0] == "updateClosedDeals":
-                    self._updateClosedDeals = True
-                    self.wait_second_message = True
-                    await self.websocket.send('42["changeSymbol",{"asset":"AUDNZD_otc","period":60}]')
-
-                elif message[0] == "successcloseOrder":
-                    self.successCloseOrder = True
-                    self.wait_second_message = True
-
-                elif message[0] == "loadHistoryPeriod":
-                    self.history_data_ready = True
-
-                elif message[0] == "updateStream":
-                    self.updateStream = True
+        self.dispatcher.dispatch(packet.event, packet.payload)
+        if enabled:
+            metrics.record_event(packet.event, time.perf_counter() - decoded)
 
-                elif message[0] == "updateHistoryNew":
-                    self.updateHistoryNew = True
+    def decode(self, message):
+        """Decodifica um frame de dados.
 
-            except json.JSONDecodeError:
-                logger.warning("Failed to decode JSON message")
-            except Exception as e:
-                logger.error(f"Error processing message: {e}")
-
-        elif message.startswith("42") and "NotAuthorized" in message:
-            logging.error("User not Authorized: Please Change SSID for one valid")
-            global_value.ssl_Mutual_exclusion = False
-            await self.websocket.close()
+        :returns: O :class:`Packet <pocketoptionapi.ws.packets.Packet>` pronto para
+            despacho (evento completo ou ``connect``), ou None se o frame for só
+            parte de um evento binário ou não tiver o que despachar.
+        """
+        if isinstance(message, bytes):
+            try:
+                attachment = self.codec.loads(message)
+            except self.codec.errors:
+                attachment = message
+            packet = self.assembler.add(attachment)
+            if packet is None and not self.assembler.waiting:
+                self.on_orphan_attachment(attachment)
+            return packet
+
+        if message[:1] != EIO_MESSAGE:
+            return None
+        try:
+            packet = parse_packet(message[1:], self.codec.loads)
+        except self.codec.errors + (IndexError,):
+            logger.warning("Failed to decode JSON message")
+            return None
+
+        if packet.type == SIO_BINARY_EVENT and packet.attachments:
+            self.assembler.start(packet)
+            return None
+        if packet.type in (SIO_EVENT, SIO_BINARY_EVENT, SIO_CONNECT):
+            return packet
+        return None
+
+    def on(self, event, handler=None):
+        """Registra um handler para um evento Socket.IO (ver :class:`EventDispatcher`)."""
+        return self.dispatcher.on(event, handler)
+
+    def register_default_handlers(self):
+        on = self.dispatcher.on
+        on("successauth", self.on_successauth)
+        on("successupdateBalance", self.on_update_balance)
+        on("successopenOrder", self.on_open_order)
+        on("failopenOrder", self.on_fail_open_order)
+        on("updateClosedDeals", self.on_update_closed_deals)
+        on("successcloseOrder", self.on_close_order)
+        on("loadHistoryPeriod", self.on_load_history_period)
+        on("updateStream", self.on_update_stream)
+        on("updateHistoryNew", self.on_update_history_new)
+        on("updateAssets", self.on_update_assets)
+        on("NotAuthorized", self.on_not_authorized)
+
+    def on_successauth(self, data):
+        on_open(self.state)
+        self.reconnect_delay = self.min_reconnect_delay
+        if self.authenticated is not None:
+            self.authenticated.set()
+        self.api.pending.resolve("successauth", True, everyone=True)
+        if self.api.resume.needs_recovery:
+            asyncio.ensure_future(self.api.resume.recover())
+
+    def on_update_balance(self, data):
+        self.state.balance_updated = True
+        if isinstance(data, dict) and "balance" in data:
+            self.set_balance(data)
+
+    def set_balance(self, data):
+        state = self.state
+        if "uid" in data:
+            state.balance_id = data["uid"]
+        state.balance = data["balance"]
+        state.balance_type = data.get("isDemo")
+        events = self.api.events
+        if events.wants(BALANCE) and not self.api.market_only:
+            events.publish(BALANCE, None, data)
+
+    def on_open_order(self, data):
+        self.state.result = True
+        if isinstance(data, dict) and "requestId" in data:
+            self.resolve_order(data)
+            if "id" in data:
+                self.api.deals.open_deal(data)
+        events = self.api.events
+        if events.wants(DEAL_OPENED) and isinstance(data, dict) and not self.api.market_only:
+            events.publish(DEAL_OPENED, data.get("asset"), data)
+
+    def on_fail_open_order(self, data):
+        if isinstance(data, dict) and "requestId" in data:
+            reply = dict(data)
+            reply.setdefault("error", data.get("message", "failopenOrder"))
+            self.resolve_order(reply)
+
+    def resolve_order(self, data):
+        self.state.order_data = data
+        opened = data.get("openTimestamp")
+        if opened is not None:
+            # A resposta traz o tempo do servidor entre a escrita e a chegada
+            entry = self.api.orders.in_flight.get(data["requestId"])
+            if entry is not None and entry[0] is not None:
+                now = self.api.sync.local_now()
+                self.api.sync.add_sample(opened, entry[0], now,
+                                         resolution=1.0 if isinstance(opened, int) else 0.0)
+                metrics = self.api.metrics
+                if metrics.enabled:
+                    metrics.order_ack.record(now - entry[0])
+        self.api.pending.resolve(("order", data["requestId"]), data)
+
+    def on_update_closed_deals(self, data):
+        # Lista dos deals fechados recentes da conta
+        if isinstance(data, list):
+            self.api.deals.close_batch(data)
+
+    def on_close_order(self, data):
+        self.api.order_async = data
+        deals = self.api.deals
+        metrics = self.api.metrics
+        if metrics.enabled:
+            for deal in data.get("deals", []):
+                age = deals.open_age(deal.get("id"))
+                if age is not None:
+                    metrics.order_close.record(age)
+        deals.close_batch(data.get("deals", []))
+        events = self.api.events
+        if events.wants(DEAL_CLOSED) and not self.api.market_only:
+            for deal in data.get("deals", []):
+                events.publish(DEAL_CLOSED, deal.get("asset"), deal)
+
+    def on_load_history_period(self, data):
+        self.api.history_data = data["data"]
+        if not self.api.pending.resolve(("loadHistoryPeriod", data.get("index")), data["data"]):
+            self.api.pending.resolve("loadHistoryPeriod", data["data"])
+
+    def on_update_stream(self, data):
+        # Cada entrada é [ativo, timestamp, preço]
+        if not data:
+            return
+        ticks = self.api.ticks
+        live_candles = self.api.live_candles
+        events = self.api.events
+        publish = events.publish if events.wants(TICK) else None
+        # Buffers, velas e assinaturas ficam indexados pelo mesmo Asset canônico
+        assets = self.api.assets
+        by_symbol = assets.by_symbol
+        for tick in data:
+            asset = by_symbol.get(tick[0]) or assets.intern(tick[0])
+            ticks.append(asset, tick[1], tick[2])
+            live_candles.add_tick(asset, tick[1], tick[2])
+            if publish is not None:
+                publish(TICK, asset, (asset, tick[1], tick[2]))
+        self.api.time_sync.server_timestamp = data[-1][1]
+        self.api.sync.add_one_way(data[-1][1])
+
+    def on_update_history_new(self, data):
+        self.api.historyNew = data
+
+    def on_update_assets(self, data):
+        self.state.PayoutData = data
+        self.api.payouts.update(data)
+
+    def on_not_authorized(self, data):
+        logging.error("User not Authorized: Please Change SSID for one valid")
+        # SSID recusado: reconectar só repetiria a recusa
+        self.closed = True
+        self.state.websocket_error_reason = "NotAuthorized"
+        self.api.pending.reject("successauth", ConnectionError("NotAuthorized"))
+        asyncio.ensure_future(self.websocket.close())
+
+    def on_orphan_attachment(self, data):
+        """Anexo binário sem cabeçalho anunciado; mantém a detecção por conteúdo."""
+        if isinstance(data, dict):
+            if "balance" in data:
+                self.set_balance(data)
+            elif "requestId" in data:
+                self.resolve_order(data)
+        elif isinstance(data, list) and data and isinstance(data[0], list) and data[0][:2] == [5, "#AAPL"]:
+            self.on_update_assets(data)
 
     async def on_error(self, error):
         logger.error(error)
-        global_value.websocket_error_reason = str(error)
-        global_value.check_websocket_if_error = True
+        self.state.websocket_error_reason = str(error)
+        self.state.check_websocket_if_error = True
 
     async def on_close(self, error):
-        global_value.websocket_is_connected = False
\ No newline at end of file
+        """Encerra a sessão sem reconectar. Pode ser chamado de outro loop."""
+        self.closed = True
+        self.state.websocket_is_connected = False
+        ws = self.websocket
+        if ws is not None:
+            try:
+                running = asyncio.get_running_loop()
+            except RuntimeError:
+                running = None
+            if running is self.loop:
+                await ws.close()
+            elif self.loop.is_running():
+                asyncio.run_coroutine_threadsafe(ws.close(), self.loop)
\ No newline at end of file
@@ -0,0 +1,87 @@
+"""
+Codec JSON usado em todos os frames do websocket.
+
+Usa ``orjson`` ou ``msgspec`` quando instalados e recai na biblioteca
+padrão caso contrário. Frames binários são decodificados direto dos bytes.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+class Codec(object):
+    """Par de funções ``loads``/``dumps`` com um nome para diagnóstico.
+
+    ``loads`` aceita ``str`` ou ``bytes``; ``dumps`` sempre retorna ``str``,
+    pronto para ser prefixado com ``42`` e enviado como frame de texto.
+    ``errors`` é a tupla de exceções levantadas por uma entrada inválida.
+    """
+
+    def __init__(self, name, loads, dumps, errors):
+        self.name = name
+        self.loads = loads
+        self.dumps = dumps
+        self.errors = errors
+
+    def __repr__(self):
+        return f"Codec({self.name!r})"
+
+
+def _stdlib_codec():
+    return Codec("json", json.loads, json.dumps, (ValueError,))
+
+
+def _orjson_codec():
+    dumps = orjson.dumps
+
+    def dumps_str(obj):
+        return dumps(obj).decode("utf-8")
+
+    return Codec("orjson", orjson.loads, dumps_str, (ValueError,))
+
+
+def _msgspec_codec():
+    decoder = msgspec.json.Decoder()
+    encoder = msgspec.json.Encoder()
+
+    def dumps_str(obj):
+        return encoder.encode(obj).decode("utf-8")
+
+    return Codec("msgspec", decoder.decode, dumps_str, (ValueError, msgspec.DecodeError))
+
+
+_FACTORIES = {
+    "json": _stdlib_codec,
+    "orjson": _orjson_codec if orjson is not None else None,
+    "msgspec": _msgspec_codec if msgspec is not None else None,
+}
+
+
+def available_codecs():
+    """Nomes dos codecs utilizáveis neste ambiente, do mais rápido ao mais lento."""
+    return [name for name in ("orjson", "msgspec", "json") if _FACTORIES[name] is not None]
+
+
+def get_codec(name=None):
+    """Retorna um codec pelo nome ou o mais rápido disponível.
+
+    :param str name: ``"orjson"``, ``"msgspec"``, ``"json"`` ou None.
+    :raises ValueError: Se o codec pedido não estiver instalado.
+    """
+    if name is None:
+        name = available_codecs()[0]
+    factory = _FACTORIES.get(name)
+    if factory is None:
+        raise ValueError(f"Codec '{name}' não está disponível")
+    return factory()
+
+
+default_codec = get_codec()
@@ -0,0 +1,222 @@
+"""
+Assinaturas de eventos da sessão: ticks, velas, saldo e deals.
+
+Os handlers do ``on_message`` publicam direto no :class:`EventBus`; cada
+assinante tem a própria fila limitada, consumida por uma task própria, então
+um assinante lento só atrasa a si mesmo e nunca o leitor do websocket.
+"""
+import asyncio
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+TICK = "tick"
+CANDLE = "candle"
+BALANCE = "balance"
+DEAL_OPENED = "deal_opened"
+DEAL_CLOSED = "deal_closed"
+
+
+class Subscription(object):
+    """Uma assinatura de eventos: callback ou iterador assíncrono.
+
+    Sem callback, é consumida com ``async for`` (ou :meth:`get`). Com
+    callback, uma task chama o callback para cada evento, em ordem; funções
+    ``async`` são aguardadas. Com ``threaded=True`` o callback roda em uma
+    thread própria da assinatura, para código bloqueante.
+
+    A fila guarda até ``maxsize`` eventos; se o consumidor não acompanhar,
+    os mais antigos são descartados e contados em :attr:`dropped`.
+    """
+
+    def __init__(self, bus, kind, key=None, callback=None, maxsize=1000, threaded=False):
+        self.bus = bus
+        self.kind = kind
+        self.key = key
+        self.callback = callback
+        self.queue = deque(maxlen=maxsize)
+        self.dropped = 0
+        self.delivered = 0
+        self.closed = False
+        self._waiter = None
+        self._task = None
+        self._executor = ThreadPoolExecutor(max_workers=1) if threaded and callback is not None else None
+
+    def _put(self, item):
+        # Sempre no loop do websocket
+        queue = self.queue
+        if len(queue) == queue.maxlen:
+            self.dropped += 1
+        queue.append(item)
+        waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    def _start(self):
+        if self.callback is None:
+            return
+        if self.closed:
+            self._shutdown()
+        else:
+            self._task = self.bus.loop.create_task(self._consume())
+
+    def _shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    async def _consume(self):
+        callback = self.callback
+        is_coroutine = asyncio.iscoroutinefunction(callback)
+        loop = self.bus.loop
+        try:
+            while True:
+                try:
+                    item = await self.get()
+                except EOFError:
+                    return
+                try:
+                    if self._executor is not None:
+                        await loop.run_in_executor(self._executor, callback, item)
+                    elif is_coroutine:
+                        await callback(item)
+                    else:
+                        callback(item)
+                except Exception as e:
+                    logger.error(f"Erro no assinante de {self.kind}: {e}")
+        finally:
+            # Só depois de a fila esvaziar: nenhum callback fica sem thread
+            self._shutdown()
+
+    async def get(self, timeout=None):
+        """Próximo evento da fila.
+
+        :raises EOFError: Se a assinatura foi encerrada e a fila esvaziou.
+        :raises asyncio.TimeoutError: Se o prazo expirar.
+        """
+        queue = self.queue
+        while not queue:
+            if self.closed:
+                raise EOFError("Assinatura encerrada")
+            self._waiter = self.bus.loop.create_future()
+            try:
+                await asyncio.wait_for(self._waiter, timeout)
+            finally:
+                self._waiter = None
+        self.delivered += 1
+        return queue.popleft()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return await self.get()
+        except EOFError:
+            raise StopAsyncIteration
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Cancela a assinatura. Os eventos já na fila ainda são entregues."""
+        if self.closed:
+            return
+        self.closed = True
+        self.bus._remove(self)
+        loop = self.bus.loop
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._wake()
+        elif not loop.is_closed():
+            loop.call_soon_threadsafe(self._wake)
+
+    def _wake(self):
+        waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    @property
+    def stats(self):
+        return {"queued": len(self.queue), "delivered": self.delivered, "dropped": self.dropped}
+
+
+class EventBus(object):
+    """Roteia eventos publicados no loop do websocket para as assinaturas.
+
+    Cada tópico é ``(tipo, chave)``; a chave None recebe os eventos de todas
+    as chaves do tipo (ex.: ticks de todos os ativos). Publicar em um tópico
+    sem assinantes custa uma busca em dicionário.
+    """
+
+    def __init__(self, loop):
+        self.loop = loop
+        self._lock = threading.Lock()
+        # (tipo, chave) -> tupla de assinaturas, trocada inteira a cada mudança
+        self._topics = {}
+        # tipo -> quantidade de assinaturas, para os handlers pularem o trabalho
+        self._kinds = {}
+
+    def subscribe(self, kind, key=None, callback=None, maxsize=1000, threaded=False):
+        """Cria uma assinatura. Pode ser chamado de qualquer thread.
+
+        :param str kind: Tipo do evento (``tick``, ``candle``, ``balance``,
+            ``deal_opened`` ou ``deal_closed``).
+        :param key: (opcional) Filtro do tipo (ativo, ou (ativo, período) para velas).
+        :param callback: (opcional) Chamado com cada evento; sem ele, itere a assinatura.
+        :param int maxsize: Eventos guardados enquanto o consumidor não os lê.
+        :param bool threaded: Roda o callback em uma thread própria.
+        :returns: :class:`Subscription`.
+        """
+        subscription = Subscription(self, kind, key, callback, maxsize, threaded)
+        topic = (kind, key)
+        with self._lock:
+            self._topics[topic] = self._topics.get(topic, ()) + (subscription,)
+            self._kinds[kind] = self._kinds.get(kind, 0) + 1
+        if callback is not None:
+            try:
+                running = asyncio.get_running_loop()
+            except RuntimeError:
+                running = None
+            if running is self.loop:
+                subscription._start()
+            else:
+                self.loop.call_soon_threadsafe(subscription._start)
+        return subscription
+
+    def _remove(self, subscription):
+        topic = (subscription.kind, subscription.key)
+        with self._lock:
+            current = self._topics.get(topic, ())
+            if subscription not in current:
+                return
+            remaining = tuple(s for s in current if s is not subscription)
+            if remaining:
+                self._topics[topic] = remaining
+            else:
+                del self._topics[topic]
+            self._kinds[subscription.kind] -= 1
+
+    def wants(self, kind):
+        """Se há alguma assinatura do tipo."""
+        return self._kinds.get(kind, 0) > 0
+
+    def publish(self, kind, key, item):
+        """Entrega o evento às assinaturas da chave e às do tipo inteiro.
+
+        Deve ser chamado no loop do websocket.
+        """
+        topics = self._topics
+        if key is not None:
+            for subscription in topics.get((kind, key), ()):
+                subscription._put(item)
+        for subscription in topics.get((kind, None), ()):
+            subscription._put(item)
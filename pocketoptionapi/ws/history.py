@@ -0,0 +1,178 @@
+"""
+Paginação de histórico (loadHistoryPeriod) com várias páginas em voo.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import time
+from operator import itemgetter
+
+from pocketoptionapi.ws.channels.candles import GetCandles
+
+logger = logging.getLogger(__name__)
+
+_by_time = itemgetter("time")
+
+# Resolução (``period``) enviada no loadHistoryPeriod pelo cliente
+HISTORY_PERIOD = 30
+
+
+def merge_pages(pages):
+    """Junta páginas já ordenadas em uma única lista por tempo, sem duplicatas.
+
+    Usa um merge k-way, então não há reordenação completa a cada página.
+    """
+    merged = []
+    last = None
+    for point in heapq.merge(*pages, key=_by_time):
+        current = point["time"]
+        if current != last:
+            merged.append(point)
+            last = current
+    return merged
+
+
+def _sorted_page(page):
+    # O servidor devolve os pontos em ordem; só reordena se não vierem assim
+    for i in range(1, len(page)):
+        if page[i - 1]["time"] > page[i]["time"]:
+            return sorted(page, key=_by_time)
+    return page
+
+
+class HistoryPager(object):
+    """Busca várias páginas de histórico em paralelo no loop do websocket.
+
+    A primeira página define o intervalo coberto por página; as demais são
+    pedidas de uma vez (até ``max_in_flight`` simultâneas), cada uma com um
+    ``index`` próprio para casar a resposta. Cada página tem no máximo
+    ``max_retries`` novas tentativas.
+    """
+
+    def __init__(self, api, max_in_flight=4, timeout=10, max_retries=3):
+        """
+        :param api: A instância de :class:`PocketOptionAPI
+            <pocketoptionapi.api.PocketOptionAPI>`.
+        :param int max_in_flight: Máximo de páginas pedidas ao mesmo tempo.
+        :param float timeout: Prazo em segundos para cada resposta.
+        :param int max_retries: Novas tentativas por página antes de desistir.
+        """
+        self.api = api
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self._counter = itertools.count()
+
+    def next_index(self, end_time):
+        # Mesmo formato do cliente web: timestamp seguido de dois dígitos
+        return int(end_time) * 100 + next(self._counter) % 100
+
+    async def request_page(self, active, end_time, count, interval=HISTORY_PERIOD):
+        """Pede uma página e aguarda a resposta, com novas tentativas limitadas.
+
+        :returns: Lista de pontos ordenada por tempo.
+        :raises asyncio.TimeoutError: Se todas as tentativas expirarem.
+        """
+        pending = self.api.pending
+        for attempt in range(self.max_retries + 1):
+            index = self.next_index(end_time)
+            key = ("loadHistoryPeriod", index)
+            future = pending.register(key)
+            # Se o servidor não ecoar o index, a resposta cai na fila por tipo
+            pending.register("loadHistoryPeriod", future)
+            sent = time.perf_counter()
+            message = GetCandles(self.api)(active, interval, count, end_time, index)
+            try:
+                page = await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+                metrics = self.api.metrics
+                if metrics.enabled:
+                    metrics.history_rtt.record(time.perf_counter() - sent)
+                return _sorted_page(page)
+            except asyncio.TimeoutError:
+                # Se o pedido ainda estava na fila de saída, a nova tentativa o substitui
+                if message is not None:
+                    message.cancel()
+                logger.warning(f"Timeout na página de histórico {active}@{end_time} "
+                               f"(tentativa {attempt + 1}/{self.max_retries + 1})")
+            finally:
+                pending.discard(key, future)
+                pending.discard("loadHistoryPeriod", future)
+        raise asyncio.TimeoutError(f"Histórico de {active} em {end_time} sem resposta")
+
+    async def _gather_pages(self, active, ends, count, interval):
+        # Páginas na ordem de ``ends``; None para as que falharam
+        semaphore = asyncio.Semaphore(self.max_in_flight)
+
+        async def page_at(end):
+            async with semaphore:
+                try:
+                    return await self.request_page(active, end, count, interval)
+                except asyncio.TimeoutError as e:
+                    logger.error(e)
+                    return None
+
+        return list(await asyncio.gather(*(page_at(end) for end in ends)))
+
+    @staticmethod
+    def _covered(pages, ends):
+        # Intervalo efetivamente recebido de cada página: do primeiro ponto até
+        # o fim pedido. Páginas que falharam ou vieram vazias não cobrem nada.
+        return [[page[0]["time"], end] for page, end in zip(pages, ends) if page]
+
+    async def fetch(self, active, end_time, count, pages=1, interval=HISTORY_PERIOD):
+        """Baixa ``pages`` páginas terminando em ``end_time``.
+
+        Páginas que esgotam as tentativas ficam de fora (ver :meth:`fetch_covered`).
+
+        :returns: Pontos ``{"time", "price"}`` ordenados e sem duplicatas.
+        """
+        return (await self.fetch_covered(active, end_time, count, pages, interval))[0]
+
+    async def fetch_covered(self, active, end_time, count, pages=1, interval=HISTORY_PERIOD):
+        """Como :meth:`fetch`, informando também o que foi de fato recebido.
+
+        :returns: Tupla (pontos, intervalos [início, fim] recebidos); o primeiro
+            intervalo é o da página que termina em ``end_time``.
+        :raises asyncio.TimeoutError: Se a primeira página não chegar.
+        """
+        first = await self.request_page(active, end_time, count, interval)
+        covered = self._covered([first], [end_time])
+        if pages <= 1 or not first:
+            return first, covered
+
+        span = end_time - first[0]["time"]
+        if span <= 0:
+            return first, covered
+
+        ends = [end_time - k * span for k in range(1, pages)]
+        rest = await self._gather_pages(active, ends, count, interval)
+        return merge_pages([first] + [page for page in rest if page]), covered + self._covered(rest, ends)
+
+    async def fetch_range(self, active, start, end, count, interval=HISTORY_PERIOD):
+        """Baixa as páginas necessárias para cobrir [start, end].
+
+        :returns: Pontos ``{"time", "price"}`` dentro do intervalo, ordenados.
+        """
+        return (await self.fetch_range_covered(active, start, end, count, interval))[0]
+
+    async def fetch_range_covered(self, active, start, end, count, interval=HISTORY_PERIOD):
+        """Como :meth:`fetch_range`, informando também o que foi de fato recebido.
+
+        :returns: Tupla (pontos, intervalos [início, fim] recebidos, dentro de [start, end]).
+        :raises asyncio.TimeoutError: Se a primeira página não chegar.
+        """
+        first = await self.request_page(active, end, count, interval)
+        pages, ends = [first], [end]
+        if first and first[0]["time"] > start:
+            span = end - first[0]["time"]
+            if span > 0:
+                count_pages = math.ceil((end - start) / span)
+                more = [end - k * span for k in range(1, count_pages)]
+                pages += await self._gather_pages(active, more, count, interval)
+                ends += more
+        points = merge_pages([page for page in pages if page])
+        covered = [[max(c_start, start), c_end] for c_start, c_end in self._covered(pages, ends)
+                   if c_end > start]
+        return [point for point in points if start <= point["time"] <= end], covered
@@ -0,0 +1,363 @@
+"""
+Métricas de latência e vazão do cliente: histogramas, contadores e exportação
+no formato de texto do Prometheus ou como dicionário.
+"""
+import asyncio
+import logging
+import math
+import re
+import threading
+import time
+import weakref
+
+logger = logging.getLogger(__name__)
+
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+# Atributo do histograma -> (nome exportado, descrição)
+HISTOGRAMS = {
+    "decode": ("decode_seconds", "Tempo de decodificação de um frame"),
+    "send_queue": ("send_queue_seconds", "Espera de um frame na fila de saída até a escrita"),
+    "order_ack": ("order_ack_seconds", "Da escrita do openOrder ao successopenOrder"),
+    "order_close": ("order_close_seconds", "Do successopenOrder ao successcloseOrder do deal"),
+    "history_rtt": ("history_page_seconds", "Do pedido de uma página de histórico à resposta"),
+    "loop_lag": ("loop_lag_seconds", "Atraso do event loop em acordar uma tarefa"),
+}
+
+COUNTERS = {
+    "connections": "Conexões estabelecidas",
+    "disconnects": "Conexões autenticadas que caíram",
+    "connect_errors": "Tentativas de conexão que falharam",
+}
+
+_NAME = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
+
+
+class Histogram(object):
+    """Histograma log-linear no estilo HDR.
+
+    Cada potência de dois entre ``lowest`` e ``highest`` é dividida em
+    ``2 ** sub_bits`` faixas iguais, então o erro relativo dos percentis fica
+    abaixo de ``1 / 2 ** sub_bits`` (3% com o padrão). Registrar um valor é
+    um ``frexp`` e um incremento em lista; a memória é fixa.
+    """
+
+    __slots__ = ("lowest", "counts", "count", "total", "low", "high", "_min_exp", "_sub", "_scale", "_last")
+
+    def __init__(self, lowest=1e-6, highest=3600.0, sub_bits=5):
+        """
+        :param float lowest: Menor valor distinguido; abaixo dele tudo cai na primeira faixa.
+        :param float highest: Maior valor distinguido; acima dele tudo cai na última faixa.
+        :param int sub_bits: Faixas por potência de dois, em bits.
+        """
+        self.lowest = lowest
+        self._sub = 1 << sub_bits
+        self._scale = 2 * self._sub
+        self._min_exp = math.frexp(lowest)[1]
+        self.counts = [0] * ((math.frexp(highest)[1] - self._min_exp + 1) * self._sub)
+        self._last = len(self.counts) - 1
+        self.reset()
+
+    def record(self, value):
+        self.count += 1
+        self.total += value
+        if value > self.high:
+            self.high = value
+        if value < self.low:
+            self.low = value
+        if value > self.lowest:
+            mantissa, exponent = math.frexp(value)
+            # mantissa em [0.5, 1): a potência de dois escolhe o grupo, a mantissa a faixa
+            index = (exponent - self._min_exp) * self._sub + int((mantissa - 0.5) * self._scale)
+            self.counts[index if index < self._last else self._last] += 1
+        else:
+            self.counts[0] += 1
+
+    @property
+    def min(self):
+        return self.low if self.count else None
+
+    @property
+    def max(self):
+        return self.high if self.count else None
+
+    def _upper(self, index):
+        exponent, sub = divmod(index, self._sub)
+        return math.ldexp(0.5 + (sub + 1) / (2.0 * self._sub), exponent + self._min_exp)
+
+    def percentile(self, q):
+        """Limite superior da faixa que contém o quantil ``q`` (0 a 1), ou None se vazio."""
+        if not self.count:
+            return None
+        target = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count:
+                seen += count
+                if seen >= target:
+                    return min(self._upper(index), self.high)
+        return self.high
+
+    def summary(self):
+        """Contagem, soma, mínimo, máximo, média e percentis (p50, p90, p99, p999)."""
+        result = {"count": self.count, "sum": self.total, "min": self.min, "max": self.max,
+                  "mean": self.total / self.count if self.count else None}
+        for q in QUANTILES:
+            result["p" + ("%g" % (q * 100)).replace(".", "")] = self.percentile(q)
+        return result
+
+    def reset(self):
+        self.counts = [0] * len(self.counts)
+        self.count = 0
+        self.total = 0.0
+        self.low = math.inf
+        self.high = 0.0
+
+
+class LoopLagSampler(object):
+    """Mede o atraso de um event loop para todas as métricas ligadas nele.
+
+    Há um por loop (ver :meth:`for_loop`): sessões que dividem o loop, e as
+    conexões de um pool, não multiplicam as amostras nem os despertares. A
+    task só existe enquanto alguma métrica ligada está inscrita.
+    """
+
+    interval = 0.5
+
+    _samplers = weakref.WeakKeyDictionary()
+    _lock = threading.Lock()
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.targets = weakref.WeakSet()
+        self._task = None
+
+    @classmethod
+    def for_loop(cls, loop):
+        with cls._lock:
+            sampler = cls._samplers.get(loop)
+            if sampler is None:
+                sampler = cls._samplers[loop] = cls(loop)
+            return sampler
+
+    def _call(self, func):
+        # Tasks só podem ser criadas e canceladas na thread do loop
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.loop:
+            func()
+        elif not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(func)
+
+    def add(self, metrics):
+        self.targets.add(metrics)
+        self._call(self._start)
+
+    def discard(self, metrics):
+        self.targets.discard(metrics)
+        self._call(self._stop_if_idle)
+
+    def _start(self):
+        if self.targets and (self._task is None or self._task.done()):
+            self._task = self.loop.create_task(self._run())
+
+    def _stop_if_idle(self):
+        if not self.targets and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        loop = self.loop
+        while self.targets:
+            interval = self.interval
+            expected = loop.time() + interval
+            await asyncio.sleep(interval)
+            lag = max(0.0, loop.time() - expected)
+            for metrics in list(self.targets):
+                metrics.loop_lag.record(lag)
+
+
+class Metrics(object):
+    """Instrumentação de uma sessão (compartilhada com as conexões do pool).
+
+    Desligada, cada ponto instrumentado custa só a leitura de ``enabled``;
+    ligue e desligue com :meth:`set_enabled` para que o atraso do event loop
+    só seja medido enquanto ligada.
+    As estatísticas que já existiam (fila de saída, retomada, relógio,
+    expirações, assinaturas, deals) entram como coletores: são lidas na hora
+    do :meth:`snapshot` ou da exportação, ligada ou não.
+    """
+
+    def __init__(self, enabled=False, prefix="pocketoption", labels=None):
+        """
+        :param bool enabled: Se a coleta começa ligada.
+        :param str prefix: Prefixo dos nomes exportados.
+        :param dict labels: (opcional) Rótulos fixos da exportação (ex.: ``{"account": "demo"}``).
+        """
+        self.enabled = enabled
+        self.prefix = prefix
+        self.labels = dict(labels or {})
+        self.loop = None
+        for attr in HISTOGRAMS:
+            setattr(self, attr, Histogram())
+        # evento -> frames recebidos / tempo nos handlers
+        self.frames = {}
+        self.handlers = {}
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.collectors = {}
+        self.started = time.time()
+        self._last_frames = ({}, time.monotonic())
+
+    def attach(self, loop):
+        """Associa as métricas ao loop da sessão; mede o atraso dele se ligadas."""
+        self.loop = loop
+        if self.enabled:
+            LoopLagSampler.for_loop(loop).add(self)
+
+    def detach(self):
+        """Para a medição do atraso do loop (a sessão foi fechada)."""
+        if self.loop is not None:
+            LoopLagSampler.for_loop(self.loop).discard(self)
+
+    def set_enabled(self, enabled):
+        """Liga ou desliga a coleta, iniciando ou parando a medição do loop."""
+        self.enabled = enabled
+        if self.loop is not None:
+            sampler = LoopLagSampler.for_loop(self.loop)
+            if enabled:
+                sampler.add(self)
+            else:
+                sampler.discard(self)
+
+    def record_event(self, event, seconds):
+        """Conta um evento despachado e o tempo gasto nos seus handlers."""
+        self.frames[event] = self.frames.get(event, 0) + 1
+        histogram = self.handlers.get(event)
+        if histogram is None:
+            histogram = self.handlers[event] = Histogram()
+        histogram.record(seconds)
+
+    def inc(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def collect(self, name, func):
+        """Registra ``func()``, que retorna um dicionário de estatísticas, sob ``name``."""
+        self.collectors[name] = func
+
+    def reset(self):
+        for attr in HISTOGRAMS:
+            getattr(self, attr).reset()
+        self.frames = {}
+        self.handlers = {}
+        self.counters = dict.fromkeys(self.counters, 0)
+        self.started = time.time()
+        self._last_frames = ({}, time.monotonic())
+
+    def _collected(self):
+        result = {}
+        for name, func in self.collectors.items():
+            try:
+                result[name] = func()
+            except Exception as e:
+                logger.debug(f"Coletor de métricas {name} falhou: {e}")
+        return result
+
+    def snapshot(self):
+        """Dicionário com todas as métricas.
+
+        Os frames por evento trazem o total e a taxa (por segundo) desde o
+        snapshot anterior.
+        """
+        now = time.monotonic()
+        frames = dict(self.frames)
+        previous, since = self._last_frames
+        elapsed = now - since
+        self._last_frames = (frames, now)
+        return {
+            "time": time.time(),
+            "enabled": self.enabled,
+            "uptime": time.time() - self.started,
+            "frames": {event: {"count": count,
+                               "rate": (count - previous.get(event, 0)) / elapsed if elapsed > 0 else None}
+                       for event, count in frames.items()},
+            "latency": {name: getattr(self, attr).summary() for attr, (name, _) in HISTOGRAMS.items()},
+            "handlers": {event: histogram.summary() for event, histogram in list(self.handlers.items())},
+            "counters": dict(self.counters),
+            "stats": self._collected(),
+        }
+
+    def _label_text(self, labels):
+        merged = dict(self.labels)
+        merged.update(labels)
+        if not merged:
+            return ""
+        return "{" + ",".join('%s="%s"' % (key, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+                              for key, value in merged.items()) + "}"
+
+    def _summary_lines(self, name, histogram, labels):
+        lines = []
+        for q in QUANTILES:
+            value = histogram.percentile(q)
+            if value is not None:
+                lines.append(f"{name}{self._label_text(dict(labels, quantile=q))} {value!r}")
+        lines.append(f"{name}_sum{self._label_text(labels)} {histogram.total!r}")
+        lines.append(f"{name}_count{self._label_text(labels)} {histogram.count}")
+        return lines
+
+    def _gauges(self, name, value, labels, out):
+        # Achata dicionários aninhados: chaves que são nomes válidos entram no
+        # nome da métrica, as demais (ex.: "EURUSD_otc@60") viram rótulo
+        if isinstance(value, dict):
+            for key, item in value.items():
+                key = str(key)
+                if _NAME.match(key):
+                    self._gauges(f"{name}_{key}", item, labels, out)
+                else:
+                    self._gauges(name, item, dict(labels, key=key), out)
+        elif isinstance(value, bool):
+            out.setdefault(name, []).append((labels, int(value)))
+        elif isinstance(value, (int, float)):
+            out.setdefault(name, []).append((labels, value))
+
+    def prometheus(self):
+        """Todas as métricas no formato de texto do Prometheus."""
+        prefix = self.prefix
+        lines = [f"# HELP {prefix}_frames_total Eventos recebidos por tipo",
+                 f"# TYPE {prefix}_frames_total counter"]
+        for event, count in list(self.frames.items()):
+            lines.append(f"{prefix}_frames_total{self._label_text({'event': event})} {count}")
+
+        for name, help_text in COUNTERS.items():
+            metric = f"{prefix}_{name}_total"
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter",
+                      f"{metric}{self._label_text({})} {self.counters.get(name, 0)}"]
+
+        for attr, (name, help_text) in HISTOGRAMS.items():
+            metric = f"{prefix}_{name}"
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} summary"]
+            lines += self._summary_lines(metric, getattr(self, attr), {})
+
+        metric = f"{prefix}_handler_seconds"
+        lines += [f"# HELP {metric} Tempo nos handlers de cada evento", f"# TYPE {metric} summary"]
+        for event, histogram in list(self.handlers.items()):
+            lines += self._summary_lines(metric, histogram, {"event": event})
+
+        gauges = {}
+        for collector, stats in self._collected().items():
+            self._gauges(f"{prefix}_{collector}", stats, {}, gauges)
+        for metric, samples in gauges.items():
+            lines.append(f"# TYPE {metric} gauge")
+            for labels, value in samples:
+                lines.append(f"{metric}{self._label_text(labels)} {value!r}")
+        return "\n".join(lines) + "\n"
+
+    async def report(self, callback, interval=10.0):
+        """Chama ``callback(snapshot)`` a cada ``interval`` segundos até ser cancelado."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                callback(self.snapshot())
+            except Exception as e:
+                logger.error(f"Erro no callback de métricas: {e}")
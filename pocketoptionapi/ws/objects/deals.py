@@ -0,0 +1,148 @@
+"""
+Livro de deals indexado por id, com estados aberto e fechado.
+"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from pocketoptionapi.ws.objects.base import Base
+from pocketoptionapi.ws.pending import PendingRequests
+
+
+class DealBook(Base):
+    """Deals da sessão por id, para consulta e espera em O(1).
+
+    Cada deal de cada lote ``successcloseOrder`` é registrado e acorda quem
+    aguarda aquele id. Os fechados ficam guardados por ``ttl`` segundos (e
+    no máximo ``max_closed``); os abertos sem fechamento conhecido são
+    descartados após ``max_open_age`` segundos.
+    """
+
+    def __init__(self, ttl=3600, max_closed=10000, max_open_age=86400, clock=time.monotonic):
+        """
+        :param float ttl: Tempo (s) que um deal fechado fica disponível.
+        :param int max_closed: Máximo de deals fechados guardados.
+        :param float max_open_age: Idade máxima (s) de um deal aberto sem fechamento.
+        :param clock: Relógio monotônico usado nos prazos.
+        """
+        super(DealBook, self).__init__()
+        self.__name = "deals"
+        self.ttl = ttl
+        self.max_closed = max_closed
+        self.max_open_age = max_open_age
+        self._clock = clock
+        self._lock = threading.Lock()
+        # id -> (instante do registro, deal), em ordem de chegada
+        self.opened = OrderedDict()
+        self.closed = OrderedDict()
+        self.waiters = PendingRequests()
+
+    def open_deal(self, deal):
+        """Registra um deal aberto (ex.: resposta ``successopenOrder``)."""
+        deal_id = deal.get("id")
+        if deal_id is None:
+            return
+        with self._lock:
+            if deal_id not in self.closed:
+                self.opened[deal_id] = (self._clock(), deal)
+
+    def close_deal(self, deal):
+        """Registra um deal fechado e entrega o resultado a quem o aguarda."""
+        deal_id = deal.get("id")
+        if deal_id is None:
+            return
+        now = self._clock()
+        with self._lock:
+            self.opened.pop(deal_id, None)
+            closed = self.closed
+            closed[deal_id] = (now, deal)
+            closed.move_to_end(deal_id)
+            self._prune(now)
+        self.waiters.resolve(deal_id, deal, everyone=True)
+
+    def close_batch(self, deals):
+        """Registra todos os deals de um lote de fechamento."""
+        for deal in deals:
+            if isinstance(deal, dict):
+                self.close_deal(deal)
+
+    def _prune(self, now):
+        closed = self.closed
+        while closed:
+            deal_id, (closed_at, _) = next(iter(closed.items()))
+            if now - closed_at <= self.ttl and len(closed) <= self.max_closed:
+                break
+            del closed[deal_id]
+        opened = self.opened
+        while opened:
+            deal_id, (opened_at, _) = next(iter(opened.items()))
+            if now - opened_at <= self.max_open_age:
+                break
+            del opened[deal_id]
+
+    def prune(self):
+        """Descarta os deals vencidos."""
+        with self._lock:
+            self._prune(self._clock())
+
+    def closed_deal(self, deal_id):
+        """O deal fechado com esse id, ou None."""
+        entry = self.closed.get(deal_id)
+        return entry[1] if entry is not None else None
+
+    def open_deal_info(self, deal_id):
+        """O deal aberto com esse id, ou None."""
+        entry = self.opened.get(deal_id)
+        return entry[1] if entry is not None else None
+
+    def open_age(self, deal_id):
+        """Segundos desde o registro de um deal aberto, ou None."""
+        entry = self.opened.get(deal_id)
+        return self._clock() - entry[0] if entry is not None else None
+
+    def get(self, deal_id):
+        """O deal com esse id, fechado ou aberto, ou None."""
+        deal = self.closed_deal(deal_id)
+        return deal if deal is not None else self.open_deal_info(deal_id)
+
+    def is_open(self, deal_id):
+        return deal_id in self.opened
+
+    def is_closed(self, deal_id):
+        return deal_id in self.closed
+
+    @property
+    def open_ids(self):
+        return list(self.opened)
+
+    def wait_closed(self, deal_id):
+        """Future com o deal fechado; já resolvido se o fechamento chegou antes.
+
+        :returns: Um :class:`concurrent.futures.Future`.
+        """
+        with self._lock:
+            entry = self.closed.get(deal_id)
+            if entry is None:
+                return self.waiters.register(deal_id)
+        future = Future()
+        future.set_result(entry[1])
+        return future
+
+    def wait(self, deal_id, timeout=None):
+        """Aguarda o fechamento do deal nesta thread.
+
+        :raises concurrent.futures.TimeoutError: Se o prazo expirar.
+        """
+        return self.waiters.wait(deal_id, self.wait_closed(deal_id), timeout)
+
+    async def wait_async(self, deal_id, timeout=None):
+        """Aguarda o fechamento do deal no event loop.
+
+        :raises asyncio.TimeoutError: Se o prazo expirar.
+        """
+        return await self.waiters.wait_async(deal_id, self.wait_closed(deal_id), timeout)
+
+    @property
+    def stats(self):
+        return {"open": len(self.opened), "closed": len(self.closed)}
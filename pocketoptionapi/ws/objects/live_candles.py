@@ -0,0 +1,129 @@
+"""
+Construção incremental de velas OHLC a partir do fluxo de ticks.
+"""
+from collections import deque
+
+from pocketoptionapi.ws.objects.base import Base
+
+# Posições da vela em construção (lista mutável, evita alocar por tick)
+_START, _OPEN, _HIGH, _LOW, _CLOSE, _TICKS = range(6)
+
+
+def _as_candle(bar, period):
+    return {"time": bar[_START], "open": bar[_OPEN], "high": bar[_HIGH],
+            "low": bar[_LOW], "close": bar[_CLOSE], "ticks": bar[_TICKS], "period": period}
+
+
+class LiveCandles(Base):
+    """Mantém a vela atual de cada período para cada ativo.
+
+    Cada tick atualiza todas as velas do ativo em O(1) por período. Quando
+    um tick (ou o relógio do servidor, via :meth:`advance`) cruza o limite
+    do período, a vela é fechada, guardada no histórico e os listeners
+    registrados com :meth:`on_close` são chamados com ``(ativo, período, vela)``.
+    """
+
+    def __init__(self, periods, history=1000):
+        """
+        :param periods: Períodos das velas em segundos.
+        :param int history: Quantidade de velas fechadas guardadas por ativo/período.
+        """
+        super(LiveCandles, self).__init__()
+        self.__name = "liveCandles"
+        self.periods = tuple(int(period) for period in periods)
+        self.history = history
+        self.bars = {}
+        self.closed = {}
+        self.listeners = []
+
+    def on_close(self, callback):
+        """Registra um callback ``callback(ativo, período, vela)`` para velas fechadas."""
+        self.listeners.append(callback)
+        return callback
+
+    def _close(self, asset, period, bar, emit):
+        candle = _as_candle(bar, period)
+        key = (asset, period)
+        closed = self.closed.get(key)
+        if closed is None:
+            closed = self.closed[key] = deque(maxlen=self.history)
+        closed.append(candle)
+        if emit:
+            for callback in self.listeners:
+                callback(asset, period, candle)
+
+    def add_tick(self, asset, timestamp, price, emit=True):
+        """Atualiza as velas do ativo com um tick.
+
+        Ticks mais antigos que a vela atual de um período são ignorados nele.
+        """
+        bars = self.bars.get(asset)
+        if bars is None:
+            bars = self.bars[asset] = [None] * len(self.periods)
+        second = int(timestamp)
+        for i, period in enumerate(self.periods):
+            start = second - second % period
+            bar = bars[i]
+            if bar is None:
+                closed = self.closed.get((asset, period))
+                if closed and closed[-1]["time"] >= start:
+                    # tick atrasado de uma vela já fechada por advance()
+                    continue
+                bars[i] = [start, price, price, price, price, 1]
+            elif bar[_START] == start:
+                if price > bar[_HIGH]:
+                    bar[_HIGH] = price
+                elif price < bar[_LOW]:
+                    bar[_LOW] = price
+                bar[_CLOSE] = price
+                bar[_TICKS] += 1
+            elif start > bar[_START]:
+                self._close(asset, period, bar, emit)
+                bars[i] = [start, price, price, price, price, 1]
+
+    def seed(self, asset, history):
+        """Inicializa as velas a partir de um histórico, sem emitir eventos.
+
+        :param history: Lista de pontos ``{"time": ..., "price": ...}`` em ordem.
+        """
+        for point in history:
+            self.add_tick(asset, point["time"], point["price"], emit=False)
+
+    def advance(self, server_timestamp):
+        """Fecha as velas cujo período terminou, mesmo sem novos ticks.
+
+        As velas fechadas por tempo não abrem uma nova vela; ela começa no
+        próximo tick do ativo.
+
+        :param server_timestamp: Tempo atual do servidor em segundos.
+        """
+        second = int(server_timestamp)
+        for asset, bars in self.bars.items():
+            for i, period in enumerate(self.periods):
+                bar = bars[i]
+                if bar is not None and bar[_START] + period <= second:
+                    self._close(asset, period, bar, True)
+                    bars[i] = None
+
+    def current(self, asset, period):
+        """A vela em construção do ativo/período, ou None."""
+        bars = self.bars.get(asset)
+        if bars is None or period not in self.periods:
+            return None
+        bar = bars[self.periods.index(period)]
+        return _as_candle(bar, period) if bar is not None else None
+
+    def candles(self, asset, period, count=None, include_current=False):
+        """Velas fechadas mais recentes, da mais antiga para a mais nova.
+
+        :param int count: Quantidade de velas (todas as guardadas por padrão).
+        :param bool include_current: Inclui a vela em construção no final.
+        """
+        candles = list(self.closed.get((asset, period), ()))
+        if include_current:
+            current = self.current(asset, period)
+            if current is not None:
+                candles.append(current)
+        if count is not None:
+            candles = candles[-count:]
+        return candles
@@ -0,0 +1,93 @@
+"""
+Tabela de payouts indexada por símbolo, montada a partir do updateAssets.
+"""
+from pocketoptionapi.ws.objects.base import Base
+
+# Posições usadas de cada linha do frame ``[[5,"#AAPL","Apple","stock",...``
+ROW_ID = 0
+ROW_SYMBOL = 1
+ROW_NAME = 2
+ROW_TYPE = 3
+ROW_PAYOUT = 5
+ROW_IS_OPEN = 14
+
+
+class PayoutInfo(object):
+    """Dados de payout de um ativo."""
+
+    __slots__ = ("id", "symbol", "name", "type", "payout", "is_open", "raw")
+
+    def __init__(self, row):
+        self.id = row[ROW_ID]
+        self.symbol = row[ROW_SYMBOL]
+        self.name = row[ROW_NAME]
+        self.type = row[ROW_TYPE]
+        self.payout = row[ROW_PAYOUT]
+        self.is_open = bool(row[ROW_IS_OPEN]) if len(row) > ROW_IS_OPEN else None
+        self.raw = row
+
+    def __repr__(self):
+        return f"PayoutInfo({self.symbol!r}, payout={self.payout}, is_open={self.is_open})"
+
+
+class PayoutTable(Base):
+    """Payouts por símbolo, reconstruídos a cada frame e trocados de uma vez.
+
+    Leitores de outras threads sempre veem uma tabela completa: a nova
+    tabela é montada à parte e só então substitui a anterior.
+    """
+
+    def __init__(self):
+        super(PayoutTable, self).__init__()
+        self.__name = "payouts"
+        self.table = {}
+        self.listeners = []
+
+    def on_update(self, callback):
+        """Registra ``callback(tabela_antiga, tabela_nova)`` chamado a cada atualização."""
+        self.listeners.append(callback)
+        return callback
+
+    def update(self, rows):
+        """Substitui a tabela a partir das linhas do frame de payouts.
+
+        Se um símbolo aparecer repetido, vale a primeira ocorrência.
+        """
+        table = {}
+        for row in rows:
+            try:
+                symbol = row[ROW_SYMBOL]
+            except (IndexError, TypeError):
+                continue
+            if symbol not in table:
+                table[symbol] = PayoutInfo(row)
+        old, self.table = self.table, table
+        for callback in self.listeners:
+            callback(old, table)
+
+    def get(self, symbol):
+        """O :class:`PayoutInfo` do símbolo, ou None."""
+        return self.table.get(symbol)
+
+    def payout(self, symbol):
+        """O payout do símbolo, ou None se desconhecido."""
+        info = self.table.get(symbol)
+        return info.payout if info is not None else None
+
+    def get_payouts(self, symbols):
+        """Payouts de vários símbolos de uma vez.
+
+        :returns: Dicionário símbolo -> payout (None para desconhecidos).
+        """
+        table = self.table
+        result = {}
+        for symbol in symbols:
+            info = table.get(symbol)
+            result[symbol] = info.payout if info is not None else None
+        return result
+
+    def __len__(self):
+        return len(self.table)
+
+    def __contains__(self, symbol):
+        return symbol in self.table
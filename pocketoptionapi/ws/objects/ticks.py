@@ -0,0 +1,109 @@
+"""
+Armazenamento de ticks por ativo em buffers circulares pré-alocados.
+"""
+import numpy as np
+
+from pocketoptionapi.ws.objects.base import Base
+
+
+class TickBuffer(object):
+    """Buffer circular de capacidade fixa com arrays NumPy (timestamp, preço).
+
+    Cada tick é gravado duas vezes (posições ``i`` e ``i + capacity``), de
+    modo que os últimos N ticks sempre formam uma fatia contígua: ``window``
+    devolve views dos arrays, sem cópia, e ``append`` é O(1) sem criar
+    objetos Python por tick.
+    """
+
+    def __init__(self, capacity):
+        """
+        :param int capacity: Quantidade máxima de ticks mantidos.
+        """
+        if capacity <= 0:
+            raise ValueError("capacity deve ser positiva")
+        self.capacity = capacity
+        self._times = np.zeros(2 * capacity, dtype=np.float64)
+        self._prices = np.zeros(2 * capacity, dtype=np.float64)
+        self._head = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def append(self, timestamp, price):
+        """Adiciona um tick, descartando o mais antigo se o buffer estiver cheio."""
+        i = self._head
+        j = i + self.capacity
+        self._times[i] = timestamp
+        self._times[j] = timestamp
+        self._prices[i] = price
+        self._prices[j] = price
+        i += 1
+        self._head = 0 if i == self.capacity else i
+        if self._count < self.capacity:
+            self._count += 1
+
+    def extend(self, timestamps, prices):
+        """Adiciona vários ticks em ordem (ex.: preenchimento de histórico)."""
+        for timestamp, price in zip(timestamps, prices):
+            self.append(timestamp, price)
+
+    def window(self, n=None):
+        """Últimos ``n`` ticks (todos por padrão), do mais antigo ao mais novo.
+
+        :returns: Tupla (timestamps, preços) de views somente leitura.
+        """
+        if n is None or n > self._count:
+            n = self._count
+        end = self._head + self.capacity
+        times = self._times[end - n:end]
+        prices = self._prices[end - n:end]
+        times.flags.writeable = False
+        prices.flags.writeable = False
+        return times, prices
+
+    def since(self, timestamp):
+        """Ticks com timestamp maior ou igual ao informado (views)."""
+        times, prices = self.window()
+        start = int(np.searchsorted(times, timestamp, side="left"))
+        return times[start:], prices[start:]
+
+    def last(self):
+        """O tick mais recente como (timestamp, preço), ou None se vazio."""
+        if not self._count:
+            return None
+        i = self._head + self.capacity - 1
+        return float(self._times[i]), float(self._prices[i])
+
+
+class TickStore(Base):
+    """Um :class:`TickBuffer` por ativo, criado no primeiro tick recebido."""
+
+    def __init__(self, capacity=10000):
+        """
+        :param int capacity: Capacidade de cada buffer por ativo.
+        """
+        super(TickStore, self).__init__()
+        self.__name = "ticks"
+        self.capacity = capacity
+        self.buffers = {}
+
+    def buffer(self, asset):
+        """Retorna (criando se necessário) o buffer do ativo."""
+        buffer = self.buffers.get(asset)
+        if buffer is None:
+            buffer = self.buffers[asset] = TickBuffer(self.capacity)
+        return buffer
+
+    def append(self, asset, timestamp, price):
+        buffer = self.buffers.get(asset)
+        if buffer is None:
+            buffer = self.buffer(asset)
+        buffer.append(timestamp, price)
+
+    def get(self, asset):
+        """Retorna o buffer do ativo ou None se nenhum tick foi recebido."""
+        return self.buffers.get(asset)
+
+    def assets(self):
+        return list(self.buffers)
@@ -0,0 +1,122 @@
+"""
+Buffer limitado e ordenado por tempo para velas em tempo real e deals.
+"""
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+
+
+class TimeOrderedBuffer(object):
+    """Mapa tempo -> valor com capacidade máxima, descartando o mais antigo.
+
+    As chaves ficam em uma lista ordenada com deslocamento de início: inserir
+    no fim (o caso do fluxo em tempo real) e descartar o mais antigo são O(1)
+    amortizados. Chaves fora de ordem são inseridas por bisect.
+    """
+
+    def __init__(self, maxlen):
+        """
+        :param int maxlen: Quantidade máxima de entradas.
+        """
+        if maxlen <= 0:
+            raise ValueError("maxlen deve ser positivo")
+        self.maxlen = maxlen
+        self._keys = []
+        self._start = 0
+        self._values = {}
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, key):
+        return key in self._values
+
+    def __getitem__(self, key):
+        return self._values[key]
+
+    def get(self, key, default=None):
+        return self._values.get(key, default)
+
+    def __setitem__(self, key, value):
+        values = self._values
+        if key in values:
+            values[key] = value
+            return
+        keys = self._keys
+        if len(values) >= self.maxlen:
+            if key < keys[self._start]:
+                # Mais antigo que tudo em um buffer cheio: seria descartado na hora
+                return
+            self._evict_oldest()
+        if len(keys) == self._start or key > keys[-1]:
+            keys.append(key)
+        else:
+            insort(keys, key, self._start)
+        values[key] = value
+
+    def _evict_oldest(self):
+        keys = self._keys
+        del self._values[keys[self._start]]
+        self._start += 1
+        # Compacta quando metade da lista já foi descartada (O(1) amortizado)
+        if self._start > 32 and self._start * 2 > len(keys):
+            del keys[:self._start]
+            self._start = 0
+
+    def pop_oldest(self):
+        """Remove e retorna (tempo, valor) mais antigo."""
+        if not self._values:
+            raise KeyError("buffer vazio")
+        key = self._keys[self._start]
+        value = self._values[key]
+        self._evict_oldest()
+        return key, value
+
+    def resize(self, maxlen):
+        """Altera a capacidade, descartando os mais antigos se necessário."""
+        if maxlen <= 0:
+            raise ValueError("maxlen deve ser positivo")
+        self.maxlen = maxlen
+        while len(self._values) > maxlen:
+            self._evict_oldest()
+
+    def oldest(self):
+        """Tempo mais antigo armazenado, ou None."""
+        return self._keys[self._start] if self._values else None
+
+    def newest(self):
+        """Tempo mais recente armazenado, ou None."""
+        return self._keys[-1] if self._values else None
+
+    def keys(self):
+        return self._keys[self._start:]
+
+    def values(self):
+        values = self._values
+        return [values[key] for key in self._keys[self._start:]]
+
+    def items(self):
+        values = self._values
+        return [(key, values[key]) for key in self._keys[self._start:]]
+
+    def __iter__(self):
+        return iter(self._keys[self._start:])
+
+    def range(self, start=None, end=None):
+        """Entradas com ``start <= tempo <= end``, em ordem.
+
+        :returns: Lista de tuplas (tempo, valor).
+        """
+        keys = self._keys
+        lo = self._start if start is None else bisect_left(keys, start, self._start)
+        hi = len(keys) if end is None else bisect_right(keys, end, lo)
+        values = self._values
+        return [(key, values[key]) for key in keys[lo:hi]]
+
+
+def nested_time_buffers(maxlen):
+    """Tabela ``[chave1][chave2] -> TimeOrderedBuffer`` criada sob demanda.
+
+    Substitui o ``nested_dict(3, dict)``; a capacidade de cada buffer pode
+    ser ajustada depois com :meth:`TimeOrderedBuffer.resize`.
+    """
+    return defaultdict(lambda: defaultdict(lambda: TimeOrderedBuffer(maxlen)))
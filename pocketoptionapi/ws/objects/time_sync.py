@@ -1,38 +1,228 @@
 """
 Módulo para sincronização de tempo com o servidor da PocketOption.
-Fornece funcionalidades para manter o tempo local sincronizado com o servidor.
+
+O relógio do servidor é estimado a partir de amostras no estilo NTP: cada
+amostra limita o deslocamento (servidor - relógio local monotônico) a um
+intervalo. Respostas a requisições limitam dos dois lados; timestamps que
+o servidor envia sozinho (ex.: ``updateStream``) só limitam por baixo e são
+completados com o RTT medido por ping. Sem nenhum limite superior, a
+incerteza é infinita.
 """
+import math
+import time
+from collections import deque
 from datetime import datetime, timezone
 
+
 class TimeSynchronizer:
-    def __init__(self):
+    # Deriva máxima aceita entre os relógios (s/s) e incerteza assumida da
+    # deriva residual, que faz o erro crescer desde a última amostra
+    MAX_DRIFT = 5e-4
+    DRIFT_UNCERTAINTY = 5e-5
+
+    def __init__(self, window=256, max_age=900.0, bucket=30.0, outlier=0.25,
+                 min_interval=0.5, clock=time.monotonic):
+        """
+        :param int window: Máximo de amostras mantidas.
+        :param float max_age: Idade máxima de uma amostra, em segundos.
+        :param float bucket: Intervalo (s) de cada ponto usado na estimativa da deriva.
+        :param float outlier: Diferença (s) a partir da qual um extremo isolado é descartado.
+        :param float min_interval: Intervalo mínimo (s) entre recálculos da estimativa.
+        :param clock: Relógio local monotônico.
+        """
+        self._clock = clock
+        self.samples = deque(maxlen=window)  # (local, limite inferior, limite superior ou None)
+        self.max_age = max_age
+        self.bucket = bucket
+        self.outlier = outlier
+        self.min_interval = min_interval
+        self.rtt = None
+        self.offset = None
+        self.drift = 0.0
+        self.error = None
+        self.t_ref = 0.0
+        self._estimated_at = None
+        self._last_now = float("-inf")
+        # Mantidos por compatibilidade: último timestamp recebido e a hora local dele
         self.server_time_reference = None
         self.local_time_reference = None
 
+    def local_now(self):
+        """Leitura do relógio local usado nas amostras."""
+        return self._clock()
+
+    @property
+    def synced(self):
+        return self.offset is not None
+
+    def add_sample(self, server_timestamp, sent_at, received_at, resolution=0.0):
+        """
+        Amostra de requisição/resposta: o servidor marcou o tempo entre o envio e o recebimento.
+
+        :param server_timestamp: Tempo do servidor contido na resposta.
+        :param sent_at: :meth:`local_now` quando a requisição foi escrita.
+        :param received_at: :meth:`local_now` quando a resposta chegou.
+        :param resolution: Resolução do timestamp (1.0 se vier truncado em segundos).
+        """
+        self.samples.append((received_at, server_timestamp - received_at,
+                             server_timestamp + resolution - sent_at))
+        if self.error == math.inf:
+            # Primeiro limite superior: a incerteza deixa de ser infinita já
+            self._estimate()
+        else:
+            self._maybe_estimate(received_at)
+
+    def add_one_way(self, server_timestamp, received_at=None):
+        """
+        Timestamp enviado pelo servidor sem requisição (ex.: último tick do updateStream).
+
+        :param server_timestamp: Tempo do servidor, em segundos.
+        :param received_at: (opcional) :meth:`local_now` no recebimento.
+        """
+        if received_at is None:
+            received_at = self._clock()
+        self.samples.append((received_at, server_timestamp - received_at, None))
+        self._maybe_estimate(received_at)
+
+    def add_rtt(self, rtt):
+        """RTT medido por ping, usado como atraso das amostras de mão única."""
+        self.rtt = rtt if self.rtt is None else 0.8 * self.rtt + 0.2 * rtt
+        if self.samples:
+            self._estimate()
+
     def synchronize(self, server_timestamp):
         """
         Sincroniza o tempo local com o timestamp do servidor.
-        
+
         :param server_timestamp: O timestamp do servidor em segundos.
         """
         self.server_time_reference = server_timestamp
-        self.local_time_reference = datetime.now(timezone.utc).timestamp()
+        self.local_time_reference = time.time()
+        self.add_one_way(server_timestamp)
 
-    def get_synced_datetime(self):
+    def _maybe_estimate(self, now):
+        if self._estimated_at is None or now - self._estimated_at >= self.min_interval:
+            self._estimate()
+
+    @staticmethod
+    def _drop_isolated(values, outlier):
+        # values ordenados do mais extremo para o menos; remove extremos isolados
+        while len(values) > 1 and abs(values[0] - values[1]) > outlier:
+            values.pop(0)
+        return values[0]
+
+    def _estimate(self):
+        now = self._clock()
+        samples = self.samples
+        while samples and now - samples[0][0] > self.max_age:
+            samples.popleft()
+        if not samples:
+            return
+        self._estimated_at = now
+
+        # Deriva: reta pelo maior limite inferior de cada intervalo de `bucket` s
+        envelope = {}
+        for t, lo, _ in samples:
+            key = int(t // self.bucket)
+            if key not in envelope or lo > envelope[key][1]:
+                envelope[key] = (t, lo)
+        drift = 0.0
+        if len(envelope) >= 3:
+            points = list(envelope.values())
+            n = len(points)
+            mean_t = sum(p[0] for p in points) / n
+            mean_o = sum(p[1] for p in points) / n
+            var = sum((p[0] - mean_t) ** 2 for p in points)
+            if var > 0:
+                drift = sum((p[0] - mean_t) * (p[1] - mean_o) for p in points) / var
+                drift = max(-self.MAX_DRIFT, min(self.MAX_DRIFT, drift))
+
+        t_ref = samples[-1][0]
+        los = sorted((lo + drift * (t_ref - t) for t, lo, _ in samples), reverse=True)
+        lo = self._drop_isolated(los, self.outlier)
+
+        # Limite superior: respostas a requisições e, para a amostra de mão
+        # única mais recente, no máximo um RTT de atraso
+        bounds = [lo + self.rtt] if self.rtt is not None else []
+        his = sorted(hi + drift * (t_ref - t) for t, _, hi in samples if hi is not None)
+        if his:
+            bounds.append(self._drop_isolated(his, self.outlier))
+        if not bounds:
+            # Só amostras de mão única e nenhum RTT: o atraso é desconhecido
+            offset = lo
+            error = math.inf
+        else:
+            hi = min(bounds)
+            if hi < lo and his:
+                # Ticks adiantados contradizem as respostas; fica só com as respostas
+                lo = max(lo_ + drift * (t_ref - t) for t, lo_, hi_ in samples if hi_ is not None)
+                hi = his[0]
+            offset = (lo + hi) / 2
+            error = abs(hi - lo) / 2
+
+        self.drift = drift
+        self.t_ref = t_ref
+        self.error = error
+        self.offset = offset
+
+    def server_now(self):
         """
-        Retorna o datetime atual sincronizado com o servidor.
-        
-        :return: Um objeto datetime sincronizado com o servidor.
+        Tempo atual do servidor em segundos, sem criar objetos datetime.
+
+        Nunca volta para trás entre chamadas.
+
         :raises ValueError: Se o tempo não foi sincronizado ainda.
         """
-        if self.server_time_reference is None or self.local_time_reference is None:
+        offset = self.offset
+        if offset is None:
             raise ValueError("O tempo ainda não foi sincronizado.")
+        local = self._clock()
+        now = local + offset + self.drift * (local - self.t_ref)
+        if now < self._last_now:
+            return self._last_now
+        self._last_now = now
+        return now
+
+    def error_bound(self):
+        """Incerteza (s) de :meth:`server_now`, ou None se não sincronizado.
 
-        # Calcula o tempo decorrido desde a última sincronização
-        time_elapsed = datetime.now(timezone.utc).timestamp() - self.local_time_reference
+        Infinita enquanto não houver RTT nem resposta a uma requisição.
+        """
+        if self.error is None:
+            return None
+        return self.error + self.DRIFT_UNCERTAINTY * (self._clock() - self.t_ref)
+
+    def server_now_bounds(self):
+        """
+        :returns: Tupla (tempo do servidor, incerteza) em segundos.
+        :raises ValueError: Se o tempo não foi sincronizado ainda.
+        """
+        return self.server_now(), self.error_bound()
 
-        # Ajusta o timestamp do servidor com o tempo decorrido
-        synced_timestamp = self.server_time_reference + time_elapsed
+    def get_synced_timestamp(self):
+        """
+        Retorna o timestamp atual do servidor em segundos (ver :meth:`server_now`).
+
+        :raises ValueError: Se o tempo não foi sincronizado ainda.
+        """
+        return self.server_now()
+
+    def get_synced_datetime(self):
+        """
+        Retorna o datetime atual sincronizado com o servidor.
+
+        :return: Um objeto datetime sincronizado com o servidor.
+        :raises ValueError: Se o tempo não foi sincronizado ainda.
+        """
+        return datetime.fromtimestamp(self.server_now(), timezone.utc)
 
-        # Converte para datetime
-        return datetime.fromtimestamp(synced_timestamp, timezone.utc)
+    @property
+    def stats(self):
+        """Estado do modelo: deslocamento, deriva (s/s), incerteza, RTT e amostras."""
+        return {
+            "offset": self.offset,
+            "drift": self.drift,
+            "error": self.error_bound(),
+            "rtt": self.rtt,
+            "samples": len(self.samples),
+        }
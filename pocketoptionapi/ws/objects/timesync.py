@@ -9,18 +9,28 @@ from pocketoptionapi.ws.objects.base import Base
 class TimeSync(Base):
     """Class for Pocket Option TimeSync websocket object."""
 
-    def __init__(self):
+    def __init__(self, synchronizer=None):
+        """
+        :param synchronizer: (opcional) O :class:`TimeSynchronizer
+            <pocketoptionapi.ws.objects.time_sync.TimeSynchronizer>` da sessão.
+        """
         super(TimeSync, self).__init__()
         self.__name = "timeSync"
-        self.__server_timestamp = time.time()
+        self.__synchronizer = synchronizer
+        # Desconhecido até o servidor informar; não assume o relógio local
+        self.__server_timestamp = None
         self.__expiration_time = 1
 
     @property
     def server_timestamp(self):
         """Property to get server timestamp.
 
-        :returns: The server timestamp.
+        :returns: The estimated current server timestamp, the last one received
+            if the clock is not synchronized yet, or None.
         """
+        synchronizer = self.__synchronizer
+        if synchronizer is not None and synchronizer.synced:
+            return synchronizer.server_now()
         return self.__server_timestamp
 
     @server_timestamp.setter
@@ -32,9 +42,12 @@ class TimeSync(Base):
     def server_datetime(self):
         """Property to get server datetime.
 
-        :returns: The server datetime.
+        :returns: The server datetime, or None if unknown.
         """
-        return datetime.datetime.fromtimestamp(self.server_timestamp)
+        timestamp = self.server_timestamp
+        if timestamp is None:
+            return None
+        return datetime.datetime.fromtimestamp(timestamp)
 
     @property
     def expiration_time(self):
@@ -0,0 +1,113 @@
+"""
+Pipeline de ordens com requestId único por ordem.
+"""
+import asyncio
+import itertools
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from pocketoptionapi.ws.channels.buyv3 import Buyv3
+
+
+class OrderPipeline(object):
+    """Envia ordens sem serializá-las: cada uma recebe um ``requestId``
+    próprio e a resposta ``successopenOrder`` é roteada de volta para o
+    future correspondente. Várias ordens podem ficar em voo ao mesmo tempo.
+    """
+
+    def __init__(self, api):
+        """
+        :param api: A instância de :class:`PocketOptionAPI
+            <pocketoptionapi.api.PocketOptionAPI>`.
+        """
+        self.api = api
+        # Base em milissegundos evita colisão com ids de execuções anteriores
+        self._base = int(time.time() * 1000) * 1000
+        self._counter = itertools.count(1)
+        # requestId -> [hora local da escrita no websocket ou None, future, frame na fila],
+        # até a resposta
+        self.in_flight = {}
+
+    def next_request_id(self):
+        """Gera um requestId único para esta sessão."""
+        return self._base + next(self._counter)
+
+    @staticmethod
+    def key(request_id):
+        return ("order", request_id)
+
+    def submit(self, amount, active, action, expirations):
+        """Envia uma ordem e retorna imediatamente.
+
+        :returns: Tupla (request_id, future) com a resposta do servidor.
+        """
+        request_id = self.next_request_id()
+        future = self.api.pending.register(self.key(request_id))
+        entry = self.in_flight[request_id] = [None, future, None]
+        future.add_done_callback(lambda _, rid=request_id: self.in_flight.pop(rid, None))
+        sync = self.api.sync
+        entry[2] = Buyv3(self.api)(amount, active, action, expirations, request_id,
+                                   on_written=lambda: entry.__setitem__(0, sync.local_now()))
+        return request_id, future
+
+    def submit_many(self, orders):
+        """Envia várias ordens de uma vez, sem aguardar respostas entre elas.
+
+        :param orders: Iterável de tuplas (amount, active, action, expirations).
+        :returns: Lista de tuplas (request_id, future) na mesma ordem.
+        """
+        return [self.submit(*order) for order in orders]
+
+    def fail_written(self, error):
+        """Falha as ordens já escritas no websocket que ainda não tiveram resposta.
+
+        As ainda na fila de envio continuam pendentes e saem após a reconexão.
+
+        :returns: Quantidade de ordens falhadas.
+        """
+        failed = 0
+        for request_id, (written_at, future, _) in list(self.in_flight.items()):
+            if written_at is not None and self.api.pending.reject(self.key(request_id), error):
+                failed += 1
+        return failed
+
+    def wait(self, request_id, future, timeout):
+        """Aguarda a resposta de uma ordem até o prazo.
+
+        Se o prazo expirar com a ordem ainda na fila de saída (ex.: retida
+        pelo limite de envio), ela é cancelada e não chega ao servidor.
+
+        :returns: O dicionário de resposta do servidor.
+        :raises concurrent.futures.TimeoutError: Se o prazo expirar.
+        """
+        entry = self.in_flight.get(request_id)
+        try:
+            return self.api.pending.wait(self.key(request_id), future, timeout)
+        except FutureTimeoutError:
+            self.abandon(request_id, entry)
+            raise
+
+    async def wait_async(self, request_id, future, timeout):
+        """Como :meth:`wait`, dentro do event loop.
+
+        :raises asyncio.TimeoutError: Se o prazo expirar.
+        """
+        # O cancelamento do future no timeout já o remove de in_flight
+        entry = self.in_flight.get(request_id)
+        try:
+            return await self.api.pending.wait_async(self.key(request_id), future, timeout)
+        except asyncio.TimeoutError:
+            self.abandon(request_id, entry)
+            raise
+
+    def abandon(self, request_id, entry=None):
+        """Deixa de acompanhar uma ordem, cancelando-a se ainda não foi enviada.
+
+        :returns: True se a ordem foi cancelada antes do envio.
+        """
+        popped = self.in_flight.pop(request_id, None)
+        if entry is None:
+            entry = popped
+        if entry is None or entry[2] is None:
+            return False
+        return entry[2].cancel()
@@ -0,0 +1,286 @@
+"""
+Agendamento do tráfego de saída: limites por classe de mensagem, prioridade
+e junção de mensagens redundantes.
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+
+ORDER = "order"
+HISTORY = "history"
+SUBSCRIPTION = "subscription"
+DEFAULT = "default"
+
+# Da mais para a menos prioritária
+PRIORITY = (ORDER, DEFAULT, HISTORY, SUBSCRIPTION)
+
+EVENT_CLASSES = {
+    "openOrder": ORDER,
+    "openPendingOrder": ORDER,
+    "cancelPendingOrder": ORDER,
+    "loadHistoryPeriod": HISTORY,
+    "loadHistoryPeriodFast": HISTORY,
+    "changeSymbol": SUBSCRIPTION,
+    "subfor": SUBSCRIPTION,
+    "unsubfor": SUBSCRIPTION,
+}
+
+# Classe -> (mensagens por segundo, rajada), ou None para sem limite
+DEFAULT_LIMITS = {
+    ORDER: (10.0, 30),
+    HISTORY: (5.0, 10),
+    SUBSCRIPTION: (5.0, 20),
+    DEFAULT: None,
+}
+
+
+def classify(msg):
+    """Classe e chave de junção de uma mensagem ``[evento, payload]``.
+
+    Só ``changeSymbol``, ``subfor`` e ``unsubfor`` têm chave: repetir a
+    mesma assinatura enquanto a primeira ainda está na fila não muda nada.
+
+    :returns: Tupla (classe, chave ou None).
+    """
+    if not isinstance(msg, list) or not msg or not isinstance(msg[0], str):
+        return DEFAULT, None
+    event = msg[0]
+    kind = EVENT_CLASSES.get(event, DEFAULT)
+    if kind != SUBSCRIPTION:
+        return kind, None
+    payload = msg[1] if len(msg) > 1 else None
+    if isinstance(payload, dict):
+        return kind, (event, payload.get("asset"), payload.get("period"))
+    return kind, (event, payload)
+
+
+class TokenBucket(object):
+    """Balde de fichas: ``rate`` fichas por segundo, até ``burst`` acumuladas."""
+
+    __slots__ = ("rate", "burst", "tokens", "updated", "_clock")
+
+    def __init__(self, rate, burst, clock=time.monotonic):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.tokens = float(burst)
+        self._clock = clock
+        self.updated = clock()
+
+    def _refill(self):
+        now = self._clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_take(self):
+        """Consome uma ficha se houver."""
+        self._refill()
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+    def refund(self):
+        """Devolve uma ficha consumida por um envio que não aconteceu."""
+        self.tokens = min(self.burst, self.tokens + 1.0)
+
+    def delay(self):
+        """Segundos até haver uma ficha."""
+        self._refill()
+        return max(0.0, (1.0 - self.tokens) / self.rate)
+
+
+class OutboundMessage(object):
+    """Um frame na fila de saída.
+
+    Pode ser cancelado de qualquer thread enquanto ainda não começou a ser
+    enviado (ver :meth:`cancel`).
+    """
+
+    __slots__ = ("data", "kind", "key", "enqueued_at", "callbacks", "cancelled", "started", "_lock")
+
+    def __init__(self, data, kind=DEFAULT, key=None, on_written=None):
+        self.data = data
+        self.kind = kind
+        self.key = key
+        self.enqueued_at = time.perf_counter()
+        self.callbacks = [on_written] if on_written is not None else []
+        self.cancelled = False
+        self.started = False
+        self._lock = threading.Lock()
+
+    def cancel(self):
+        """Retira o frame da fila.
+
+        :returns: True se o frame não será enviado; False se já saiu.
+        """
+        with self._lock:
+            if self.started:
+                return False
+            self.cancelled = True
+            return True
+
+    def start(self):
+        with self._lock:
+            if self.cancelled:
+                return False
+            self.started = True
+            return True
+
+    def written(self):
+        for callback in self.callbacks:
+            callback()
+
+
+class _ClassStats(object):
+    __slots__ = ("sent", "coalesced", "cancelled", "wait_total", "wait_max", "wait_last")
+
+    def __init__(self):
+        self.sent = 0
+        self.coalesced = 0
+        self.cancelled = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.wait_last = None
+
+
+class OutboundScheduler(object):
+    """Fila de saída com uma fila e um balde de fichas por classe.
+
+    A cada envio sai a mensagem mais antiga da classe mais prioritária que
+    tem fichas: ordens antes de histórico e de assinaturas. Uma classe sem
+    fichas não segura as outras. Assinaturas repetidas ainda na fila são
+    juntadas na primeira (os callbacks de escrita de ambas são chamados),
+    desde que nenhuma mensagem diferente para o mesmo ativo tenha entrado
+    entre elas: changeSymbol A, unsubfor A, changeSymbol A vão os três.
+
+    Os métodos rodam no loop do websocket.
+    """
+
+    def __init__(self, limits=None, clock=time.monotonic):
+        """
+        :param dict limits: (opcional) Classe -> (mensagens por segundo, rajada)
+            ou None, sobre :data:`DEFAULT_LIMITS`.
+        :param clock: Relógio monotônico dos baldes.
+        """
+        merged = dict(DEFAULT_LIMITS)
+        if limits:
+            merged.update(limits)
+        self.limits = merged
+        self.queues = {kind: deque() for kind in PRIORITY}
+        self.buckets = {kind: TokenBucket(limit[0], limit[1], clock) if limit else None
+                        for kind, limit in merged.items()}
+        self._stats = {kind: _ClassStats() for kind in PRIORITY}
+        self._keys = {}
+        # ativo -> chave que pode receber junções (a última enfileirada para ele)
+        self._assets = {}
+        self._wakeup = None
+
+    def put(self, message):
+        """Enfileira a mensagem, ou a junta a uma igual ainda não enviada."""
+        key = message.key
+        if key is not None:
+            asset = key[1]
+            previous = self._assets.get(asset)
+            if previous is not None and previous != key:
+                # Outra mensagem para o ativo no meio: juntar mudaria a ordem no fio
+                self._keys.pop(previous, None)
+            queued = self._keys.get(key)
+            if queued is not None and not queued.cancelled:
+                queued.callbacks.extend(message.callbacks)
+                self._stats[message.kind].coalesced += 1
+                return queued
+            self._keys[key] = message
+            self._assets[asset] = key
+        self.queues[message.kind].append(message)
+        wakeup = self._wakeup
+        if wakeup is not None and not wakeup.done():
+            wakeup.set_result(None)
+        return message
+
+    def _pop_ready(self):
+        # Retorna (mensagem, None) ou (None, espera até a próxima ficha ou None)
+        delay = None
+        for kind in PRIORITY:
+            queue = self.queues[kind]
+            bucket = self.buckets[kind]
+            message = None
+            while queue:
+                if queue[0].cancelled:
+                    self._drop(queue.popleft())
+                    continue
+                if bucket is not None and not bucket.try_take():
+                    wait = bucket.delay()
+                    delay = wait if delay is None else min(delay, wait)
+                    break
+                candidate = queue.popleft()
+                self._release(candidate)
+                if candidate.start():
+                    message = candidate
+                    break
+                # Cancelada depois da checagem: a ficha volta ao balde
+                if bucket is not None:
+                    bucket.refund()
+                self._drop(candidate)
+            if message is None:
+                continue
+            stats = self._stats[kind]
+            waited = time.perf_counter() - message.enqueued_at
+            stats.sent += 1
+            stats.wait_total += waited
+            stats.wait_last = waited
+            if waited > stats.wait_max:
+                stats.wait_max = waited
+            return message, None
+        return None, delay
+
+    def _release(self, message):
+        # A mensagem saiu da fila: não recebe mais junções
+        key = message.key
+        if key is not None and self._keys.get(key) is message:
+            del self._keys[key]
+            if self._assets.get(key[1]) == key:
+                del self._assets[key[1]]
+
+    def _drop(self, message):
+        self._stats[message.kind].cancelled += 1
+        self._release(message)
+
+    async def get(self):
+        """Aguarda a próxima mensagem liberada pelos limites."""
+        loop = asyncio.get_running_loop()
+        while True:
+            message, delay = self._pop_ready()
+            if message is not None:
+                return message
+            self._wakeup = loop.create_future()
+            try:
+                await asyncio.wait_for(self._wakeup, delay)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                self._wakeup = None
+
+    def qsize(self):
+        return sum(len(queue) for queue in self.queues.values())
+
+    @property
+    def stats(self):
+        """Por classe: fila, enviadas, juntadas, canceladas, espera (média, máxima, última) e fichas."""
+        result = {}
+        for kind in PRIORITY:
+            stats = self._stats[kind]
+            bucket = self.buckets[kind]
+            if bucket is not None:
+                bucket._refill()
+            result[kind] = {
+                "queued": len(self.queues[kind]),
+                "sent": stats.sent,
+                "coalesced": stats.coalesced,
+                "cancelled": stats.cancelled,
+                "wait_avg": stats.wait_total / stats.sent if stats.sent else None,
+                "wait_max": stats.wait_max,
+                "wait_last": stats.wait_last,
+                "tokens": bucket.tokens if bucket is not None else None,
+            }
+        return result
@@ -0,0 +1,179 @@
+"""
+Parser de pacotes Engine.IO v4 / Socket.IO v5 e despacho de eventos por nome.
+"""
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Tipos de pacote Engine.IO (primeiro caractere do frame de texto)
+EIO_OPEN = "0"
+EIO_CLOSE = "1"
+EIO_PING = "2"
+EIO_PONG = "3"
+EIO_MESSAGE = "4"
+
+# Tipos de pacote Socket.IO (segundo caractere de um frame "4...")
+SIO_CONNECT = 0
+SIO_DISCONNECT = 1
+SIO_EVENT = 2
+SIO_ACK = 3
+SIO_CONNECT_ERROR = 4
+SIO_BINARY_EVENT = 5
+SIO_BINARY_ACK = 6
+
+
+class Packet(object):
+    """Um pacote Socket.IO já decodificado."""
+
+    __slots__ = ("type", "namespace", "id", "data", "attachments")
+
+    def __init__(self, type, namespace="/", id=None, data=None, attachments=0):
+        self.type = type
+        self.namespace = namespace
+        self.id = id
+        self.data = data
+        self.attachments = attachments
+
+    @property
+    def event(self):
+        """Nome do evento (primeiro elemento do array), se houver."""
+        if self.type in (SIO_EVENT, SIO_BINARY_EVENT) and self.data:
+            return self.data[0]
+        return None
+
+    @property
+    def payload(self):
+        """Primeiro argumento do evento, ou os dados do pacote para outros tipos."""
+        if self.type in (SIO_EVENT, SIO_BINARY_EVENT):
+            return self.data[1] if len(self.data) > 1 else None
+        return self.data
+
+
+def parse_packet(text, loads=json.loads):
+    """Decodifica um pacote Socket.IO.
+
+    :param str text: O frame sem o prefixo Engine.IO ``4`` (ex.: ``451-["x",{...}]``).
+    :param loads: Função usada para decodificar o JSON do pacote.
+    :returns: Uma instância de :class:`Packet`.
+    """
+    ptype = ord(text[0]) - 48
+    size = len(text)
+    i = 1
+    attachments = 0
+    if ptype == SIO_BINARY_EVENT or ptype == SIO_BINARY_ACK:
+        dash = text.index("-", i)
+        attachments = int(text[i:dash])
+        i = dash + 1
+    namespace = "/"
+    if i < size and text[i] == "/":
+        comma = text.find(",", i)
+        if comma == -1:
+            comma = size
+        namespace = text[i:comma]
+        i = comma + 1
+    start = i
+    while i < size and "0" <= text[i] <= "9":
+        i += 1
+    ack_id = int(text[start:i]) if i > start else None
+    data = loads(text[i:]) if i < size else None
+    return Packet(ptype, namespace, ack_id, data, attachments)
+
+
+def _fill_placeholders(data, buffers):
+    if isinstance(data, dict):
+        if data.get("_placeholder") is True and "num" in data:
+            return buffers[data["num"]]
+        return {key: _fill_placeholders(value, buffers) for key, value in data.items()}
+    if isinstance(data, list):
+        return [_fill_placeholders(value, buffers) for value in data]
+    return data
+
+
+class BinaryAssembler(object):
+    """Máquina de estados que junta um pacote binário com seus anexos.
+
+    O cabeçalho (``45N-[...]``) anuncia N anexos; os próximos N frames
+    binários pertencem a ele, na ordem, e substituem os placeholders
+    ``{"_placeholder": true, "num": k}``.
+    """
+
+    def __init__(self):
+        self.packet = None
+        self.buffers = []
+
+    def start(self, packet):
+        """Começa a reconstrução de um pacote que anunciou anexos."""
+        if self.packet is not None:
+            logger.warning(f"Pacote binário incompleto descartado: {self.packet.event}")
+        self.packet = packet
+        self.buffers = []
+
+    def add(self, attachment):
+        """Adiciona um anexo já decodificado.
+
+        :returns: O :class:`Packet` completo, ou None se ainda faltam anexos
+            ou se não há cabeçalho aguardando (anexo órfão).
+        """
+        packet = self.packet
+        if packet is None:
+            return None
+        self.buffers.append(attachment)
+        if len(self.buffers) < packet.attachments:
+            return None
+        packet.data = _fill_placeholders(packet.data, self.buffers)
+        self.packet = None
+        self.buffers = []
+        return packet
+
+    @property
+    def waiting(self):
+        return self.packet is not None
+
+
+class EventDispatcher(object):
+    """Registro de handlers por nome de evento.
+
+    O despacho é uma busca em dicionário, então o custo não depende de
+    quantos eventos estão registrados.
+    """
+
+    def __init__(self):
+        self.handlers = {}
+
+    def on(self, event, handler=None):
+        """Registra um handler para o evento. Pode ser usado como decorator.
+
+        :param str event: Nome do evento Socket.IO (ex.: ``updateStream``).
+        :param handler: Callable que recebe o payload do evento.
+        """
+        if handler is None:
+            def decorator(func):
+                self.on(event, func)
+                return func
+            return decorator
+        self.handlers.setdefault(event, []).append(handler)
+        return handler
+
+    def off(self, event, handler):
+        """Remove um handler registrado anteriormente."""
+        handlers = self.handlers.get(event)
+        if handlers and handler in handlers:
+            handlers.remove(handler)
+            if not handlers:
+                del self.handlers[event]
+
+    def dispatch(self, event, payload):
+        """Chama os handlers do evento.
+
+        :returns: True se havia algum handler registrado.
+        """
+        handlers = self.handlers.get(event)
+        if handlers is None:
+            return False
+        for handler in handlers:
+            try:
+                handler(payload)
+            except Exception as e:
+                logger.error(f"Error processing {event}: {e}")
+        return True
@@ -0,0 +1,128 @@
+"""
+Correlação entre requisições enviadas e respostas recebidas pelo websocket.
+"""
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import Future, InvalidStateError
+
+
+class PendingRequests(object):
+    """Registro de futures aguardando resposta, indexados por chave.
+
+    A chave pode ser o ``requestId`` de uma ordem, o id de um deal ou o nome
+    de um evento. São usados futures de :mod:`concurrent.futures`, que servem
+    tanto para threads (``future.result(timeout)``) quanto para asyncio
+    (``asyncio.wrap_future``).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waiters = {}
+
+    def register(self, key, future=None):
+        """Registra um waiter para a chave. Deve ser chamado antes do envio.
+
+        :param key: A chave da resposta esperada.
+        :param future: (opcional) Um future já registrado em outra chave; o
+            primeiro valor que chegar por qualquer uma delas o resolve.
+        :returns: Um :class:`concurrent.futures.Future`.
+        """
+        if future is None:
+            future = Future()
+        with self._lock:
+            self._waiters.setdefault(key, deque()).append(future)
+        return future
+
+    def discard(self, key, future):
+        """Remove um waiter que não será mais aguardado (ex.: timeout)."""
+        with self._lock:
+            waiters = self._waiters.get(key)
+            if waiters is None:
+                return
+            try:
+                waiters.remove(future)
+            except ValueError:
+                pass
+            if not waiters:
+                del self._waiters[key]
+
+    def _pop(self, key, everyone):
+        with self._lock:
+            waiters = self._waiters.get(key)
+            if not waiters:
+                return []
+            if everyone:
+                del self._waiters[key]
+                return list(waiters)
+            targets = []
+            while waiters and not targets:
+                future = waiters.popleft()
+                if not future.done():
+                    targets.append(future)
+            if not waiters:
+                del self._waiters[key]
+            return targets
+
+    def resolve(self, key, value, everyone=False):
+        """Entrega a resposta ao waiter mais antigo da chave (ou a todos).
+
+        :param key: A chave da resposta.
+        :param value: O valor da resposta.
+        :param bool everyone: Se True, resolve todos os waiters da chave.
+        :returns: True se algum waiter recebeu o valor.
+        """
+        delivered = False
+        for future in self._pop(key, everyone):
+            try:
+                future.set_result(value)
+                delivered = True
+            except InvalidStateError:
+                pass
+        return delivered
+
+    def reject(self, key, error, everyone=True):
+        """Falha os waiters da chave com a exceção informada."""
+        delivered = False
+        for future in self._pop(key, everyone):
+            try:
+                future.set_exception(error)
+                delivered = True
+            except InvalidStateError:
+                pass
+        return delivered
+
+    def reject_all(self, error):
+        """Falha todos os waiters pendentes (ex.: conexão encerrada)."""
+        with self._lock:
+            keys = list(self._waiters)
+        for key in keys:
+            self.reject(key, error)
+
+    def wait(self, key, future, timeout):
+        """Aguarda o future até o prazo, removendo o waiter em caso de timeout.
+
+        :returns: O valor da resposta.
+        :raises concurrent.futures.TimeoutError: Se o prazo expirar.
+        """
+        try:
+            return future.result(timeout)
+        except BaseException:
+            self.discard(key, future)
+            raise
+
+    async def wait_async(self, key, future, timeout):
+        """Como :meth:`wait`, mas aguardando no event loop atual sem bloquear a thread.
+
+        :returns: O valor da resposta.
+        :raises asyncio.TimeoutError: Se o prazo expirar.
+        """
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except BaseException:
+            self.discard(key, future)
+            raise
+
+    def __contains__(self, key):
+        with self._lock:
+            return bool(self._waiters.get(key))
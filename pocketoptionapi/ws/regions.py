@@ -0,0 +1,136 @@
+"""
+Medição de latência das regiões e escolha da mais rápida.
+"""
+import asyncio
+import logging
+import ssl
+import statistics
+import time
+
+import websockets
+
+logger = logging.getLogger(__name__)
+
+CONNECT_HEADERS = {
+    "Origin": "https://pocketoption.com",
+    "Cache-Control": "no-cache",
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+}
+
+# websockets>=14 renomeou extra_headers para additional_headers
+_HEADERS_ARG = "additional_headers" if int(websockets.__version__.split(".")[0]) >= 14 else "extra_headers"
+
+
+def connect_options(url, headers=None):
+    """Argumentos de ``websockets.connect`` para o endereço informado."""
+    options = {_HEADERS_ARG: CONNECT_HEADERS if headers is None else headers}
+    if url.startswith("wss://"):
+        ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        ssl_context.check_hostname = False
+        ssl_context.verify_mode = ssl.CERT_NONE
+        options["ssl"] = ssl_context
+    return options
+
+
+async def ping_rtt(ws, timeout=5):
+    """Tempo de ida e volta de um ping do websocket, em segundos."""
+    start = time.perf_counter()
+    pong = await ws.ping()
+    await asyncio.wait_for(pong, timeout)
+    return time.perf_counter() - start
+
+
+class ProbeResult(object):
+    """Resultado da medição de uma região."""
+
+    __slots__ = ("url", "handshake", "open", "pings", "error")
+
+    def __init__(self, url):
+        self.url = url
+        self.handshake = None  # TCP + TLS + upgrade
+        self.open = None  # até o pacote "0" do Engine.IO
+        self.pings = []
+        self.error = None
+
+    @property
+    def ok(self):
+        return self.error is None and self.handshake is not None
+
+    @property
+    def rtt(self):
+        """Mediana dos pings, ou o handshake se o servidor não respondeu aos pings."""
+        if self.pings:
+            return statistics.median(self.pings)
+        return self.handshake
+
+    def __repr__(self):
+        if not self.ok:
+            return f"ProbeResult({self.url!r}, error={self.error!r})"
+        return f"ProbeResult({self.url!r}, rtt={self.rtt * 1000:.1f}ms, handshake={self.handshake * 1000:.1f}ms)"
+
+
+class RegionProber(object):
+    """Mede handshake e RTT de ping de várias regiões em paralelo.
+
+    A conexão de medição não autentica: recebe o pacote de abertura do
+    Engine.IO, envia alguns pings e fecha.
+    """
+
+    def __init__(self, samples=3, timeout=5, migrate_ratio=1.5, migrate_min_gain=0.02):
+        """
+        :param int samples: Pings por região.
+        :param float timeout: Prazo em segundos para cada etapa da medição.
+        :param float migrate_ratio: A região atual é considerada degradada quando
+            seu RTT passa dessa proporção do RTT da melhor alternativa...
+        :param float migrate_min_gain: ...e a diferença passa desses segundos.
+        """
+        self.samples = samples
+        self.timeout = timeout
+        self.migrate_ratio = migrate_ratio
+        self.migrate_min_gain = migrate_min_gain
+        self.last_results = []
+
+    async def probe_one(self, url):
+        result = ProbeResult(url)
+        start = time.perf_counter()
+        try:
+            ws = await asyncio.wait_for(websockets.connect(url, **connect_options(url)), self.timeout)
+            try:
+                result.handshake = time.perf_counter() - start
+                await asyncio.wait_for(ws.recv(), self.timeout)
+                result.open = time.perf_counter() - start
+                for _ in range(self.samples):
+                    try:
+                        result.pings.append(await ping_rtt(ws, self.timeout))
+                    except asyncio.TimeoutError:
+                        break
+            finally:
+                await ws.close()
+        except Exception as e:
+            result.error = str(e) or type(e).__name__
+        return result
+
+    async def probe(self, urls):
+        """Mede todas as regiões ao mesmo tempo.
+
+        :returns: Lista de :class:`ProbeResult`, as alcançáveis primeiro, da mais rápida.
+        """
+        results = await asyncio.gather(*(self.probe_one(url) for url in urls))
+        results = sorted(results, key=lambda r: (not r.ok, r.rtt if r.ok else 0))
+        self.last_results = results
+        for result in results:
+            logger.debug(result)
+        return results
+
+    async def rank(self, urls):
+        """Endereços ordenados pela latência medida; os inalcançáveis vão ao fim."""
+        if len(urls) <= 1:
+            return list(urls)
+        return [result.url for result in await self.probe(urls)]
+
+    def should_migrate(self, current_rtt, best_rtt):
+        """Se vale trocar de região, dado o RTT atual e o da melhor alternativa."""
+        if current_rtt is None or best_rtt is None:
+            return False
+        return (current_rtt > best_rtt * self.migrate_ratio
+                and current_rtt - best_rtt > self.migrate_min_gain)
@@ -0,0 +1,145 @@
+"""
+Retomada da sessão após uma reconexão: assinaturas, requisições e lacunas.
+"""
+import asyncio
+import logging
+import time
+
+
+logger = logging.getLogger(__name__)
+
+
+class SessionResume(object):
+    """Restaura o estado da sessão quando o websocket reconecta.
+
+    Ao cair a conexão, as ordens já escritas no websocket e ainda sem
+    resposta falham com :class:`ConnectionError` (não há como saber se o
+    servidor as recebeu); as ainda na fila são enviadas após a nova
+    autenticação. Pedidos de histórico são repetidos pelo próprio
+    :class:`HistoryPager <pocketoptionapi.ws.history.HistoryPager>`.
+
+    Depois do novo ``successauth``, cada ativo assinado recebe os ticks do
+    período desconectado via ``loadHistoryPeriod`` e a assinatura
+    (``changeSymbol``) é refeita.
+    """
+
+    def __init__(self, api, backfill=True, backfill_count=9000):
+        """
+        :param api: A instância de :class:`PocketOptionAPI
+            <pocketoptionapi.api.PocketOptionAPI>`.
+        :param bool backfill: Se preenche os ticks perdidos durante a queda.
+        :param int backfill_count: Pontos pedidos por página no preenchimento.
+        """
+        self.api = api
+        self.backfill = backfill
+        self.backfill_count = backfill_count
+        self.disconnected_at = None
+        self._disconnected_perf = None
+        self._failed_orders = 0
+        self.recovering = False
+        self.recoveries = 0
+        self.recovery_time_total = 0.0
+        self.recovery_time_max = 0.0
+        self.last_recovery = None
+
+    def _server_now(self):
+        try:
+            return self.api.sync.get_synced_timestamp()
+        except ValueError:
+            return time.time()
+
+    def on_disconnect(self):
+        """Registra a queda e falha as ordens que já tinham sido escritas.
+
+        Só a primeira queda de uma sequência de tentativas é registrada.
+        """
+        if self.disconnected_at is not None:
+            return
+        self.disconnected_at = self._server_now()
+        self._disconnected_perf = time.perf_counter()
+        self._failed_orders = self.api.orders.fail_written(
+            ConnectionError("Conexão perdida antes da confirmação da ordem"))
+
+    @property
+    def needs_recovery(self):
+        return self.disconnected_at is not None and not self.recovering
+
+    async def recover(self):
+        """Preenche as lacunas e refaz as assinaturas após a nova autenticação.
+
+        :returns: Dicionário com o resumo da retomada (ver :attr:`last_recovery`).
+        """
+        self.recovering = True
+        try:
+            # Os fluxos desta conexão (ver SubscriptionManager)
+            subscriptions = self.api.subscriptions.streams(self.api)
+            backfilled = {}
+            if self.backfill and subscriptions:
+                end = self._server_now()
+                assets = list(dict.fromkeys(asset for asset, _ in subscriptions))
+                counts = await asyncio.gather(*(self.backfill_asset(asset, end) for asset in assets))
+                backfilled = dict(zip(assets, counts))
+            # Assina depois do preenchimento para os ticks ao vivo chegarem já em ordem
+            self.api.subscriptions.resubscribe(self.api)
+        finally:
+            self.recovering = False
+
+        elapsed = time.perf_counter() - self._disconnected_perf
+        self.recoveries += 1
+        self.recovery_time_total += elapsed
+        self.recovery_time_max = max(self.recovery_time_max, elapsed)
+        self.last_recovery = {
+            "disconnected_at": self.disconnected_at,
+            "time_to_recovery": elapsed,
+            "resubscribed": len(subscriptions),
+            "backfilled": backfilled,
+            "failed_orders": self._failed_orders,
+        }
+        self.disconnected_at = None
+        logger.info(f"Sessão retomada em {elapsed:.3f} s ({len(subscriptions)} assinaturas)")
+        return self.last_recovery
+
+    async def backfill_asset(self, asset, end):
+        """Busca os pontos entre o último tick conhecido e ``end``.
+
+        :returns: Quantidade de ticks adicionados.
+        """
+        ticks = self.api.ticks
+        buffer = ticks.get(asset)
+        last = buffer.last() if buffer is not None else None
+        start = last[0] if last is not None else self.disconnected_at
+        if end <= start:
+            return 0
+        try:
+            points = await self.api.history.fetch_range(asset, start, end, self.backfill_count)
+        except asyncio.TimeoutError as e:
+            logger.warning(f"Preenchimento de {asset} falhou: {e}")
+            return 0
+
+        # Se ticks ao vivo chegaram durante a busca, não dá para inserir antes deles
+        buffer = ticks.get(asset)
+        current = buffer.last() if buffer is not None else None
+        if current is not None and current != last:
+            return 0
+
+        live_candles = self.api.live_candles
+        added = 0
+        for point in points:
+            timestamp = point["time"]
+            if timestamp <= start:
+                continue
+            ticks.append(asset, timestamp, point["price"])
+            live_candles.add_tick(asset, timestamp, point["price"])
+            added += 1
+        return added
+
+    @property
+    def stats(self):
+        """Métricas das retomadas: quantidade, última, média e máxima (segundos)."""
+        return {
+            "count": self.recoveries,
+            "last": self.last_recovery["time_to_recovery"] if self.last_recovery else None,
+            "avg": self.recovery_time_total / self.recoveries if self.recoveries else None,
+            "max": self.recovery_time_max,
+            "disconnected": self.disconnected_at is not None,
+        }
@@ -0,0 +1,173 @@
+"""
+Assinaturas de vários ativos sobre ``changeSymbol``, com contagem de referências.
+"""
+import asyncio
+import logging
+import threading
+
+from pocketoptionapi.ws.channels.change_symbol import ChangeSymbol
+
+logger = logging.getLogger(__name__)
+
+
+class SubscriptionManager(object):
+    """Conjunto desejado de fluxos (ativo, período) e a conexão de cada um.
+
+    Cada :meth:`acquire` soma uma referência; o ``changeSymbol`` só é
+    enviado na primeira, e o ``unsubfor`` só na última :meth:`release`.
+
+    Por padrão tudo passa pela conexão principal: o primeiro ativo dela é
+    assinado com ``changeSymbol`` e os seguintes com ``subfor``, que soma o
+    fluxo sem trocar o ativo do gráfico. O pool é opcional: com
+    ``per_connection`` definido, cada conexão leva até esse número de ativos
+    e novas conexões da mesma conta são abertas no mesmo loop, até
+    ``max_connections``. Os ticks de todas caem nos mesmos buffers por ativo
+    da sessão principal.
+    """
+
+    def __init__(self, api, per_connection=None, max_connections=4):
+        """
+        :param api: A instância principal de :class:`PocketOptionAPI
+            <pocketoptionapi.api.PocketOptionAPI>`.
+        :param int per_connection: Ativos por conexão antes de abrir outra
+            (None: sem pool, todos na conexão principal).
+        :param int max_connections: Máximo de conexões no pool, contando a
+            principal. Atingido o máximo, o ativo vai para a conexão menos ocupada.
+        """
+        self.api = api
+        self.per_connection = per_connection
+        self.max_connections = max_connections
+        self.pool = [api]
+        self.refs = {}
+        # (ativo, período) -> conexão (PocketOptionAPI) que o recebe
+        self.assigned = {}
+        self._lock = threading.Lock()
+
+    def _assets_on(self, connection):
+        return {asset for (asset, _), owner in self.assigned.items() if owner is connection}
+
+    def _connection_for(self, asset):
+        for (other, _), owner in self.assigned.items():
+            if other == asset:
+                return owner
+        loads = [(len(self._assets_on(connection)), i) for i, connection in enumerate(self.pool)]
+        load, index = min(loads)
+        if self.per_connection is None or load < self.per_connection:
+            return self.pool[index]
+        if len(self.pool) < self.max_connections:
+            return self._spawn()
+        return self.pool[index]
+
+    def _spawn(self):
+        connection = self.api.spawn_connection()
+        self.pool.append(connection)
+        logger.info(f"Nova conexão no pool de assinaturas ({len(self.pool)})")
+        coro = connection.connect_async()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.api.loop:
+            asyncio.ensure_future(coro)
+        else:
+            asyncio.run_coroutine_threadsafe(coro, self.api.loop)
+        return connection
+
+    def acquire(self, asset, period, on_written=None):
+        """Soma uma referência ao fluxo, assinando-o se for a primeira.
+
+        :param on_written: (opcional) Chamado no loop quando o ``changeSymbol``
+            é escrito; se o fluxo já estava assinado, não é chamado.
+        :returns: A mensagem enfileirada, ou None se o fluxo já estava assinado.
+        """
+        key = (asset, period)
+        with self._lock:
+            count = self.refs.get(key, 0)
+            self.refs[key] = count + 1
+            if count:
+                return None
+            connection = self._connection_for(asset)
+            shared = any(other != asset for other in self._assets_on(connection))
+            self.assigned[key] = connection
+        return self._subscribe(connection, asset, period, shared, on_written)
+
+    @staticmethod
+    def _subscribe(connection, asset, period, shared, on_written=None):
+        # changeSymbol troca o ativo da conexão; com outros ativos nela, soma com subfor
+        if shared:
+            return connection.send_websocket_request("sendMessage", ["subfor", asset],
+                                                     on_written=on_written)
+        return ChangeSymbol(connection)(asset, period, on_written)
+
+    def resubscribe(self, connection):
+        """Refaz as assinaturas de uma conexão (após reconectar).
+
+        :returns: Os fluxos (ativo, período) reassinados.
+        """
+        streams = self.streams(connection)
+        seen = set()
+        for asset, period in streams:
+            self._subscribe(connection, asset, period, bool(seen - {asset}))
+            seen.add(asset)
+        return streams
+
+    def release(self, asset, period):
+        """Tira uma referência do fluxo; na última, cancela a assinatura do ativo.
+
+        :returns: True se a assinatura foi cancelada.
+        """
+        key = (asset, period)
+        with self._lock:
+            count = self.refs.get(key)
+            if count is None:
+                return False
+            if count > 1:
+                self.refs[key] = count - 1
+                return False
+            del self.refs[key]
+            connection = self.assigned.pop(key)
+            if asset in self._assets_on(connection):
+                # Outro período do mesmo ativo continua usando o fluxo
+                return False
+        connection.send_websocket_request("sendMessage", ["unsubfor", asset])
+        return True
+
+    def remember(self, asset, period, connection):
+        """Registra um ``changeSymbol`` enviado diretamente pelo canal."""
+        key = (asset, period)
+        with self._lock:
+            if key not in self.refs:
+                self.refs[key] = 1
+                self.assigned[key] = connection
+
+    def streams(self, connection=None):
+        """Fluxos (ativo, período) assinados, de todas as conexões ou de uma."""
+        with self._lock:
+            return [key for key, owner in self.assigned.items()
+                    if connection is None or owner is connection]
+
+    def __contains__(self, key):
+        return key in self.refs
+
+    async def close_pool(self):
+        """Fecha as conexões extras do pool."""
+        extra, self.pool = self.pool[1:], self.pool[:1]
+        for connection in extra:
+            await connection.close()
+
+    @property
+    def stats(self):
+        """Conexões no pool e, por fluxo, referências, conexão e último tick."""
+        with self._lock:
+            items = list(self.assigned.items())
+            refs = dict(self.refs)
+        streams = {}
+        for (asset, period), connection in items:
+            buffer = self.api.ticks.get(asset)
+            last = buffer.last() if buffer is not None else None
+            streams[f"{asset}@{period}"] = {
+                "refs": refs.get((asset, period), 0),
+                "connection": self.pool.index(connection) if connection in self.pool else None,
+                "last_tick": last[0] if last is not None else None,
+            }
+        return {"connections": len(self.pool), "streams": streams}
@@ -0,0 +1,52 @@
+"""
+Medição do atraso do event loop: um amostrador por loop, só enquanto há
+métricas ligadas.
+"""
+import asyncio
+
+from pocketoptionapi.api import PocketOptionAPI
+from pocketoptionapi.ws.metrics import LoopLagSampler, Metrics
+
+
+def make_api(loop, metrics):
+    return PocketOptionAPI(ssid="x", demo=True, loop=loop, url="ws://127.0.0.1:1/", metrics=metrics)
+
+
+def test_disabled_metrics_do_not_sample():
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        apis = [make_api(loop, False) for _ in range(5)]
+        await asyncio.sleep(0)
+        assert LoopLagSampler.for_loop(loop)._task is None
+        assert all(api.metrics.loop_lag.count == 0 for api in apis)
+
+    asyncio.run(scenario())
+
+
+def test_one_sampler_per_loop():
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        sampler = LoopLagSampler.for_loop(loop)
+        sampler.interval = 0.05
+        try:
+            shared = Metrics(True)
+            main = make_api(loop, shared)
+            main.spawn_connection()
+            other = make_api(loop, True)
+            await asyncio.sleep(0.28)
+            # Pool e sessões no mesmo loop: uma task, uma amostra por intervalo
+            assert len([t for t in asyncio.all_tasks() if t is not asyncio.current_task()]) == 1
+            assert 3 <= shared.loop_lag.count <= 6
+            assert abs(shared.loop_lag.count - other.metrics.loop_lag.count) <= 1
+
+            shared.set_enabled(False)
+            other.metrics.set_enabled(False)
+            await asyncio.sleep(0)
+            assert sampler._task is None
+            count = shared.loop_lag.count
+            await asyncio.sleep(0.12)
+            assert shared.loop_lag.count == count
+        finally:
+            sampler.interval = LoopLagSampler.interval
+
+    asyncio.run(scenario())
@@ -0,0 +1,124 @@
+"""
+Cliente assíncrono contra o servidor local de :mod:`benchmarks.mock_server`:
+autenticação recusada, reconexão com retomada, ordens e páginas de histórico
+sem resposta.
+"""
+import asyncio
+import tempfile
+
+import pytest
+
+from benchmarks.mock_server import Faults, MockPocketOptionServer, auth_message
+from pocketoptionapi.async_api import AsyncPocketOption
+
+
+async def wait_until(predicate, timeout=5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            return False
+        await asyncio.sleep(0.02)
+    return True
+
+
+class LossyServer(MockPocketOptionServer):
+    """Ignora o pedido de histórico de número ``lost`` (a partir de 1)."""
+
+    lost = 2
+
+    def __init__(self, *args, **kwargs):
+        super(LossyServer, self).__init__(*args, **kwargs)
+        self.history_requests = 0
+
+    def _on_load_history(self, conn, payload):
+        self.history_requests += 1
+        if self.history_requests != self.lost:
+            MockPocketOptionServer._on_load_history(self, conn, payload)
+
+    _handlers = dict(MockPocketOptionServer._handlers, loadHistoryPeriod=_on_load_history)
+
+
+def test_auth_rejected_stops_reconnecting():
+    async def scenario():
+        async with MockPocketOptionServer(tick_rate=0, faults=Faults(reject_auth=True)) as server:
+            client = AsyncPocketOption(auth_message(1), True, url=server.url)
+            assert not await client.connect(3)
+            assert await wait_until(client.api.websocket_task.done, 3)
+            # Sem novas tentativas depois do NotAuthorized
+            await asyncio.sleep(1.5)
+            assert server.counters.get("recv:auth") == 1
+            assert client.api.state.websocket_error_reason == "NotAuthorized"
+
+    asyncio.run(scenario())
+
+
+def test_reconnect_resumes_subscriptions():
+    async def scenario():
+        async with MockPocketOptionServer(tick_rate=50) as server:
+            client = AsyncPocketOption(auth_message(1), True, url=server.url)
+            assert await client.connect(5)
+            await client.subscribe("EURUSD_otc", 60)
+            assert await wait_until(lambda: client.get_last_tick("EURUSD_otc") is not None)
+
+            await server.disconnect_all()
+            assert await wait_until(lambda: client.api.resume.last_recovery is not None, 10)
+            recovery = client.api.resume.last_recovery
+            assert recovery["resubscribed"] == 1
+
+            before = client.get_last_tick("EURUSD_otc")[0]
+            assert await wait_until(lambda: client.get_last_tick("EURUSD_otc")[0] > before)
+            assert client.get_subscription_stats()["connections"] == 1
+            await client.disconnect()
+
+    asyncio.run(scenario())
+
+
+def test_order_ack_and_close():
+    async def scenario():
+        async with MockPocketOptionServer(tick_rate=0, time_scale=0.01, balance=100) as server:
+            client = AsyncPocketOption(auth_message(1), True, url=server.url)
+            assert await client.connect(5)
+            ok, order_id = await client.buy(10, "EURUSD_otc", "call", 60)
+            assert ok and order_id is not None
+            profit, status = await client.check_win(order_id, timeout=5)
+            assert status in ("ganhou", "perdeu")
+            assert profit == pytest.approx(server.balances[1] - 100)
+
+            # Saldo insuficiente volta como failopenOrder
+            ok, _ = await client.buy(10 ** 6, "EURUSD_otc", "call", 60)
+            assert not ok
+            await client.disconnect()
+
+    asyncio.run(scenario())
+
+
+def test_history_page_timeout_keeps_gap():
+    async def scenario():
+        async with LossyServer(tick_rate=0) as server:
+            client = AsyncPocketOption(auth_message(1), True, url=server.url,
+                                       history_dir=tempfile.mkdtemp())
+            assert await client.connect(5)
+            client.api.history.timeout = 0.3
+            client.api.history.max_retries = 0
+            end = int(server.now()) // 60 * 60
+
+            # A segunda das três páginas não chega: a lacuna continua pendente
+            await client.get_history_arrays("EURUSD_otc", 60, end, 600, 3)
+            store = client.history_store
+            period = 30
+            span = store.page_span("EURUSD_otc", period)
+            gaps = store.missing("EURUSD_otc", period, end - 3 * span, end)
+            assert len(gaps) == 1
+
+            # Na próxima consulta a lacuna é baixada
+            times, _ = await client.get_history_arrays("EURUSD_otc", 60, end, 600, 3)
+            assert store.missing("EURUSD_otc", period, end - 3 * span, end) == []
+            assert len(times) > 1700
+
+            # Sem nenhuma resposta, o erro chega ao chamador
+            server.faults.drop_rate = 1.0
+            with pytest.raises(asyncio.TimeoutError):
+                await client.get_history("EURUSD_otc", 60, end - 3600, 600)
+            await client.disconnect()
+
+    asyncio.run(scenario())
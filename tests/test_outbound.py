@@ -0,0 +1,68 @@
+"""
+Fila de saída: prioridade entre classes, junção de assinaturas e fichas.
+"""
+from pocketoptionapi.ws.outbound import OutboundMessage, OutboundScheduler, classify
+
+UNLIMITED = {"order": None, "history": None, "subscription": None}
+
+
+def put(scheduler, msg):
+    kind, key = classify(msg)
+    return scheduler.put(OutboundMessage(msg, kind, key))
+
+
+def drain(scheduler):
+    sent = []
+    while True:
+        message, _ = scheduler._pop_ready()
+        if message is None:
+            return sent
+        sent.append(message.data)
+
+
+def test_priority_order():
+    scheduler = OutboundScheduler(UNLIMITED)
+    put(scheduler, ["changeSymbol", {"asset": "A", "period": 60}])
+    put(scheduler, ["loadHistoryPeriod", {"asset": "A"}])
+    put(scheduler, ["openOrder", {"asset": "A"}])
+    put(scheduler, ["ps"])
+    assert [msg[0] for msg in drain(scheduler)] == ["openOrder", "ps", "loadHistoryPeriod", "changeSymbol"]
+
+
+def test_coalesces_repeated_subscription():
+    scheduler = OutboundScheduler(UNLIMITED)
+    first = put(scheduler, ["changeSymbol", {"asset": "A", "period": 60}])
+    assert put(scheduler, ["changeSymbol", {"asset": "A", "period": 60}]) is first
+    # Outro período é outra chave
+    put(scheduler, ["changeSymbol", {"asset": "A", "period": 30}])
+    assert len(drain(scheduler)) == 2
+    assert scheduler.stats["subscription"]["coalesced"] == 1
+
+
+def test_no_coalescing_across_interleaved_message():
+    scheduler = OutboundScheduler(UNLIMITED)
+    put(scheduler, ["changeSymbol", {"asset": "A", "period": 60}])
+    put(scheduler, ["unsubfor", "A"])
+    put(scheduler, ["changeSymbol", {"asset": "A", "period": 60}])
+    # Outro ativo no meio não impede a junção
+    put(scheduler, ["subfor", "B"])
+    put(scheduler, ["changeSymbol", {"asset": "A", "period": 60}])
+    assert [msg[0] for msg in drain(scheduler)] == ["changeSymbol", "unsubfor", "changeSymbol", "subfor"]
+
+
+class LosesRace(OutboundMessage):
+    """Cancelada entre a checagem da fila e o início do envio."""
+
+    __slots__ = ()
+
+    def start(self):
+        return False
+
+
+def test_token_refunded_when_start_fails():
+    scheduler = OutboundScheduler({"order": (1.0, 1)}, clock=lambda: 0.0)
+    scheduler.put(LosesRace(["openOrder", {}], "order"))
+    scheduler.put(OutboundMessage(["openOrder", {"requestId": 2}], "order"))
+    message, _ = scheduler._pop_ready()
+    assert message.data[1] == {"requestId": 2}
+    assert scheduler.stats["order"]["cancelled"] == 1
@@ -0,0 +1,45 @@
+"""
+Várias sessões no mesmo processo e no mesmo event loop não compartilham estado.
+"""
+import asyncio
+
+import pytest
+
+from benchmarks import bench_sessions
+from benchmarks.mock_server import auth_message
+from pocketoptionapi.async_api import AsyncPocketOption
+
+
+def test_sessions_isolated():
+    result = bench_sessions.run(50)
+    assert result["authenticated"] == 50
+    assert result["isolated"], result["wrong_sessions"]
+
+
+def test_orders_stay_in_their_session():
+    async def scenario():
+        async with bench_sessions.SessionServer(tick_rate=0, time_scale=0.01) as server:
+            clients = [AsyncPocketOption(auth_message(uid), True, url=server.url) for uid in (1, 2)]
+            assert all(await asyncio.gather(*(client.connect(5) for client in clients)))
+            first, second = clients
+
+            ok, order_id = await first.buy(5, "EURUSD_otc", "call", 60)
+            assert ok
+            await first.check_win(order_id, timeout=5)
+            assert order_id in first.api.deals.closed
+            assert order_id not in second.api.deals.closed
+            assert second.get_balance() == bench_sessions.balance_for(2)
+            await asyncio.gather(*(client.disconnect() for client in clients))
+
+    asyncio.run(scenario())
+
+
+def test_module_get_balance_is_deprecated():
+    from pocketoptionapi import stable_api
+
+    session = stable_api.PocketOption(auth_message(1), True, url="ws://127.0.0.1:1/")
+    session.api.state.balance = 42.0
+    session.api.state.balance_updated = True
+    with pytest.warns(DeprecationWarning):
+        assert stable_api.get_balance() == 42.0
+    session._runner.stop()
@@ -0,0 +1,33 @@
+"""
+Incerteza do relógio do servidor estimado por :class:`TimeSynchronizer`.
+"""
+import math
+
+from pocketoptionapi.ws.objects.time_sync import TimeSynchronizer
+
+
+def make(now=100.0):
+    clock = [now]
+    return TimeSynchronizer(clock=lambda: clock[0]), clock
+
+
+def test_one_way_only_is_unbounded():
+    sync, _ = make()
+    assert sync.error_bound() is None
+    sync.add_one_way(1000.0, 100.0)
+    assert sync.server_now() == 1000.0
+    assert sync.error_bound() == math.inf
+
+
+def test_rtt_bounds_one_way_samples():
+    sync, _ = make()
+    sync.add_one_way(1000.0, 100.0)
+    sync.add_rtt(0.05)
+    assert abs(sync.error_bound() - 0.025) < 1e-9
+
+
+def test_round_trip_sample_bounds_immediately():
+    sync, _ = make()
+    sync.add_one_way(1000.0, 100.0)
+    sync.add_sample(1000.02, 99.98, 100.0)
+    assert sync.error_bound() < 0.05
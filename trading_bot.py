@@ -28,11 +28,14 @@ class TradingBot:
         self.initial_balance = self.api.get_balance()
         self.logger.info(f"موجودی اولیه: ${self.initial_balance}")
 
+        # کندل‌های زنده: یک بار تاریخچه، سپس به‌روزرسانی با هر تیک
+        self.api.start_live_candles(self.asset)
+
     def analyze_market(self):
         """تحلیل ساده بازار با استفاده از میانگین متحرک"""
         try:
             # دریافت کندل‌های قیمت
-            candles = self.api.get_candles(self.asset, 60, count=20)
+            candles = self.api.get_live_candles(self.asset, 60, count=20, include_current=True)
             df = pd.DataFrame(candles)
             
             if df.empty: